@@ -1,18 +1,34 @@
-from flask import Flask, request, jsonify, send_file
-from flask_cors import CORS, cross_origin
-from pydantic import BaseModel, Field
-from typing import Optional, Union
+import json
 import os
 import sys
-from werkzeug.utils import secure_filename
 import tempfile
+from typing import Optional, Union
 
 # Add the modelengine directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'model-engine'))
-from language import audio_to_text, text_to_audio, translate_text, detect_language
+from startup_report import import_timer, get_startup_report, print_startup_report
+
+with import_timer("flask"):
+    from flask import Flask, Response, request, jsonify, send_file, stream_with_context
+    from flask_cors import CORS, cross_origin
+    from werkzeug.utils import secure_filename
+with import_timer("pydantic"):
+    from pydantic import BaseModel, Field
+with import_timer("language"):
+    from language import audio_to_text, text_to_audio, translate_text, detect_language
+    from language import warm_up as warm_up_language
 
 # Import ecommerce API functions
-from ecommerce import add_product_api, search_products_api, catalog_ai_api
+with import_timer("ecommerce"):
+    from ecommerce import add_product_api, add_products_batch_api, search_products_api, catalog_ai_api, llm, get_catalog_index_stats
+    from ecommerce import facet_search_api
+    from ecommerce import warm_up as warm_up_ecommerce
+from agentic_api import get_pool_stats, get_singleflight_stats
+from async_agentic_api import get_singleflight_stats as get_async_singleflight_stats
+from circuit_breaker import breaker_status
+from metadata_cache import metadata_cache
+from token_cache import token_cache
+from semantic_cache import answer_cache
 
 app = Flask(__name__)
 
@@ -29,6 +45,11 @@ CORS(app, resources={
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'wav', 'flac', 'aiff', 'mp3'}
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+# Upper bounds for the tuning knobs /add-products-batch accepts in its body
+MAX_BATCH_WORKERS = 32
+MAX_POSTS_PER_SECOND = 100.0
+# Largest page /search/facets returns; bigger limits are clamped
+MAX_FACET_LIMIT = 100
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
@@ -74,6 +95,51 @@ def health_check():
     """Health check endpoint"""
     return jsonify(BaseResponse(success=True, message="API is healthy").model_dump())
 
+@app.route('/backend/status', methods=['GET'])
+def backend_status():
+    """E-commerce backend status: circuit breakers, connection pool, cache and LLM limiter stats"""
+    breakers = breaker_status()
+    open_endpoints = [name for name, status in breakers.items() if status['state'] != 'closed']
+    return jsonify({
+        "success": True,
+        "message": "Backend degraded" if open_endpoints else "Backend healthy",
+        "degraded_endpoints": open_endpoints,
+        "breakers": breakers,
+        "pool": get_pool_stats(),
+        "coalescing": get_singleflight_stats(),
+        "async_coalescing": get_async_singleflight_stats(),
+        "token_cache": token_cache.get_stats(),
+        "metadata_cache": metadata_cache.get_stats(),
+        "llm": llm.get_stats(),
+        "answer_cache": answer_cache.get_stats(),
+        "catalog_index": get_catalog_index_stats()
+    }), 200
+
+@app.route('/startup/report', methods=['GET'])
+def startup_report():
+    """Import cost per module at startup, plus lazily loaded SDKs once they are used"""
+    return jsonify({
+        "success": True,
+        "message": "Startup report",
+        **get_startup_report()
+    }), 200
+
+@app.route('/llm/metrics', methods=['GET'])
+def llm_metrics():
+    """Gemini call latency and token histograms per call site, with fallbacks, cache hits and the slowest calls"""
+    try:
+        return jsonify({
+            "success": True,
+            "message": "LLM call metrics",
+            **llm.get_metrics()
+        }), 200
+    except Exception as e:
+        return jsonify(ErrorResponse(
+            success=False,
+            message="Internal server error",
+            error=str(e)
+        ).model_dump()), 500
+
 @app.before_request
 def handle_preflight():
     """Handle preflight requests"""
@@ -352,6 +418,50 @@ def add_product_endpoint():
             "error": str(e)
         }), 500
 
+@app.route('/add-products-batch', methods=['POST'])
+def add_products_batch_endpoint():
+    """Add many products from a list of natural language descriptions"""
+    try:
+        data = request.get_json()
+        if not data or not isinstance(data.get('user_inputs'), list):
+            return jsonify({
+                "success": False,
+                "message": "Missing 'user_inputs' list in request body."
+            }), 400
+        try:
+            max_generation_workers = int(data.get('max_generation_workers', 4))
+            max_post_workers = int(data.get('max_post_workers', 8))
+            posts_per_second = float(data.get('posts_per_second', 5.0))
+        except (TypeError, ValueError):
+            return jsonify({
+                "success": False,
+                "message": "'max_generation_workers', 'max_post_workers' and 'posts_per_second' must be numbers."
+            }), 400
+        if not (1 <= max_generation_workers <= MAX_BATCH_WORKERS and 1 <= max_post_workers <= MAX_BATCH_WORKERS):
+            return jsonify({
+                "success": False,
+                "message": f"Worker counts must be between 1 and {MAX_BATCH_WORKERS}."
+            }), 400
+        if not 0 < posts_per_second <= MAX_POSTS_PER_SECOND:
+            return jsonify({
+                "success": False,
+                "message": f"'posts_per_second' must be greater than 0 and at most {MAX_POSTS_PER_SECOND:g}."
+            }), 400
+        result = add_products_batch_api(
+            data['user_inputs'],
+            max_generation_workers=max_generation_workers,
+            max_post_workers=max_post_workers,
+            posts_per_second=posts_per_second
+        )
+        status_code = 200 if result.get('success') else 400
+        return jsonify(result), status_code
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": "Internal server error.",
+            "error": str(e)
+        }), 500
+
 @app.route('/search-products', methods=['POST'])
 def search_products_endpoint():
     """Search products using natural language input"""
@@ -373,6 +483,103 @@ def search_products_endpoint():
             "error": str(e)
         }), 500
 
+@app.route('/search/facets', methods=['POST'])
+def facet_search_endpoint():
+    """
+    Filter the catalog by facets and count every facet value in one call.
+    Body: {"filters": {"categories": [...], "price": [...], "rating": [...],
+    "attributes": {"Color": [...]}}, "page": 1, "limit": 20}; all optional.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        filters = data.get('filters') or {}
+        if not isinstance(filters, dict):
+            return jsonify({
+                "success": False,
+                "message": "'filters' must be an object."
+            }), 400
+        try:
+            page = int(data.get('page', 1))
+            limit = int(data.get('limit', 20))
+        except (TypeError, ValueError):
+            return jsonify({
+                "success": False,
+                "message": "'page' and 'limit' must be integers."
+            }), 400
+        if page < 1 or limit <= 0:
+            return jsonify({
+                "success": False,
+                "message": "'page' must be at least 1 and 'limit' greater than 0."
+            }), 400
+        result = facet_search_api(filters, page, min(limit, MAX_FACET_LIMIT))
+        status_code = 200 if result.get('success') else 400
+        return jsonify(result), status_code
+    except Exception as e:
+        return jsonify(ErrorResponse(
+            success=False,
+            message="Internal server error",
+            error=str(e)
+        ).model_dump()), 500
+
+def build_inventory_summary(products, text_input):
+    """Deterministic inventory analysis appended to text-context catalog summaries"""
+    # Calculate inventory statistics
+    total_products = len(products)
+    total_stock = sum(int(p.get('stock', 0)) for p in products)
+    low_stock_products = [p for p in products if int(p.get('stock', 0)) < 10]
+    high_stock_products = [p for p in products if int(p.get('stock', 0)) > 50]
+    out_of_stock = [p for p in products if int(p.get('stock', 0)) == 0]
+    
+    # Calculate total inventory value
+    total_value = sum(int(p.get('price', 0)) * int(p.get('stock', 0)) for p in products)
+    
+    # Create inventory summary
+    inventory_summary = f"\n\n📊 INVENTORY ANALYSIS:\n"
+    inventory_summary += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    inventory_summary += f"📦 Total Products: {total_products}\n"
+    inventory_summary += f"📈 Total Stock Units: {total_stock}\n"
+    inventory_summary += f"💰 Total Inventory Value: ₹{total_value:,}\n"
+    inventory_summary += f"📊 Average Stock per Product: {total_stock//total_products if total_products > 0 else 0}\n\n"
+    
+    # Stock level breakdown
+    inventory_summary += f"📋 STOCK LEVEL BREAKDOWN:\n"
+    inventory_summary += f"🔴 Out of Stock: {len(out_of_stock)} products\n"
+    inventory_summary += f"🟡 Low Stock (<10): {len(low_stock_products)} products\n"
+    inventory_summary += f"🟢 High Stock (>50): {len(high_stock_products)} products\n"
+    inventory_summary += f"🔵 Normal Stock (10-50): {total_products - len(out_of_stock) - len(low_stock_products) - len(high_stock_products)} products\n\n"
+    
+    # Detailed product stock list
+    inventory_summary += f"📝 DETAILED STOCK STATUS:\n"
+    for i, product in enumerate(products, 1):
+        stock = int(product.get('stock', 0))
+        price = int(product.get('price', 0))
+        name = product.get('name', 'N/A')
+        
+        # Stock status indicator
+        if stock == 0:
+            status = "🔴 OUT OF STOCK"
+        elif stock < 10:
+            status = "🟡 LOW STOCK"
+        elif stock > 50:
+            status = "🟢 HIGH STOCK"
+        else:
+            status = "🔵 NORMAL"
+        
+        inventory_summary += f"{i}. {name}\n"
+        inventory_summary += f"   Stock: {stock} units | Price: ₹{price} | Value: ₹{stock * price:,} | {status}\n"
+    
+    # If user mentions selling offline, provide adjustment guidance
+    if 'sold' in text_input.lower() or 'offline' in text_input.lower() or 'sell' in text_input.lower():
+        inventory_summary += f"\n\n💡 OFFLINE SALES ADJUSTMENT GUIDE:\n"
+        inventory_summary += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+        inventory_summary += f"If you've sold products offline, here's your current stock:\n"
+        inventory_summary += f"• Update stock levels by deducting offline sales\n"
+        inventory_summary += f"• Current total: {total_stock} units across all products\n"
+        inventory_summary += f"• Monitor low stock items for reordering\n"
+        inventory_summary += f"• Consider updating inventory management system\n"
+    
+    return inventory_summary
+
 @app.route('/catalog/process-text', methods=['POST', 'OPTIONS'])
 @cross_origin()
 def process_catalog_text():
@@ -413,7 +620,7 @@ def process_catalog_text():
             # Use AI to generate catalog summary with text context
             from ecommerce import get_ai_catalog_summary_with_context
             result = get_ai_catalog_summary_with_context(
-                text_input, page, limit, sort_by, sort_order
+                text_input, page, limit, sort_by, sort_order, full_catalog=bool(data.get('fullCatalog'))
             )
             
             if result:
@@ -428,60 +635,7 @@ def process_catalog_text():
                     if products_data and 'products' in products_data:
                         products = products_data['products']
                         
-                        # Calculate inventory statistics
-                        total_products = len(products)
-                        total_stock = sum(int(p.get('stock', 0)) for p in products)
-                        low_stock_products = [p for p in products if int(p.get('stock', 0)) < 10]
-                        high_stock_products = [p for p in products if int(p.get('stock', 0)) > 50]
-                        out_of_stock = [p for p in products if int(p.get('stock', 0)) == 0]
-                        
-                        # Calculate total inventory value
-                        total_value = sum(int(p.get('price', 0)) * int(p.get('stock', 0)) for p in products)
-                        
-                        # Create inventory summary
-                        inventory_summary = f"\n\n📊 INVENTORY ANALYSIS:\n"
-                        inventory_summary += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                        inventory_summary += f"📦 Total Products: {total_products}\n"
-                        inventory_summary += f"📈 Total Stock Units: {total_stock}\n"
-                        inventory_summary += f"💰 Total Inventory Value: ₹{total_value:,}\n"
-                        inventory_summary += f"📊 Average Stock per Product: {total_stock//total_products if total_products > 0 else 0}\n\n"
-                        
-                        # Stock level breakdown
-                        inventory_summary += f"📋 STOCK LEVEL BREAKDOWN:\n"
-                        inventory_summary += f"🔴 Out of Stock: {len(out_of_stock)} products\n"
-                        inventory_summary += f"🟡 Low Stock (<10): {len(low_stock_products)} products\n"
-                        inventory_summary += f"🟢 High Stock (>50): {len(high_stock_products)} products\n"
-                        inventory_summary += f"🔵 Normal Stock (10-50): {total_products - len(out_of_stock) - len(low_stock_products) - len(high_stock_products)} products\n\n"
-                        
-                        # Detailed product stock list
-                        inventory_summary += f"📝 DETAILED STOCK STATUS:\n"
-                        for i, product in enumerate(products, 1):
-                            stock = int(product.get('stock', 0))
-                            price = int(product.get('price', 0))
-                            name = product.get('name', 'N/A')
-                            
-                            # Stock status indicator
-                            if stock == 0:
-                                status = "🔴 OUT OF STOCK"
-                            elif stock < 10:
-                                status = "🟡 LOW STOCK"
-                            elif stock > 50:
-                                status = "🟢 HIGH STOCK"
-                            else:
-                                status = "🔵 NORMAL"
-                            
-                            inventory_summary += f"{i}. {name}\n"
-                            inventory_summary += f"   Stock: {stock} units | Price: ₹{price} | Value: ₹{stock * price:,} | {status}\n"
-                        
-                        # If user mentions selling offline, provide adjustment guidance
-                        if 'sold' in text_input.lower() or 'offline' in text_input.lower() or 'sell' in text_input.lower():
-                            inventory_summary += f"\n\n💡 OFFLINE SALES ADJUSTMENT GUIDE:\n"
-                            inventory_summary += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                            inventory_summary += f"If you've sold products offline, here's your current stock:\n"
-                            inventory_summary += f"• Update stock levels by deducting offline sales\n"
-                            inventory_summary += f"• Current total: {total_stock} units across all products\n"
-                            inventory_summary += f"• Monitor low stock items for reordering\n"
-                            inventory_summary += f"• Consider updating inventory management system\n"
+                        inventory_summary = build_inventory_summary(products, text_input)
                         
                         text_summary = ai_summary + inventory_summary
                     else:
@@ -502,25 +656,30 @@ def process_catalog_text():
                 }), 400
         
         elif action == 'search':
-            # Use text as search query  
-            from ecommerce import search_products_api
-            result = search_products_api(text_input)
+            # Use text as search query against the local catalog index
+            from ecommerce import search_catalog_api
+            result = search_catalog_api(text_input)
             
             if result and result.get('success'):
                 # Generate text summary of search results
                 products = result.get('results', [])
+                total = result.get('total', len(products))
+                if result.get('did_you_mean'):
+                    search_summary = f"Did you mean: '{result['did_you_mean']}'?\n"
+                else:
+                    search_summary = ""
                 if products:
-                    search_summary = f"Found {len(products)} products matching '{text_input}':\n\n"
+                    search_summary += f"Found {total} products matching '{text_input}':\n\n"
                     for i, product in enumerate(products[:5], 1):  # Show first 5 results
                         search_summary += f"{i}. {product.get('name', 'N/A')}\n"
                         search_summary += f"   Price: ₹{product.get('price', 'N/A')}\n"
                         search_summary += f"   Stock: {product.get('stock', 'N/A')}\n"
                         search_summary += f"   Description: {product.get('description', 'N/A')[:100]}...\n\n"
                     
-                    if len(products) > 5:
-                        search_summary += f"... and {len(products) - 5} more products."
+                    if total > 5:
+                        search_summary += f"... and {total - 5} more products."
                 else:
-                    search_summary = f"No products found matching '{text_input}'"
+                    search_summary += f"No products found matching '{text_input}'"
                 
                 return jsonify({
                     "success": True,
@@ -622,6 +781,79 @@ def process_catalog_text():
             "error": str(e)
         }), 500
 
+def sse_event(event, payload):
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+@app.route('/catalog/process-text/stream', methods=['POST', 'OPTIONS'])
+@cross_origin()
+def process_catalog_text_stream():
+    """
+    Streaming variant of /catalog/process-text (summary action) over Server-Sent Events.
+
+    Events: 'inventory' with the inventory analysis as soon as the products are
+    fetched, 'token' for each chunk of the AI summary as Gemini produces it,
+    then 'done' (or 'error').
+    """
+    if request.method == 'OPTIONS':
+        # Handle preflight request
+        response = jsonify({'success': True})
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+        return response
+
+    try:
+        data = request.get_json()
+
+        # Validate request data
+        if not data or 'text' not in data:
+            return jsonify({
+                "success": False,
+                "message": "Missing 'text' field in request body"
+            }), 400
+
+        text_input = data['text']
+        if not text_input.strip():
+            return jsonify({
+                "success": False,
+                "message": "Text input cannot be empty"
+            }), 400
+
+        from ecommerce import fetch_catalog_page, stream_ai_catalog_summary_with_context
+        products_data = fetch_catalog_page(
+            data.get('page', 1), data.get('limit', 10), data.get('sortBy', 'createdAt'), data.get('sortOrder', 'desc')
+        )
+        if not products_data:
+            return jsonify({
+                "success": False,
+                "message": "Failed to fetch catalog products"
+            }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": "Internal server error.",
+            "error": str(e)
+        }), 500
+
+    def generate():
+        # The inventory section is deterministic, so it goes out before the first Gemini token
+        yield sse_event('inventory', {
+            "text": build_inventory_summary(products_data.get('products', []), text_input),
+            "processed_text": text_input
+        })
+        try:
+            for chunk in stream_ai_catalog_summary_with_context(products_data, text_input):
+                yield sse_event('token', {"text": chunk})
+            yield sse_event('done', {"success": True})
+        except Exception as e:
+            yield sse_event('error', {"success": False, "message": "Internal server error.", "error": str(e)})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/catalog/text-summary', methods=['POST'])
 def text_catalog_summary():
     """Generate catalog summary based on text input"""
@@ -649,7 +881,7 @@ def text_catalog_summary():
         # Generate AI summary with text context
         from ecommerce import get_ai_catalog_summary_with_context
         result = get_ai_catalog_summary_with_context(
-            text_input, page, limit, sort_by, sort_order
+            text_input, page, limit, sort_by, sort_order, full_catalog=bool(data.get('fullCatalog'))
         )
         
         if result:
@@ -696,5 +928,18 @@ def internal_error(e):
         error="An unexpected error occurred"
     ).model_dump()), 500
 
+def warm_up():
+    """
+    Load the lazily imported SDKs (Gemini, speech, TTS, translation) now
+    instead of on the first request. Call it from a pre-fork server's master
+    process (e.g. gunicorn --preload) or set WARM_UP_ON_START=1.
+    """
+    warm_up_language()
+    warm_up_ecommerce()
+
+if os.getenv("WARM_UP_ON_START", "").lower() in ("1", "true", "yes"):
+    warm_up()
+print_startup_report()
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -4,10 +4,14 @@ Catalog AI Demo Script
 This demonstrates the catalog AI functionality for fetching and displaying products
 """
 
+import os
 import requests
 import json
 from datetime import datetime
 
+# Point at a local fake_backend.py with ECOMMERCE_API_URL=http://localhost:5055
+BASE_URL = os.getenv('ECOMMERCE_API_URL', 'https://api-ecommerce.sanjaysagar.com')
+
 def demonstrate_catalog_ai():
     """Demonstrate the catalog AI functionality"""
     
@@ -18,7 +22,7 @@ def demonstrate_catalog_ai():
     print("\n1️⃣ AUTHENTICATION")
     print("   🔐 Authenticating with API...")
     
-    auth_url = 'https://api-ecommerce.sanjaysagar.com/api/auth/signin'
+    auth_url = f'{BASE_URL}/api/auth/signin'
     auth_data = {
         'email': 'sanjay@gmail.com',
         'password': 'password'
@@ -38,7 +42,7 @@ def demonstrate_catalog_ai():
                 print("\n2️⃣ FETCHING PRODUCTS")
                 print("   📡 Fetching seller products...")
                 
-                products_url = 'https://api-ecommerce.sanjaysagar.com/api/seller-product?page=1&limit=10&sortBy=createdAt&sortOrder=desc'
+                products_url = f'{BASE_URL}/api/seller-product?page=1&limit=10&sortBy=createdAt&sortOrder=desc'
                 headers = {
                     'Authorization': f'Bearer {access_token}',
                     'Content-Type': 'application/json'
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Fake E-commerce Backend
+A local stand-in for api-ecommerce.sanjaysagar.com for benchmarks and offline testing.
+
+Serves /api/auth/signin, /api/categories, /api/attributes, /api/product and
+/api/seller-product (GET with pagination/sorting, POST) over an in-memory
+catalog of configurable size, with optional injected latency and errors.
+
+Usage:
+    python fake_backend.py --products 100000 --latency-ms 20 --error-rate 0.01 --port 5055
+    ECOMMERCE_API_URL=http://localhost:5055 python api/app.py
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from array import array
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from flask import Flask, request, jsonify
+
+CATEGORIES = [
+    {"id": "cat-ethnic-wear", "name": "Ethnic Wear"},
+    {"id": "cat-western-wear", "name": "Western Wear"},
+    {"id": "cat-men", "name": "Men"},
+    {"id": "cat-women", "name": "Women"},
+    {"id": "cat-kids", "name": "Kids"},
+    {"id": "cat-casual", "name": "Casual"},
+    {"id": "cat-formal", "name": "Formal"},
+    {"id": "cat-party-wear", "name": "Party Wear"}
+]
+
+PRODUCT_TYPES = ["Kurta", "Shirt", "Dress", "Pants", "Jeans", "T-Shirt", "Saree", "Top"]
+COLORS = ["Red", "Blue", "Green", "Black", "White", "Pink", "Yellow", "Purple"]
+FABRICS = ["Cotton", "Silk", "Linen", "Polyester", "Rayon", "Denim"]
+GENDERS = ["Women", "Men", "Kids"]
+SIZES = ["S", "M", "L", "XL"]
+STYLES = ["Traditional", "Modern", "Casual", "Formal"]
+
+ATTRIBUTES = [
+    {"name": "Color", "values": COLORS},
+    {"name": "Fabric", "values": FABRICS},
+    {"name": "Gender", "values": GENDERS},
+    {"name": "Size", "values": SIZES},
+    {"name": "Style", "values": STYLES}
+]
+
+TOKEN_TTL_SECONDS = 3600
+CATALOG_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SORT_FIELDS = ("createdAt", "updatedAt", "name", "price", "stock", "rating")
+
+
+def _etag(payload):
+    return '"' + hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest() + '"'
+
+
+class FakeCatalog:
+    """
+    Columnar in-memory catalog. Generated products are stored as compact
+    per-field arrays and materialised as dicts only when served, so even a
+    1M product catalog fits comfortably in memory. POSTed products are kept
+    as plain dicts after the generated ones.
+
+    Searches over generated products use indexes built once at startup:
+    a boolean mask per category and attribute value, price- and
+    rating-sorted orders for range filters, and a combination code per
+    product for name matching. A search at 1M products then costs a few
+    vectorised passes rather than a Python loop, so benchmarks measure the
+    client and not the fake.
+    """
+
+    def __init__(self, size=1000, seed=42):
+        self.size = size
+        self._lock = threading.Lock()
+        self._added = []
+        self._sort_cache = {}
+        rng = random.Random(seed)
+        self.product_type = array('B', (rng.randrange(len(PRODUCT_TYPES)) for _ in range(size)))
+        self.color = array('B', (rng.randrange(len(COLORS)) for _ in range(size)))
+        self.fabric = array('B', (rng.randrange(len(FABRICS)) for _ in range(size)))
+        self.gender = array('B', (rng.randrange(len(GENDERS)) for _ in range(size)))
+        self.price = array('i', (rng.randrange(299, 5000) for _ in range(size)))
+        self.discount = array('B', (rng.randrange(0, 50) for _ in range(size)))
+        self.stock = array('i', (rng.randrange(0, 120) for _ in range(size)))
+        self.rating = array('B', (rng.randrange(10, 51) for _ in range(size)))  # tenths of a star
+        self._build_indexes()
+
+    def _build_indexes(self):
+        product_type = np.frombuffer(self.product_type, dtype=np.uint8)
+        color = np.frombuffer(self.color, dtype=np.uint8)
+        fabric = np.frombuffer(self.fabric, dtype=np.uint8)
+        gender = np.frombuffer(self.gender, dtype=np.uint8)
+        ethnic = np.isin(product_type, [PRODUCT_TYPES.index("Kurta"), PRODUCT_TYPES.index("Saree")])
+
+        category_names = {c["id"]: c["name"] for c in CATEGORIES}
+        self._category_masks = {
+            category_names["cat-ethnic-wear"]: ethnic,
+            category_names["cat-western-wear"]: ~ethnic
+        }
+        for code, value in enumerate(GENDERS):
+            self._category_masks[category_names[f"cat-{value.lower()}"]] = gender == code
+        self._attribute_masks = {("Style", "Traditional"): ethnic, ("Style", "Modern"): ~ethnic}
+        for attr_name, values, column in (("Color", COLORS, color), ("Fabric", FABRICS, fabric),
+                                          ("Gender", GENDERS, gender)):
+            for code, value in enumerate(values):
+                self._attribute_masks[(attr_name, value)] = column == code
+
+        # Names are "<color> <fabric> <type> for <gender> #<n>"; one code per combination
+        self._combo = ((product_type.astype(np.int32) * len(COLORS) + color) * len(FABRICS) + fabric) \
+            * len(GENDERS) + gender
+        self._combo_names = [
+            f"{COLORS[c]} {FABRICS[f]} {PRODUCT_TYPES[t]} for {GENDERS[g]} #".lower()
+            for t in range(len(PRODUCT_TYPES)) for c in range(len(COLORS))
+            for f in range(len(FABRICS)) for g in range(len(GENDERS))
+        ]
+
+        self._ranges = {}
+        for field, values in (("price", np.frombuffer(self.price, dtype=np.int32)),
+                              ("rating", np.frombuffer(self.rating, dtype=np.uint8) / 10)):
+            order = np.argsort(values, kind="stable")
+            self._ranges[field] = (order, values[order])
+
+    def __len__(self):
+        return self.size + len(self._added)
+
+    def _category_ids(self, i):
+        gender = GENDERS[self.gender[i]]
+        ethnic = PRODUCT_TYPES[self.product_type[i]] in ("Kurta", "Saree")
+        return ["cat-ethnic-wear" if ethnic else "cat-western-wear", f"cat-{gender.lower()}"]
+
+    def name(self, i):
+        if i >= self.size:
+            return self._added[i - self.size]["name"]
+        return (f"{COLORS[self.color[i]]} {FABRICS[self.fabric[i]]} {PRODUCT_TYPES[self.product_type[i]]} "
+                f"for {GENDERS[self.gender[i]]} #{i + 1}")
+
+    def get(self, i):
+        """Materialise product i as the backend's JSON shape"""
+        if i >= self.size:
+            return self._added[i - self.size]
+        product_type = PRODUCT_TYPES[self.product_type[i]]
+        color = COLORS[self.color[i]]
+        fabric = FABRICS[self.fabric[i]]
+        sku = f"{product_type[:3].upper()}-{i + 1:07d}"
+        created = (CATALOG_EPOCH + timedelta(minutes=i)).isoformat().replace('+00:00', 'Z')
+        categories_by_id = {c["id"]: c for c in CATEGORIES}
+        return {
+            "id": f"prod-{i + 1:07d}",
+            "name": self.name(i),
+            "description": f"{color} {product_type.lower()} made from premium {fabric.lower()} fabric.",
+            "price": self.price[i],
+            "discount": self.discount[i],
+            "stock": self.stock[i],
+            "rating": self.rating[i] / 10,
+            "sku": sku,
+            "thumbnail": f"https://example.com/{sku}-thumb.jpg",
+            "images": [{"url": f"https://example.com/{sku}-{n}.jpg"} for n in range(1, 4)],
+            "variants": [
+                {"name": f"Size {size}", "sku": f"{sku}-{size}", "price": self.price[i],
+                 "stock": self.stock[i] // len(SIZES), "thumbnail": f"https://example.com/{sku}-{size}.jpg",
+                 "images": [{"url": f"https://example.com/{sku}-{size}-1.jpg"}]}
+                for size in SIZES
+            ],
+            "categories": [categories_by_id[c] for c in self._category_ids(i)],
+            "attributes": [
+                {"name": "Color", "value": color},
+                {"name": "Fabric", "value": fabric},
+                {"name": "Gender", "value": GENDERS[self.gender[i]]},
+                {"name": "Style", "value": "Traditional" if product_type in ("Kurta", "Saree") else "Modern"}
+            ],
+            "createdAt": created,
+            "updatedAt": created
+        }
+
+    def add(self, product_json):
+        """Store a POSTed product and return it with server-assigned fields"""
+        now = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        categories_by_id = {c["id"]: c for c in CATEGORIES}
+        product = dict(product_json)
+        product["id"] = f"prod-{uuid.uuid4().hex[:12]}"
+        product["rating"] = 0
+        product["categories"] = [categories_by_id.get(c, {"id": c, "name": c}) for c in product.pop("categoryIds", [])]
+        product["createdAt"] = product["updatedAt"] = now
+        with self._lock:
+            self._added.append(product)
+            index = len(self) - 1
+            # Slot the product into every cached order instead of re-sorting the catalog on the next GET
+            for (sort_by, descending), order in self._sort_cache.items():
+                position = _insertion_point(order, self._sort_key(sort_by), index, descending)
+                self._sort_cache[(sort_by, descending)] = np.insert(order, position, index)
+        return product
+
+    def _sort_key(self, sort_by):
+        if sort_by == "name":
+            return self.name
+        if sort_by in ("price", "stock", "rating"):
+            column = getattr(self, sort_by)
+            return lambda i: column[i] if i < self.size else self._added[i - self.size].get(sort_by, 0)
+        # createdAt / updatedAt: generated products are in creation order, added ones come last
+        return lambda i: i
+
+    def ordering(self, sort_by, sort_order):
+        """Product indexes sorted by sort_by/sort_order (cached per key)"""
+        key = (sort_by if sort_by in SORT_FIELDS else "createdAt", sort_order == "desc")
+        with self._lock:
+            order = self._sort_cache.get(key)
+        if order is None:
+            size = len(self)
+            order = np.array(sorted(range(size), key=self._sort_key(key[0]), reverse=key[1]), dtype=np.int64)
+            with self._lock:
+                # Products added while sorting are missing from order; the next call sorts again
+                if size == len(self):
+                    self._sort_cache[key] = order
+        return order
+
+    def _range_mask(self, field, low, high):
+        """Generated products with low <= field <= high, from the field's sorted order"""
+        order, values = self._ranges[field]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        mask = np.zeros(self.size, dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+    def _generated_mask(self, name=None, categories=None, min_price=None, max_price=None,
+                        min_rating=None, attributes=None):
+        """Boolean mask over generated products with the same semantics as matches()"""
+        mask = np.ones(self.size, dtype=bool)
+        if min_price is not None or max_price is not None:
+            mask &= self._range_mask("price", min_price, max_price)
+        if min_rating is not None:
+            mask &= self._range_mask("rating", min_rating, None)
+        if categories:
+            any_category = np.zeros(self.size, dtype=bool)
+            for category in categories:
+                if category in self._category_masks:
+                    any_category |= self._category_masks[category]
+            mask &= any_category
+        for attr_name, value in (attributes or {}).items():
+            attribute_mask = self._attribute_masks.get((attr_name, value))
+            if attribute_mask is None:
+                return np.zeros(self.size, dtype=bool)
+            mask &= attribute_mask
+        if name:
+            query = name.lower()
+            if "#" in query or any(ch.isdigit() for ch in query):
+                # The query reaches into the product number; check the remaining candidates one by one
+                for i in np.flatnonzero(mask):
+                    if query not in self.name(int(i)).lower():
+                        mask[i] = False
+            else:
+                combos = [code for code, combo_name in enumerate(self._combo_names) if query in combo_name]
+                mask &= np.isin(self._combo, combos)
+        return mask
+
+    def search(self, sort_by, sort_order, **filters):
+        """Indexes of the products matching filters (as matches() defines them) in sort order"""
+        order = self.ordering(sort_by, sort_order)
+        mask = self._generated_mask(**filters)
+        added = len(order) - self.size
+        if added:
+            mask = np.concatenate([mask, np.fromiter(
+                (self.matches(self.size + j, **filters) for j in range(added)), dtype=bool, count=added
+            )])
+        return order[mask[order]]
+
+    def matches(self, i, name=None, categories=None, min_price=None, max_price=None,
+                min_rating=None, attributes=None):
+        if i >= self.size:
+            product = self._added[i - self.size]
+            price, rating = product.get("price", 0), product.get("rating", 0)
+            category_names = {c.get("name", "") for c in product.get("categories", [])}
+            attrs = {a.get("name"): a.get("value") for a in product.get("attributes", [])}
+        else:
+            price, rating = self.price[i], self.rating[i] / 10
+            category_names = None
+            attrs = None
+        if min_price is not None and price < min_price:
+            return False
+        if max_price is not None and price > max_price:
+            return False
+        if min_rating is not None and rating < min_rating:
+            return False
+        if name and name.lower() not in self.name(i).lower():
+            return False
+        if categories:
+            if category_names is None:
+                category_names = {c["name"] for c in CATEGORIES if c["id"] in self._category_ids(i)}
+            if not any(c in category_names for c in categories):
+                return False
+        if attributes:
+            if attrs is None:
+                attrs = {a["name"]: a["value"] for a in self.get(i)["attributes"]}
+            if any(attrs.get(attr_name) != value for attr_name, value in attributes.items()):
+                return False
+        return True
+
+
+def _insertion_point(order, sort_key, index, descending):
+    """
+    Where index goes in order so it stays sorted by sort_key. index is the
+    newest product, so it goes after every tie, as a stable sort (ascending
+    or reverse=True) puts it.
+    """
+    value = sort_key(index)
+    low, high = 0, len(order)
+    while low < high:
+        middle = (low + high) // 2
+        other = sort_key(int(order[middle]))
+        if (other >= value) if descending else (other <= value):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def paginate(catalog, indexes, page, limit):
+    total = len(indexes)
+    start = (page - 1) * limit
+    return {
+        "products": [catalog.get(int(i)) for i in indexes[start:start + limit]],
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "totalPages": max(1, -(-total // limit))
+    }
+
+
+def make_token(email):
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip('=')
+    claims = {"sub": email, "exp": int(time.time()) + TOKEN_TTL_SECONDS, "jti": uuid.uuid4().hex}
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(claims)}.fake"
+
+
+def create_app(catalog, latency_ms=0.0, error_rate=0.0, seed=None):
+    """Build the fake backend Flask app around a FakeCatalog"""
+    app = Flask(__name__)
+    tokens = {}
+    fault_rng = random.Random(seed)
+    stats = {"requests": 0, "injected_errors": 0}
+
+    @app.before_request
+    def inject_faults():
+        stats["requests"] += 1
+        if latency_ms:
+            # Exponentially distributed around the mean, like real service latency
+            time.sleep(fault_rng.expovariate(1000.0 / latency_ms))
+        if error_rate and fault_rng.random() < error_rate:
+            stats["injected_errors"] += 1
+            return jsonify({"message": "Injected failure"}), 503
+
+    def authorized():
+        header = request.headers.get('Authorization', '')
+        token = header[7:] if header.startswith('Bearer ') else None
+        return token is not None and tokens.get(token, 0) > time.time()
+
+    def unauthorized():
+        return jsonify({"message": "Unauthorized"}), 401
+
+    def conditional(payload):
+        etag = _etag(payload)
+        if request.headers.get('If-None-Match') == etag:
+            return '', 304, {'ETag': etag}
+        return jsonify(payload), 200, {'ETag': etag}
+
+    def page_args(default_sort):
+        page = max(1, request.args.get('page', 1, type=int))
+        limit = min(1000, max(1, request.args.get('limit', 10, type=int)))
+        sort_by = request.args.get('sortBy', default_sort)
+        sort_order = request.args.get('sortOrder', 'desc' if default_sort == 'createdAt' else 'asc')
+        return page, limit, sort_by, sort_order
+
+    @app.route('/api/auth/signin', methods=['POST'])
+    def signin():
+        data = request.get_json(silent=True) or {}
+        if not data.get('email') or not data.get('password'):
+            return jsonify({"message": "email and password are required"}), 400
+        token = make_token(data['email'])
+        tokens[token] = time.time() + TOKEN_TTL_SECONDS
+        return jsonify({"access_token": token}), 201
+
+    @app.route('/api/categories', methods=['GET'])
+    def categories():
+        return conditional({"categories": CATEGORIES})
+
+    @app.route('/api/attributes', methods=['GET'])
+    def attributes():
+        return conditional({"attributes": ATTRIBUTES})
+
+    @app.route('/api/seller-product', methods=['GET', 'POST'])
+    def seller_product():
+        if not authorized():
+            return unauthorized()
+        if request.method == 'POST':
+            data = request.get_json(silent=True)
+            if not data or not data.get('name'):
+                return jsonify({"message": "Product name is required"}), 400
+            return jsonify(catalog.add(data)), 201
+        page, limit, sort_by, sort_order = page_args('createdAt')
+        return jsonify(paginate(catalog, catalog.ordering(sort_by, sort_order), page, limit))
+
+    @app.route('/api/product', methods=['GET'])
+    def product_search():
+        if not authorized():
+            return unauthorized()
+        page, limit, sort_by, sort_order = page_args('name')
+        attributes_filter = {}
+        for pair in filter(None, request.args.get('attributes', '').split(',')):
+            attr_name, _, value = pair.partition(':')
+            attributes_filter[attr_name] = value
+        filters = {
+            "name": request.args.get('name'),
+            "categories": [c for c in request.args.get('categories', '').split(',') if c],
+            "min_price": request.args.get('minPrice', type=float),
+            "max_price": request.args.get('maxPrice', type=float),
+            "min_rating": request.args.get('minRating', type=float),
+            "attributes": attributes_filter
+        }
+        indexes = catalog.search(sort_by, sort_order, **filters)
+        return jsonify(paginate(catalog, indexes, page, limit))
+
+    @app.route('/__stats', methods=['GET'])
+    def backend_stats():
+        return jsonify(dict(stats, products=len(catalog)))
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake e-commerce backend")
+    parser.add_argument('--products', type=int, default=1000, help="Generated catalog size")
+    parser.add_argument('--seed', type=int, default=42, help="Seed for catalog generation and fault injection")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Mean injected latency per request")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    started_at = time.time()
+    catalog = FakeCatalog(args.products, args.seed)
+    print(f"✅ Generated {args.products} products in {time.time() - started_at:.1f}s")
+    print(f"🚀 Fake backend on http://{args.host}:{args.port} "
+          f"(latency {args.latency_ms}ms, error rate {args.error_rate:.1%})")
+    app = create_app(catalog, args.latency_ms, args.error_rate, args.seed)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
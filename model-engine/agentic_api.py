@@ -1,13 +1,198 @@
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
 import requests
+from requests.adapters import HTTPAdapter
+from circuit_breaker import CircuitOpenError, get_breaker, endpoint_name
+from json_decode import decode_response, iter_json_array
+from metadata_cache import metadata_cache, NOT_MODIFIED
+from singleflight import SingleFlight
+from token_cache import token_cache
+
+# Override with ECOMMERCE_API_URL to point at a local backend such as fake_backend.py
+DEFAULT_BASE_URL = os.getenv("ECOMMERCE_API_URL", "https://api-ecommerce.sanjaysagar.com")
+
+# Connection pool / timeout / retry defaults
+DEFAULT_POOL_SIZE = 20
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.25
+DEFAULT_BACKOFF_MAX = 4.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Sessions are shared process-wide (one per pool size) so every AgenticAPI
+# instance reuses the same keep-alive connections.
+_sessions = {}
+_sessions_lock = threading.Lock()
+_stats = {"requests": 0, "retries": 0, "failures": 0}
+_stats_lock = threading.Lock()
+
+
+# Last successful product listings, served while an endpoint's breaker is open
+LAST_GOOD_MAX_ENTRIES = 256
+_last_good = OrderedDict()
+_last_good_lock = threading.Lock()
+
+
+def _remember(url, data):
+    with _last_good_lock:
+        _last_good[url] = data
+        _last_good.move_to_end(url)
+        while len(_last_good) > LAST_GOOD_MAX_ENTRIES:
+            _last_good.popitem(last=False)
+
+
+def _recall(url):
+    with _last_good_lock:
+        return _last_good.get(url)
+
+
+# Identical concurrent product GETs (same URL and auth identity) share one request
+_singleflight = SingleFlight()
+
+
+def get_singleflight_stats():
+    """Return request coalescing counters (calls, executions, deduplicated)"""
+    return _singleflight.get_stats()
+
+
+def _record(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def get_shared_session(pool_size=DEFAULT_POOL_SIZE):
+    """Return the process-wide requests.Session for the given pool size"""
+    with _sessions_lock:
+        session = _sessions.get(pool_size)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=False)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[pool_size] = session
+        return session
+
+
+def get_pool_stats():
+    """Return connection pool statistics across all shared sessions"""
+    connections_opened = 0
+    pool_requests = 0
+    pools = 0
+    with _sessions_lock:
+        sessions = list(_sessions.items())
+    for pool_size, session in sessions:
+        for adapter in set(session.adapters.values()):
+            manager = adapter.poolmanager
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                pools += 1
+                connections_opened += pool.num_connections
+                pool_requests += pool.num_requests
+    with _stats_lock:
+        stats = dict(_stats)
+    stats.update({
+        "sessions": len(sessions),
+        "host_pools": pools,
+        "connections_opened": connections_opened,
+        "pool_requests": pool_requests,
+        "connections_reused": max(0, pool_requests - connections_opened),
+        "reuse_ratio": round(1 - connections_opened / pool_requests, 3) if pool_requests else 0.0
+    })
+    return stats
+
 
 class AgenticAPI:
     """Handles all API-related operations: authentication, category/attribute fetching, product posting, and searching."""
 
-    def __init__(self, base_url="https://api-ecommerce.sanjaysagar.com"):
+    def __init__(self, base_url=DEFAULT_BASE_URL, pool_size=DEFAULT_POOL_SIZE,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES):
         self.base_url = base_url
+        self.session = get_shared_session(pool_size)
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff delay for the given retry attempt"""
+        return random.uniform(0, min(DEFAULT_BACKOFF_MAX, DEFAULT_BACKOFF_BASE * (2 ** attempt)))
+
+    def _request(self, method, url, timeout=None, retry=None, **kwargs):
+        """
+        Send a request through the shared session.
+
+        Idempotent GETs are retried on connection errors, timeouts and
+        RETRY_STATUS_CODES with jittered exponential backoff; other methods
+        are sent once unless retry=True is passed explicitly.
+        """
+        if retry is None:
+            retry = method.upper() == "GET"
+        breaker = get_breaker(endpoint_name(method, url))
+        attempts = self.max_retries + 1 if retry else 1
+        for attempt in range(attempts):
+            # Fails fast with CircuitOpenError while the endpoint's breaker is open
+            breaker.check()
+            _record("requests")
+            last_attempt = attempt == attempts - 1
+            started_at = time.monotonic()
+            try:
+                response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                breaker.record(False, time.monotonic() - started_at)
+                if last_attempt:
+                    _record("failures")
+                    raise
+            except BaseException:
+                # Not retried, but still recorded so a half-open probe slot is released
+                breaker.record(False, time.monotonic() - started_at)
+                _record("failures")
+                raise
+            else:
+                breaker.record(response.status_code < 500, time.monotonic() - started_at)
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+                response.close()
+            _record("retries")
+            time.sleep(self._backoff(attempt))
+
+    def _post(self, url, **kwargs):
+        return self._request("POST", url, **kwargs)
+
+    def _send_authorized(self, method, url, access_token, headers, **kwargs):
+        """
+        Send a bearer-authenticated request. On a 401 the cached token is
+        invalidated, a fresh one is fetched and the request is retried once.
+        """
+        response = self._request(method, url, headers=headers, **kwargs)
+        if response.status_code == 401:
+            fresh_token = token_cache.refresh_rejected(access_token)
+            if fresh_token and fresh_token != access_token:
+                headers = dict(headers, Authorization=f'Bearer {fresh_token}')
+                response = self._request(method, url, headers=headers, **kwargs)
+        return response
+
+    def get_pool_stats(self):
+        """Return shared connection pool statistics"""
+        return get_pool_stats()
+
+    def authenticate_user(self, email="sanjay@gmail.com", password="password", force_refresh=False):
+        """Get an access token, served from the process-wide token cache when still valid"""
+        key = (self.base_url, email)
+        if force_refresh:
+            token_cache.invalidate(key)
+        return token_cache.get(key, lambda: self._signin(email, password))
 
-    def authenticate_user(self, email="sanjay@gmail.com", password="password"):
-        """Authenticate user and get access token"""
+    def invalidate_token(self, email="sanjay@gmail.com"):
+        """Drop the cached access token for email"""
+        token_cache.invalidate((self.base_url, email))
+
+    def _signin(self, email, password):
+        """Authenticate user against the signin endpoint and get a new access token"""
         try:
             auth_url = f"{self.base_url}/api/auth/signin"
             auth_data = {
@@ -18,7 +203,7 @@ class AgenticAPI:
                 'accept': 'application/json',
                 'Content-Type': 'application/json'
             }
-            response = requests.post(auth_url, headers=headers, json=auth_data)
+            response = self._post(auth_url, headers=headers, json=auth_data)
             if response.status_code in [200, 201]:
                 auth_response = response.json()
                 access_token = auth_response.get("access_token")
@@ -48,7 +233,7 @@ class AgenticAPI:
                 'Content-Type': 'application/json',
                 'Authorization': f'Bearer {access_token}'
             }
-            response = requests.post(api_url, headers=headers, json=product_json)
+            response = self._send_authorized('POST', api_url, access_token, headers, json=product_json)
             if response.status_code in [200, 201]:
                 print(f"✅ Product successfully added to catalog!")
                 try:
@@ -74,81 +259,137 @@ class AgenticAPI:
             print(f"❌ Error sending product to API: {e}")
             return False
 
-    def get_available_categories(self, access_token):
-        """Fetch available categories from the API"""
-        try:
-            headers = {
-                'accept': 'application/json',
-                'Authorization': f'Bearer {access_token}'
-            }
-            response = requests.get(f"{self.base_url}/api/categories", headers=headers)
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('categories', [])
-            else:
-                print(f"❌ Failed to fetch categories. Status: {response.status_code}")
-                return []
-        except Exception as e:
-            print(f"❌ Error fetching categories: {e}")
-            return []
+    def get_available_categories(self, access_token=None):
+        """Fetch available categories from the API (served from the metadata cache)"""
+        categories = metadata_cache.get(
+            (self.base_url, 'categories'),
+            lambda entry: self._load_metadata('categories', access_token, entry)
+        )
+        return categories if categories is not None else []
+
+    def get_available_attributes(self, access_token=None):
+        """Fetch available attributes from the API (served from the metadata cache)"""
+        attributes = metadata_cache.get(
+            (self.base_url, 'attributes'),
+            lambda entry: self._load_metadata('attributes', access_token, entry)
+        )
+        return attributes if attributes is not None else []
+
+    def invalidate_metadata(self, name=None):
+        """Drop cached 'categories' or 'attributes' metadata, or both when name is None"""
+        if name is None:
+            metadata_cache.invalidate((self.base_url, 'categories'))
+            metadata_cache.invalidate((self.base_url, 'attributes'))
+        else:
+            metadata_cache.invalidate((self.base_url, name))
 
-    def get_available_attributes(self, access_token):
-        """Fetch available attributes from the API"""
+    def _load_metadata(self, name, access_token, entry):
+        """Conditionally GET /api/<name> for the metadata cache"""
         try:
-            headers = {
-                'accept': 'application/json',
-                'Authorization': f'Bearer {access_token}'
-            }
-            response = requests.get(f"{self.base_url}/api/attributes", headers=headers)
+            headers = {'accept': 'application/json'}
+            if access_token:
+                headers['Authorization'] = f'Bearer {access_token}'
+            if entry and entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry and entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            response = self._send_authorized('GET', f"{self.base_url}/api/{name}", access_token, headers)
+            if response.status_code == 304:
+                return NOT_MODIFIED
             if response.status_code == 200:
-                data = response.json()
-                return data.get('attributes', [])
-            else:
-                print(f"❌ Failed to fetch attributes. Status: {response.status_code}")
-                return []
+                data = decode_response(response)
+                return {
+                    "data": data.get(name, []),
+                    "etag": response.headers.get('ETag'),
+                    "last_modified": response.headers.get('Last-Modified')
+                }
+            print(f"❌ Failed to fetch {name}. Status: {response.status_code}")
+            return None
         except Exception as e:
-            print(f"❌ Error fetching attributes: {e}")
-            return []
+            print(f"❌ Error fetching {name}: {e}")
+            return None
+
+    def _coalesced_get(self, url, access_token, fetch):
+        """Share one in-flight fetch(url, access_token) among identical concurrent GETs"""
+        key = (url, token_cache.identity(access_token))
+        return _singleflight.do(key, lambda: fetch(url, access_token))
 
     def search_products(self, search_url, access_token):
-        """Perform the actual GET request for product search"""
+        """Perform the actual GET request for product search (coalesced; treat the result as read-only)"""
+        return self._coalesced_get(search_url, access_token, self._search_products)
+
+    def _search_products(self, search_url, access_token):
         try:
             headers = {
                 'accept': 'application/json',
                 'Authorization': f'Bearer {access_token}'
             }
-            response = requests.get(search_url, headers=headers)
+            response = self._send_authorized('GET', search_url, access_token, headers)
             if response.status_code == 200:
-                results = response.json()
+                results = decode_response(response)
                 print(f"✅ Found products!")
+                _remember(search_url, results)
                 return results
             else:
                 print(f"❌ Search failed. Status: {response.status_code}")
                 print(f"Response: {response.text}")
                 return None
+        except CircuitOpenError as e:
+            print(f"⚠️  {e}. Serving cached search results if available.")
+            return _recall(search_url)
         except Exception as e:
             print(f"❌ Error during search: {e}")
             return None
 
     def get_seller_products(self, access_token, page=1, limit=10, sort_by="createdAt", sort_order="desc"):
-        """Fetch seller products from the API with pagination and sorting"""
+        """Fetch seller products from the API with pagination and sorting (coalesced; treat the result as read-only)"""
+        # Build the URL with query parameters
+        url = f"{self.base_url}/api/seller-product?page={page}&limit={limit}&sortBy={sort_by}&sortOrder={sort_order}"
+        return self._coalesced_get(url, access_token, self._fetch_seller_products)
+
+    def _fetch_seller_products(self, url, access_token):
         try:
             headers = {
                 'accept': 'application/json',
                 'Authorization': f'Bearer {access_token}'
             }
-            
-            # Build the URL with query parameters
-            url = f"{self.base_url}/api/seller-product?page={page}&limit={limit}&sortBy={sort_by}&sortOrder={sort_order}"
-            
-            response = requests.get(url, headers=headers)
+            response = self._send_authorized('GET', url, access_token, headers)
             if response.status_code == 200:
-                data = response.json()
+                data = decode_response(response)
+                _remember(url, data)
                 return data
             else:
                 print(f"❌ Failed to fetch seller products. Status: {response.status_code}")
                 print(f"Response: {response.text}")
                 return None
+        except CircuitOpenError as e:
+            print(f"⚠️  {e}. Serving cached seller products if available.")
+            return _recall(url)
         except Exception as e:
             print(f"❌ Error fetching seller products: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def iter_seller_products(self, access_token, page=1, limit=100, sort_by="createdAt", sort_order="desc",
+                             meta=None, chunk_size=64 * 1024):
+        """
+        Stream one page of seller products, yielding each product as it is parsed.
+
+        The body is read in chunk_size pieces and decoded one product at a
+        time, so large pages never hold the whole body or tree in memory.
+        Top-level fields (total, totalPages, ...) are stored in meta if given.
+        """
+        url = f"{self.base_url}/api/seller-product?page={page}&limit={limit}&sortBy={sort_by}&sortOrder={sort_order}"
+        headers = {
+            'accept': 'application/json',
+            'Authorization': f'Bearer {access_token}'
+        }
+        try:
+            response = self._send_authorized('GET', url, access_token, headers, stream=True)
+        except Exception as e:
+            print(f"❌ Error fetching seller products: {e}")
+            return
+        with response:
+            if response.status_code != 200:
+                print(f"❌ Failed to fetch seller products. Status: {response.status_code}")
+                return
+            yield from iter_json_array(response.iter_content(chunk_size), "products", meta)
@@ -0,0 +1,309 @@
+import asyncio
+import functools
+import inspect
+import random
+import threading
+import time
+import httpx
+from circuit_breaker import CircuitOpenError, get_breaker, endpoint_name
+from agentic_api import (
+    AgenticAPI,
+    DEFAULT_BASE_URL,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_BACKOFF_BASE,
+    DEFAULT_BACKOFF_MAX,
+    RETRY_STATUS_CODES,
+    _recall,
+    _remember
+)
+from json_decode import decode_response
+from metadata_cache import metadata_cache, NOT_MODIFIED
+from singleflight import AsyncSingleFlight
+from token_cache import token_cache
+
+# Identical concurrent product GETs on a loop share one request, as with AgenticAPI
+_singleflight = AsyncSingleFlight()
+
+
+def get_singleflight_stats():
+    """Return async request coalescing counters (calls, executions, deduplicated)"""
+    return _singleflight.get_stats()
+
+
+class AsyncAgenticAPI:
+    """
+    asyncio sibling of AgenticAPI with the same method surface.
+
+    All requests share one httpx.AsyncClient connection pool. Tokens and
+    categories/attributes go through the same process-wide token and metadata
+    caches as AgenticAPI, so sync and async callers never duplicate signins
+    or metadata fetches.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, pool_size=DEFAULT_POOL_SIZE,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES):
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self._client = None
+        self._refreshing = set()
+        # The loop only keeps weak references to tasks, so background refreshes are held here until done
+        self._background_tasks = set()
+
+    @property
+    def client(self):
+        # Created lazily so the client binds to the event loop that first uses it
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _request(self, method, url, retry=None, **kwargs):
+        """Async counterpart of AgenticAPI._request (GETs retried with jittered backoff)"""
+        if retry is None:
+            retry = method.upper() == "GET"
+        breaker = get_breaker(endpoint_name(method, url))
+        attempts = self.max_retries + 1 if retry else 1
+        for attempt in range(attempts):
+            breaker.check()
+            last_attempt = attempt == attempts - 1
+            started_at = time.monotonic()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                breaker.record(False, time.monotonic() - started_at)
+                if last_attempt:
+                    raise
+            except BaseException:
+                # Includes cancellation; recorded so a half-open probe slot is released
+                breaker.record(False, time.monotonic() - started_at)
+                raise
+            else:
+                breaker.record(response.status_code < 500, time.monotonic() - started_at)
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+            await asyncio.sleep(random.uniform(0, min(DEFAULT_BACKOFF_MAX, DEFAULT_BACKOFF_BASE * (2 ** attempt))))
+
+    async def _send_authorized(self, method, url, access_token, headers, **kwargs):
+        response = await self._request(method, url, headers=headers, **kwargs)
+        if response.status_code == 401:
+            fresh_token = await asyncio.to_thread(token_cache.refresh_rejected, access_token)
+            if fresh_token and fresh_token != access_token:
+                headers = dict(headers, Authorization=f'Bearer {fresh_token}')
+                response = await self._request(method, url, headers=headers, **kwargs)
+        return response
+
+    async def authenticate_user(self, email="sanjay@gmail.com", password="password", force_refresh=False):
+        """Get an access token from the shared token cache, signing in off-loop on a miss"""
+        if not force_refresh:
+            access_token = token_cache.peek((self.base_url, email))
+            if access_token:
+                return access_token
+        # Signins are rare; reuse the sync path so the cache's single-refresh lock covers both clients
+        sync_api = AgenticAPI(self.base_url)
+        return await asyncio.to_thread(sync_api.authenticate_user, email, password, force_refresh)
+
+    async def send_product_to_api(self, product_json, access_token):
+        """Send the generated product JSON to the API endpoint with authentication"""
+        api_url = f"{self.base_url}/api/seller-product"
+        try:
+            headers = {
+                'accept': 'application/json',
+                'Content-Type': 'application/json',
+                'Authorization': f'Bearer {access_token}'
+            }
+            response = await self._send_authorized('POST', api_url, access_token, headers, json=product_json)
+            if response.status_code in [200, 201]:
+                print(f"✅ Product successfully added to catalog!")
+                return True
+            print(f"❌ Failed to add product. Status: {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
+        except httpx.ConnectError:
+            print(f"❌ Failed to connect to API. Make sure the server is running on {self.base_url}")
+            return False
+        except Exception as e:
+            print(f"❌ Error sending product to API: {e}")
+            return False
+
+    async def get_available_categories(self, access_token=None):
+        """Fetch available categories (served from the metadata cache)"""
+        categories = await self._get_metadata('categories', access_token)
+        return categories if categories is not None else []
+
+    async def get_available_attributes(self, access_token=None):
+        """Fetch available attributes (served from the metadata cache)"""
+        attributes = await self._get_metadata('attributes', access_token)
+        return attributes if attributes is not None else []
+
+    async def get_search_metadata(self, access_token=None):
+        """Fetch categories and attributes concurrently; returns (categories, attributes)"""
+        return await asyncio.gather(
+            self.get_available_categories(access_token),
+            self.get_available_attributes(access_token)
+        )
+
+    async def _get_metadata(self, name, access_token):
+        key = (self.base_url, name)
+        entry, state = metadata_cache.peek(key)
+        if state == "fresh":
+            return entry["data"]
+        if state == "stale":
+            if key not in self._refreshing:
+                self._refreshing.add(key)
+                task = asyncio.ensure_future(self._refresh_metadata(name, access_token, entry))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            return entry["data"]
+        result = await self._load_metadata(name, access_token, entry)
+        return metadata_cache.store(key, result, entry)
+
+    async def _refresh_metadata(self, name, access_token, entry):
+        key = (self.base_url, name)
+        try:
+            metadata_cache.store(key, await self._load_metadata(name, access_token, entry), entry)
+        finally:
+            self._refreshing.discard(key)
+
+    async def _load_metadata(self, name, access_token, entry):
+        """Conditionally GET /api/<name>; same result contract as AgenticAPI._load_metadata"""
+        try:
+            headers = {'accept': 'application/json'}
+            if access_token:
+                headers['Authorization'] = f'Bearer {access_token}'
+            if entry and entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry and entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            response = await self._send_authorized('GET', f"{self.base_url}/api/{name}", access_token, headers)
+            if response.status_code == 304:
+                return NOT_MODIFIED
+            if response.status_code == 200:
+                return {
+                    "data": decode_response(response).get(name, []),
+                    "etag": response.headers.get('ETag'),
+                    "last_modified": response.headers.get('Last-Modified')
+                }
+            print(f"❌ Failed to fetch {name}. Status: {response.status_code}")
+            return None
+        except Exception as e:
+            print(f"❌ Error fetching {name}: {e}")
+            return None
+
+    async def _coalesced_get(self, url, access_token, fetch):
+        """Share one in-flight fetch(url, access_token) among identical concurrent GETs"""
+        key = (url, token_cache.identity(access_token))
+        return await _singleflight.do(key, lambda: fetch(url, access_token))
+
+    async def search_products(self, search_url, access_token):
+        """Perform the actual GET request for product search (coalesced; treat the result as read-only)"""
+        return await self._coalesced_get(search_url, access_token, self._search_products)
+
+    async def _search_products(self, search_url, access_token):
+        try:
+            headers = {
+                'accept': 'application/json',
+                'Authorization': f'Bearer {access_token}'
+            }
+            response = await self._send_authorized('GET', search_url, access_token, headers)
+            if response.status_code == 200:
+                print(f"✅ Found products!")
+                results = decode_response(response)
+                _remember(search_url, results)
+                return results
+            print(f"❌ Search failed. Status: {response.status_code}")
+            print(f"Response: {response.text}")
+            return None
+        except CircuitOpenError as e:
+            print(f"⚠️  {e}. Serving cached search results if available.")
+            return _recall(search_url)
+        except Exception as e:
+            print(f"❌ Error during search: {e}")
+            return None
+
+    async def get_seller_products(self, access_token, page=1, limit=10, sort_by="createdAt", sort_order="desc"):
+        """Fetch seller products from the API with pagination and sorting (coalesced; treat the result as read-only)"""
+        url = f"{self.base_url}/api/seller-product?page={page}&limit={limit}&sortBy={sort_by}&sortOrder={sort_order}"
+        return await self._coalesced_get(url, access_token, self._fetch_seller_products)
+
+    async def _fetch_seller_products(self, url, access_token):
+        try:
+            headers = {
+                'accept': 'application/json',
+                'Authorization': f'Bearer {access_token}'
+            }
+            response = await self._send_authorized('GET', url, access_token, headers)
+            if response.status_code == 200:
+                data = decode_response(response)
+                _remember(url, data)
+                return data
+            print(f"❌ Failed to fetch seller products. Status: {response.status_code}")
+            print(f"Response: {response.text}")
+            return None
+        except CircuitOpenError as e:
+            print(f"⚠️  {e}. Serving cached seller products if available.")
+            return _recall(url)
+        except Exception as e:
+            print(f"❌ Error fetching seller products: {e}")
+            return None
+
+
+# Sync facade: one background event loop owns a shared AsyncAgenticAPI per
+# base_url, so blocking callers (Flask workers) share a single async pool.
+_loop = None
+_loop_lock = threading.Lock()
+_shared_apis = {}
+
+
+def _get_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="agentic-api-loop", daemon=True).start()
+        return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared background loop and block for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+class SyncAgenticAPI:
+    """Blocking facade over the shared AsyncAgenticAPI; every coroutine method becomes a plain call"""
+
+    def __init__(self, base_url=DEFAULT_BASE_URL):
+        with _loop_lock:
+            api = _shared_apis.get(base_url)
+            if api is None:
+                api = _shared_apis[base_url] = AsyncAgenticAPI(base_url)
+        self._api = api
+        self.base_url = base_url
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            return run_sync(attr(*args, **kwargs))
+        return call
@@ -0,0 +1,159 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PAGE_RETRIES = 3
+
+
+class CatalogCrawler:
+    """
+    Crawl the full seller catalog through AgenticAPI.get_seller_products.
+
+    The first page is fetched to learn totalPages; the remaining pages are
+    fetched concurrently by at most max_workers threads, with a bounded
+    look-ahead window so memory stays constant regardless of catalog size.
+    Products are yielded strictly in page order.
+
+    With stream=True pages are instead read one at a time through
+    AgenticAPI.iter_seller_products and each product is yielded as soon as it
+    is parsed, so memory is bounded by one product rather than by the
+    look-ahead window of whole pages; suited to exports with large page sizes.
+    """
+
+    def __init__(self, api, access_token, page_size=DEFAULT_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS,
+                 page_retries=DEFAULT_PAGE_RETRIES, sort_by="createdAt", sort_order="desc", progress=None,
+                 stream=False):
+        self.api = api
+        self.access_token = access_token
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.page_retries = page_retries
+        self.sort_by = sort_by
+        self.sort_order = sort_order
+        self.progress = progress
+        self.stream = stream
+        self._lock = threading.Lock()
+        self.stats = {
+            "total_pages": 0,
+            "total_products": 0,
+            "pages_fetched": 0,
+            "pages_failed": 0,
+            "page_retries": 0,
+            "products_yielded": 0,
+            "elapsed_seconds": 0.0,
+            "products_per_second": 0.0
+        }
+        self._started_at = None
+
+    def _fetch_page(self, page):
+        """Fetch one page, retrying with jittered backoff; returns the page data or None"""
+        for attempt in range(self.page_retries + 1):
+            data = self.api.get_seller_products(self.access_token, page, self.page_size, self.sort_by, self.sort_order)
+            if data is not None:
+                with self._lock:
+                    self.stats["pages_fetched"] += 1
+                return data
+            if attempt < self.page_retries:
+                self._retry_wait(attempt)
+        with self._lock:
+            self.stats["pages_failed"] += 1
+        print(f"❌ Giving up on catalog page {page} after {self.page_retries + 1} attempts")
+        return None
+
+    def _retry_wait(self, attempt):
+        with self._lock:
+            self.stats["page_retries"] += 1
+        time.sleep(random.uniform(0, 0.5 * (2 ** attempt)))
+
+    def _stream_page(self, page, meta):
+        """
+        Yield one page's products as they are parsed, storing its top-level
+        fields in meta. A page that fails before its first product is retried;
+        one that breaks off midway is counted as failed, since retrying it
+        would yield its first products twice.
+        """
+        for attempt in range(self.page_retries + 1):
+            yielded = False
+            try:
+                for product in self.api.iter_seller_products(self.access_token, page, self.page_size,
+                                                             self.sort_by, self.sort_order, meta):
+                    yielded = True
+                    yield product
+            except Exception as e:
+                print(f"❌ Error streaming catalog page {page}: {e}")
+                if yielded:
+                    break
+            else:
+                # No top-level fields means the request itself failed
+                if meta:
+                    with self._lock:
+                        self.stats["pages_fetched"] += 1
+                    return
+            if attempt < self.page_retries:
+                self._retry_wait(attempt)
+        with self._lock:
+            self.stats["pages_failed"] += 1
+        print(f"❌ Giving up on catalog page {page}")
+
+    def _streamed_products(self):
+        self._started_at = time.time()
+        page, total_pages = 1, 1
+        while page <= total_pages:
+            meta = {}
+            yield from self._emit(self._stream_page(page, meta))
+            if page == 1:
+                if not meta:
+                    return
+                total_pages = int(meta.get('totalPages', 1) or 1)
+                self.stats["total_pages"] = total_pages
+                self.stats["total_products"] = meta.get('total', 0)
+            page += 1
+
+    def _emit(self, products):
+        for product in products:
+            self.stats["products_yielded"] += 1
+            yield product
+        elapsed = time.time() - self._started_at
+        self.stats["elapsed_seconds"] = round(elapsed, 3)
+        self.stats["products_per_second"] = round(self.stats["products_yielded"] / elapsed, 1) if elapsed > 0 else 0.0
+        if self.progress:
+            self.progress(dict(self.stats))
+
+    def pages(self):
+        """Yield page payloads in page order (failed pages are skipped)"""
+        self._started_at = time.time()
+        first = self._fetch_page(1)
+        if not first:
+            return
+        total_pages = int(first.get('totalPages', 1) or 1)
+        self.stats["total_pages"] = total_pages
+        self.stats["total_products"] = first.get('total', 0)
+        yield first
+
+        window = self.max_workers * 2
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="catalog-crawler") as executor:
+            pending = {}
+            next_page = 2
+            try:
+                for page in range(2, total_pages + 1):
+                    while next_page <= total_pages and len(pending) < window:
+                        pending[next_page] = executor.submit(self._fetch_page, next_page)
+                        next_page += 1
+                    data = pending.pop(page).result()
+                    if data:
+                        yield data
+            finally:
+                # Consumer stopped early: don't fetch pages nobody will read
+                for future in pending.values():
+                    future.cancel()
+
+    def products(self):
+        """Yield every product in the catalog, in page order"""
+        if self.stream:
+            yield from self._streamed_products()
+            return
+        for page_data in self.pages():
+            yield from self._emit(page_data.get('products', []))
@@ -0,0 +1,266 @@
+import hashlib
+import heapq
+import math
+import re
+import threading
+from array import array
+from facet_index import FacetIndex
+from fuzzy_index import TrigramIndex, correct_text, vocabulary_words
+
+# Per-field weight in the combined (BM25F) term frequency
+FIELD_BOOSTS = {"name": 3.0, "categories": 2.0, "attributes": 1.5, "description": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Compact postings once this share of indexed documents has been deleted or replaced
+COMPACT_DEAD_RATIO = 0.3
+
+_TOKEN = re.compile(r"\w+")
+STOP_WORDS = frozenset("a an and are for in is of on or the to with".split())
+# Fields whose words feed the spelling vocabulary
+SPELLING_FIELDS = ("name", "categories", "attributes")
+# Request phrasing that says nothing about the products wanted
+QUERY_STOP_WORDS = frozenset("find search show list get display me my all any some product".split())
+
+
+def analyze(text):
+    """Lowercased word tokens with stop words dropped and plurals folded"""
+    tokens = []
+    for token in _TOKEN.findall(str(text or "").lower()):
+        if token in STOP_WORDS:
+            continue
+        if len(token) > 4 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def product_fields(product):
+    """The searchable text of a product, per field"""
+    return {
+        "name": product.get('name', ''),
+        "description": product.get('description', ''),
+        "categories": " ".join(str(cat.get('name', '')) for cat in product.get('categories', []) if isinstance(cat, dict)),
+        "attributes": " ".join(
+            str(attr.get('value', '')) for attr in product.get('attributes', []) if isinstance(attr, dict)
+        )
+    }
+
+
+def product_key(product):
+    return product.get('id', product.get('_id'))
+
+
+class CatalogIndex:
+    """
+    In-memory inverted index over catalog products with BM25F ranking.
+
+    Each field keeps its own postings: per term, an array of document numbers
+    and an array of term frequencies. Field scores are combined with
+    FIELD_BOOSTS before BM25 saturation. Products are upserted by id;
+    a changed product gets a new document number and its old one is left as
+    a tombstone until the postings are compacted. Words of names, categories
+    and attribute values also go into a trigram spelling index for
+    "did you mean" suggestions, and every product into a FacetIndex for
+    filtering by category, attribute, price band and rating.
+    """
+
+    def __init__(self, boosts=None, k1=BM25_K1, b=BM25_B):
+        self.boosts = dict(boosts or FIELD_BOOSTS)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        # Facet slots are independent of document numbers, so compaction leaves them alone
+        self.facets = FacetIndex()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {field: {} for field in self.boosts}
+        self._lengths = {field: array('I') for field in self.boosts}
+        self._length_totals = dict.fromkeys(self.boosts, 0)
+        self._document_frequency = {}
+        self._products = []
+        self._fingerprints = []
+        self._documents = {}
+        self._dead = 0
+        self.vocabulary = TrigramIndex()
+
+    def __len__(self):
+        return len(self._documents)
+
+    @staticmethod
+    def _fingerprint(fields):
+        return hashlib.blake2b(repr(sorted(fields.items())).encode("utf-8"), digest_size=16).digest()
+
+    def upsert(self, product):
+        """Index product, replacing the indexed version with the same id; returns False if unchanged"""
+        key = product_key(product)
+        if key is None:
+            return False
+        fields = product_fields(product)
+        fingerprint = self._fingerprint(fields)
+        with self._lock:
+            # Price and rating are not searchable text but are faceted
+            self.facets.upsert(key, product)
+            current = self._documents.get(key)
+            if current is not None:
+                if self._fingerprints[current] == fingerprint:
+                    # Searchable text unchanged; keep the fresh copy for price, stock, ...
+                    self._products[current] = product
+                    return False
+                self._delete(current)
+            self._add(key, product, fields, fingerprint)
+            self._maybe_compact()
+            return True
+
+    def remove(self, key):
+        """Drop the product with this id; returns False if it was not indexed"""
+        with self._lock:
+            self.facets.remove(key)
+            document = self._documents.pop(key, None)
+            if document is None:
+                return False
+            self._delete(document)
+            self._maybe_compact()
+            return True
+
+    def sync(self, products, is_complete=None):
+        """
+        Bring the index in line with a catalog snapshot: changed products are
+        re-indexed, unchanged ones kept. Products missing from the snapshot
+        are removed once products is exhausted, unless is_complete() says
+        the snapshot was partial. Searches keep running while it streams in.
+        """
+        seen = set()
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        for product in products:
+            seen.add(product_key(product))
+            counts["indexed" if self.upsert(product) else "unchanged"] += 1
+        if is_complete is None or is_complete():
+            with self._lock:
+                for key in [key for key in self._documents if key not in seen]:
+                    self.remove(key)
+                    counts["removed"] += 1
+        return counts
+
+    def _add(self, key, product, fields, fingerprint):
+        document = len(self._products)
+        self._products.append(product)
+        self._fingerprints.append(fingerprint)
+        self._documents[key] = document
+        terms = set()
+        for field, text in fields.items():
+            tokens = analyze(text)
+            self._lengths[field].append(len(tokens))
+            self._length_totals[field] += len(tokens)
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            postings = self._postings[field]
+            for term, count in counts.items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = (array('I'), array('H'))
+                entry[0].append(document)
+                entry[1].append(min(count, 0xFFFF))
+            terms.update(counts)
+        for term in terms:
+            self._document_frequency[term] = self._document_frequency.get(term, 0) + 1
+        for word in self._spelling_words(fields):
+            self.vocabulary.add(word)
+
+    @staticmethod
+    def _spelling_words(fields):
+        return {word for field in SPELLING_FIELDS for word in vocabulary_words(fields[field])}
+
+    def _delete(self, document):
+        # Postings keep the document number until compaction; stats drop it now
+        terms = set()
+        for field in self.boosts:
+            length = self._lengths[field][document]
+            self._length_totals[field] -= length
+            self._lengths[field][document] = 0
+        fields = product_fields(self._products[document])
+        for text in fields.values():
+            terms.update(analyze(text))
+        for word in self._spelling_words(fields):
+            self.vocabulary.discard(word)
+        for term in terms:
+            remaining = self._document_frequency.get(term, 0) - 1
+            if remaining > 0:
+                self._document_frequency[term] = remaining
+            else:
+                self._document_frequency.pop(term, None)
+        self._products[document] = None
+        self._dead += 1
+
+    def _maybe_compact(self):
+        if self._dead and self._dead > COMPACT_DEAD_RATIO * len(self._products):
+            self.compact()
+
+    def compact(self):
+        """Rebuild postings without deleted documents"""
+        with self._lock:
+            live = [(key, self._products[document]) for key, document in self._documents.items()]
+            self._reset()
+            for key, product in live:
+                fields = product_fields(product)
+                self._add(key, product, fields, self._fingerprint(fields))
+
+    def is_known(self, word):
+        """True if word (after analysis) occurs in any indexed product"""
+        return any(term in self._document_frequency for term in analyze(word))
+
+    def suggest(self, query):
+        """query with misspelled words replaced by indexed ones, or None if nothing needed correcting"""
+        corrected, corrections = correct_text(query, [self.vocabulary], STOP_WORDS | QUERY_STOP_WORDS, self.is_known)
+        return corrected if corrections else None
+
+    def search(self, query, k=10):
+        """
+        Top k products for query as (score, product), best first, plus the
+        total number of matching products.
+        """
+        terms = set(analyze(query)) - QUERY_STOP_WORDS
+        with self._lock:
+            live = len(self._documents)
+            if not terms or not live:
+                return [], 0
+            averages = {
+                field: (self._length_totals[field] / live) or 1.0 for field in self.boosts
+            }
+            scores = {}
+            for term in terms:
+                df = self._document_frequency.get(term)
+                if not df:
+                    continue
+                idf = math.log(1.0 + (live - df + 0.5) / (df + 0.5))
+                weighted = {}
+                for field, boost in self.boosts.items():
+                    entry = self._postings[field].get(term)
+                    if entry is None:
+                        continue
+                    lengths = self._lengths[field]
+                    norm_base = 1.0 - self.b
+                    norm_scale = self.b / averages[field]
+                    for document, frequency in zip(*entry):
+                        if self._products[document] is None:
+                            continue
+                        normalized = frequency / (norm_base + norm_scale * lengths[document])
+                        weighted[document] = weighted.get(document, 0.0) + boost * normalized
+                for document, frequency in weighted.items():
+                    scores[document] = scores.get(document, 0.0) + idf * frequency / (self.k1 + frequency)
+            top = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+            return [(round(score, 4), self._products[document]) for document, score in top], len(scores)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "deleted": self._dead,
+                "terms": len(self._document_frequency),
+                "spelling_words": len(self.vocabulary),
+                "facets": self.facets.get_stats(),
+                "postings": sum(len(entry[0]) for postings in self._postings.values() for entry in postings.values())
+            }
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Breaker defaults: trip when >= 50% of the last 20 calls (min 5) failed or were
+# slower than 5s, stay open 30s, then let 1 probe call through.
+DEFAULT_WINDOW_SIZE = 20
+DEFAULT_MIN_CALLS = 5
+DEFAULT_FAILURE_RATE = 0.5
+DEFAULT_SLOW_CALL_SECONDS = 5.0
+DEFAULT_SLOW_CALL_RATE = 0.5
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_HALF_OPEN_CALLS = 1
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"Circuit open for {name}; retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker driven by error rate and latency
+    over a sliding window of the most recent calls.
+    """
+
+    def __init__(self, name, window_size=DEFAULT_WINDOW_SIZE, min_calls=DEFAULT_MIN_CALLS,
+                 failure_rate=DEFAULT_FAILURE_RATE, slow_call_seconds=DEFAULT_SLOW_CALL_SECONDS,
+                 slow_call_rate=DEFAULT_SLOW_CALL_RATE, open_seconds=DEFAULT_OPEN_SECONDS,
+                 half_open_calls=DEFAULT_HALF_OPEN_CALLS):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self._calls = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+
+    def allow(self):
+        """Return True if a call may proceed now"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.stats["rejected"] += 1
+                    return False
+                self.state = HALF_OPEN
+                self._half_open_in_flight = 0
+            if self.state == HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_calls:
+                    self.stats["rejected"] += 1
+                    return False
+                self._half_open_in_flight += 1
+            return True
+
+    def check(self):
+        """Like allow(), but raise CircuitOpenError when the call must not proceed"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in())
+
+    def retry_in(self):
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def record(self, success, latency):
+        """Record the outcome of a call that allow() let through"""
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["failures"] += 0 if success else 1
+            self.stats["slow_calls"] += 1 if slow else 0
+            if self.state == OPEN:
+                # Late result from a call admitted before the breaker tripped
+                return
+            if self.state == HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                if success and not slow:
+                    self.state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._trip()
+                return
+            self._calls.append((success, slow))
+            if self.state == CLOSED and len(self._calls) >= self.min_calls:
+                total = len(self._calls)
+                failures = sum(1 for ok, _ in self._calls if not ok)
+                slow_calls = sum(1 for _, is_slow in self._calls if is_slow)
+                if failures / total >= self.failure_rate or slow_calls / total >= self.slow_call_rate:
+                    self._trip()
+
+    def _trip(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+        self.stats["opened"] += 1
+
+    def status(self):
+        with self._lock:
+            status = {
+                "state": self.state,
+                "window_calls": len(self._calls),
+                "window_failures": sum(1 for ok, _ in self._calls if not ok),
+                "window_slow_calls": sum(1 for _, slow in self._calls if slow)
+            }
+            status.update(self.stats)
+        if status["state"] == OPEN:
+            status["retry_in_seconds"] = round(self.retry_in(), 1)
+        return status
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Return the process-wide circuit breaker for an endpoint name"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def breaker_status():
+    """Return {endpoint name: status} for every breaker created so far"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.status() for breaker in breakers}
+
+
+def endpoint_name(method, url):
+    """Breaker key for a request: method, host and path (query string ignored)"""
+    parts = urlsplit(url)
+    return f"{method.upper()} {parts.netloc}{parts.path or '/'}"
@@ -0,0 +1,119 @@
+from collections import deque
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class DictionaryMatcher:
+    """
+    Aho-Corasick automaton over a fixed dictionary of terms.
+
+    Built once from (term, payload) pairs; terms are matched case-insensitively.
+    find() scans the text once, keeps only hits that start and end on word
+    boundaries, and resolves overlapping hits longest-first (leftmost on ties),
+    so "t-shirt" wins over "shirt" and "men" never matches inside "women".
+    Several payloads may share a term; a hit carries all of them. With
+    plurals=True each term also matches with an "s" or "es" suffix.
+    """
+
+    def __init__(self, entries, plurals=False):
+        self._goto = [{}]
+        self._fail = [0]
+        # Term ending exactly at a node, and the nearest node on its fail chain that ends a term
+        self._term_at = [None]
+        self._output_link = [None]
+        self._payloads = {}
+        for term, payload in entries:
+            term = str(term).lower()
+            if not term:
+                continue
+            variants = (term, term + "s", term + "es") if plurals and _is_word_char(term[-1]) else (term,)
+            for variant in variants:
+                if variant not in self._payloads:
+                    self._payloads[variant] = []
+                    self._insert(variant)
+                if payload not in self._payloads[variant]:
+                    self._payloads[variant].append(payload)
+        self._link()
+
+    def _insert(self, term):
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._term_at.append(None)
+                self._output_link.append(None)
+            node = next_node
+        self._term_at[node] = term
+
+    def _link(self):
+        # Breadth-first, so every fail target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                fail = self._fail[child]
+                self._output_link[child] = fail if self._term_at[fail] is not None else self._output_link[fail]
+                queue.append(child)
+
+    def __len__(self):
+        return len(self._payloads)
+
+    def iter_hits(self, text):
+        """Every (start, end, term) occurrence in text on word boundaries, overlaps included"""
+        text = text.lower()
+        goto, fail, term_at, output_link = self._goto, self._fail, self._term_at, self._output_link
+        length = len(text)
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            end = position + 1
+            if end < length and _is_word_char(text[end]) and _is_word_char(char):
+                continue
+            hit = node if term_at[node] is not None else output_link[node]
+            while hit is not None:
+                term = term_at[hit]
+                start = end - len(term)
+                if start == 0 or not (_is_word_char(text[start - 1]) and _is_word_char(term[0])):
+                    yield start, end, term
+                hit = output_link[hit]
+
+    def find(self, text):
+        """
+        Non-overlapping hits as (start, end, term, payloads), in text order.
+        Longer hits claim their span first; ties go to the leftmost.
+        """
+        hits = sorted(self.iter_hits(text), key=lambda hit: (hit[0] - hit[1], hit[0]))
+        taken = []
+        for start, end, term in hits:
+            if all(end <= other_start or start >= other_end for other_start, other_end, _ in taken):
+                taken.append((start, end, term))
+        taken.sort()
+        return [(start, end, term, self._payloads[term]) for start, end, term in taken]
+
+    def payloads(self, text):
+        """Payloads of every term found in text (see find), in text order"""
+        return [payload for _, _, _, payloads in self.find(text) for payload in payloads]
+
+
+def keyword_table_matcher(table, plurals=True):
+    """DictionaryMatcher over a {label: [keywords]} table; payloads are the labels"""
+    return DictionaryMatcher(((keyword, label) for label, keywords in table.items() for keyword in keywords), plurals)
+
+
+def first_label(matcher, table, text, default):
+    """The first label of table (in table order) with a keyword in text, else default"""
+    found = set(matcher.payloads(text))
+    return next((label for label in table if label in found), default)
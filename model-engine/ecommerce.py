@@ -3,47 +3,76 @@ import json
 import urllib.parse
 import re
 import random
+import time
+import threading
 import requests
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-import google.generativeai as genai
-from agentic_api import AgenticAPI
+from agentic_api import AgenticAPI, DEFAULT_BASE_URL
+from async_agentic_api import SyncAgenticAPI
+from catalog_crawler import CatalogCrawler
+from catalog_index import CatalogIndex
+from llm_cache import product_json_cache, summary_cache, make_key, normalize_text
+from rate_limiter import TokenBucket
+from llm_executor import (
+    LLMExecutor,
+    LLMError,
+    LLMQuotaExceeded,
+    LLMRateLimited,
+    LLMAuthError,
+    LLMNetworkError
+)
+from prompt_encoder import DEFAULT_PROMPT_TOKEN_BUDGET, encode_products_table, estimate_tokens
+from startup_report import import_timer
+from llm_json import extract_json
+from product_schema import PRODUCT_FIELDS, category_id_set, validate_product
+from semantic_cache import answer_cache
+from search_query import parse_search_query
+from dictionary_matcher import DictionaryMatcher, first_label, keyword_table_matcher
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure Gemini
 google_api_key = os.getenv("GOOGLE_API_KEY")
-if google_api_key and google_api_key != "your-google-api-key-here":
-    genai.configure(api_key=google_api_key)
-    print("✅ Gemini API configured successfully!")
-else:
+if not google_api_key or google_api_key == "your-google-api-key-here":
     print("⚠️  GOOGLE_API_KEY not found or not set. Using fallback generator.")
 
-# Gemini model configuration
-model = genai.GenerativeModel('gemini-1.5-flash')
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
 
-def generate_product_json_with_gemini(user_input, categories=None):
-    """Generate product JSON using Google Gemini API"""
-    
-    # Get valid category IDs if provided
-    category_info = ""
-    if categories:
-        category_info = f"""
-        Available categories to use:
-        {json.dumps(categories, indent=2)}
-        
-        Important: Use ONLY the category IDs from the list above. Do not make up category IDs.
-        """
-    
-    prompt = f"""
-    You are an intelligent assistant that generates JSON objects for product catalogs.
-    
-    Generate a product JSON based on the following input: "{user_input}"
-    
-    {category_info}
-    
-    Return ONLY a valid JSON object with the following structure:
-    {{
+# The Gemini SDK is slow to import, so it is loaded and configured on first use
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """Import and configure the Gemini SDK and build the model once, on first use (thread-safe)"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                with import_timer("google.generativeai"):
+                    import google.generativeai as genai
+                if google_api_key and google_api_key != "your-google-api-key-here":
+                    genai.configure(api_key=google_api_key)
+                    print("✅ Gemini API configured successfully!")
+                _model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    return _model
+
+def warm_up():
+    """
+    Build the Gemini model ahead of the first request, e.g. in a pre-fork
+    server's master process. Only imports and configures; no connection is opened.
+    """
+    get_model()
+
+# Every Gemini call goes through this executor (rate limits, worker pool, typed errors)
+llm = LLMExecutor(model_factory=get_model)
+
+# Bump whenever the product generation prompt changes so cached results are not reused
+PRODUCT_PROMPT_VERSION = "1"
+
+# Shared by the single and batched product generation prompts
+PRODUCT_JSON_SCHEMA = """{
         "name": "Product name",
         "description": "Detailed description of the product",
         "stock": 25,
@@ -52,47 +81,46 @@ def generate_product_json_with_gemini(user_input, categories=None):
         "sku": "SKU-1234",
         "thumbnail": "https://example.com/product-thumb.jpg",
         "images": [
-            {{"url": "https://example.com/product-1.jpg"}},
-            {{"url": "https://example.com/product-2.jpg"}},
-            {{"url": "https://example.com/product-3.jpg"}}
+            {"url": "https://example.com/product-1.jpg"},
+            {"url": "https://example.com/product-2.jpg"},
+            {"url": "https://example.com/product-3.jpg"}
         ],
         "variants": [
-            {{
+            {
                 "name": "Size S",
                 "sku": "SKU-1234-S",
                 "price": 1500,
                 "stock": 10,
                 "thumbnail": "https://example.com/product-s-thumb.jpg",
                 "images": [
-                    {{"url": "https://example.com/product-s-1.jpg"}},
-                    {{"url": "https://example.com/product-s-2.jpg"}}
+                    {"url": "https://example.com/product-s-1.jpg"},
+                    {"url": "https://example.com/product-s-2.jpg"}
                 ]
-            }},
-            {{
+            },
+            {
                 "name": "Size M",
                 "sku": "SKU-1234-M",
                 "price": 1500,
                 "stock": 12,
                 "thumbnail": "https://example.com/product-m-thumb.jpg",
                 "images": [
-                    {{"url": "https://example.com/product-m-1.jpg"}},
-                    {{"url": "https://example.com/product-m-2.jpg"}}
+                    {"url": "https://example.com/product-m-1.jpg"},
+                    {"url": "https://example.com/product-m-2.jpg"}
                 ]
-            }}
+            }
         ],
         "categoryIds": ["valid-category-id-1", "valid-category-id-2"],
         "attributes": [
-            {{"name": "Fabric", "value": "Cotton"}},
-            {{"name": "Color", "value": "Red"}},
-            {{"name": "Gender", "value": "Women"}},
-            {{"name": "Style", "value": "Traditional"}},
-            {{"name": "Sleeve", "value": "3/4th"}},
-            {{"name": "Fit", "value": "Regular"}}
+            {"name": "Fabric", "value": "Cotton"},
+            {"name": "Color", "value": "Red"},
+            {"name": "Gender", "value": "Women"},
+            {"name": "Style", "value": "Traditional"},
+            {"name": "Sleeve", "value": "3/4th"},
+            {"name": "Fit", "value": "Regular"}
         ]
-    }}
-    
-    Important guidelines:
-    1. Extract product type, color, fabric, gender from the input
+    }"""
+
+PRODUCT_GUIDELINES = """1. Extract product type, color, fabric, gender from the input
     2. Handle spelling mistakes intelligently (e.g., "shert" → "shirt", "kurtha" → "kurta")
     3. Generate appropriate price based on product type and quality described
     4. Create realistic stock quantities (10-50 range)
@@ -102,77 +130,330 @@ def generate_product_json_with_gemini(user_input, categories=None):
     8. Use proper Indian pricing (₹ symbol in description but numbers in price field)
     9. Generate realistic product names that match the input
     10. Create comprehensive descriptions highlighting key features
-    11. MOST IMPORTANT: Use only valid category IDs from the provided list above
+    11. MOST IMPORTANT: Use only valid category IDs from the provided list above"""
+
+def product_json_cache_key(user_input, categories=None):
+    """Cache key for one generated product; shared by the single and batched generators"""
+    return make_key(
+        "product_json",
+        PRODUCT_PROMPT_VERSION,
+        normalize_text(user_input),
+        make_key(categories or [])
+    )
+
+def generate_product_json_with_gemini(user_input, categories=None):
+    """Generate product JSON using Google Gemini API (cached by input, categories and prompt version)"""
+
+    cache_key = product_json_cache_key(user_input, categories)
+    cached = product_json_cache.get(cache_key)
+    if cached is not None:
+        llm.metrics.record_cache_hit("product_json")
+        print("✅ Product JSON served from cache")
+        return cached
+
+    # Get valid category IDs if provided
+    category_info = ""
+    if categories:
+        category_info = f"""
+        Available categories to use:
+        {json.dumps(categories, indent=2)}
+        
+        Important: Use ONLY the category IDs from the list above. Do not make up category IDs.
+        """
+    
+    prompt = f"""
+    You are an intelligent assistant that generates JSON objects for product catalogs.
+    
+    Generate a product JSON based on the following input: "{user_input}"
+    
+    {category_info}
+    
+    Return ONLY a valid JSON object with the following structure:
+    {PRODUCT_JSON_SCHEMA}
+    
+    Important guidelines:
+    {PRODUCT_GUIDELINES}
     12. Return ONLY the JSON object, no additional text or markdown formatting
     """
     
+    # LLMError subclasses propagate so callers can pick a fallback by type
+    response_text = llm.generate(prompt, call_site="product_json")
     try:
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
-        
-        # Clean up the response to extract JSON
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        # Parse the JSON
-        product_json = json.loads(response_text)
-        return product_json
-        
-    except Exception as e:
-        print(f"❌ Gemini API error: {e}")
+        product_json = extract_json(response_text)
+    except ValueError as e:
+        print(f"❌ Gemini returned invalid JSON: {e}")
         return None
 
-def generate_mock_product_json(user_input, categories=None):
+    category_ids = category_id_set(categories)
+    product, errors = validate_product(product_json, category_ids)
+    if errors:
+        print(f"⚠️  Generated product has invalid fields: {', '.join(errors)}")
+        product = repair_product_fields(product_json, errors, user_input, categories, category_ids)
+        if product is None:
+            return None
+    product_json_cache.set(cache_key, product)
+    return product
+
+# Above this share of invalid fields, patching is not worth it
+MAX_REPAIR_FIELD_RATIO = 0.5
+
+def repair_product_fields(product_json, errors, user_input, categories=None, category_ids=None):
     """
-    Enhanced mock product generator with better AI-like intelligence
+    Re-prompt Gemini for only the invalid fields of a generated product and
+    merge the answer back in. Returns the validated product or None.
     """
-    import re
-    import random
+    if not isinstance(product_json, dict) or "__root__" in errors \
+            or len(errors) > len(PRODUCT_FIELDS) * MAX_REPAIR_FIELD_RATIO:
+        return None
+
+    category_info = ""
+    if "categoryIds" in errors and categories:
+        category_info = f"""
+    Available categories to use (use ONLY these IDs):
+    {json.dumps(categories, ensure_ascii=False)}
+    """
+    problems = "\n    ".join(f"- {field}: {message}" for field, message in errors.items())
+    prompt = f"""
+    You generated this product JSON for the input "{user_input}":
+    {json.dumps(product_json, ensure_ascii=False)}
+    {category_info}
+    These fields are missing or invalid:
+    {problems}
+
+    Return ONLY a JSON object containing corrected values for exactly these fields: {", ".join(errors)}.
+    Use the same field formats as this example product:
+    {PRODUCT_JSON_SCHEMA}
+    """
+    try:
+        fixes = extract_json(llm.generate(prompt, expected_output_tokens=256, call_site="product_repair"))
+    except ValueError as e:
+        print(f"❌ Gemini returned invalid JSON for the field repair: {e}")
+        return None
+    if not isinstance(fixes, dict):
+        return None
+
+    merged = dict(product_json)
+    merged.update({field: value for field, value in fixes.items() if field in errors})
+    product, errors = validate_product(merged, category_ids)
+    if errors:
+        print(f"❌ Product still invalid after repair: {', '.join(errors)}")
+        return None
+    print("✅ Invalid product fields repaired")
+    return product
+
+# Batched generation: one prompt carries the schema and categories once for many inputs
+BATCH_TOKEN_BUDGET = 8000
+BATCH_OUTPUT_TOKENS_PER_PRODUCT = 450
+MAX_PRODUCTS_PER_PROMPT = 20
+BATCH_GENERATION_ROUNDS = 3
+# Bulk batches queue behind the per-minute limit rather than being rejected at once
+BATCH_MAX_WAIT = 60
+
+# Running estimate of response tokens per product, learned from parsed batches
+_batch_output_estimate = {"tokens_per_product": BATCH_OUTPUT_TOKENS_PER_PRODUCT}
+
+def build_product_batch_prompt(user_inputs, categories=None):
+    """Prompt asking for one product per numbered input, with schema and categories sent once"""
+    category_info = ""
+    if categories:
+        category_info = f"""
+        Available categories to use:
+        {json.dumps(categories, indent=2)}
+        
+        Important: Use ONLY the category IDs from the list above. Do not make up category IDs.
+        """
+    numbered_inputs = "\n    ".join(f'[{i}] {json.dumps(text, ensure_ascii=False)}' for i, text in enumerate(user_inputs))
+
+    return f"""
+    You are an intelligent assistant that generates JSON objects for product catalogs.
     
-    # Smart product type detection
-    product_types = {
-        'kurta': ['kurta', 'karta', 'kurtha', 'ethnic', 'traditional'],
-        'shirt': ['shirt', 'shart', 'shert', 'formal', 'office'],
-        'dress': ['dress', 'dres', 'drss', 'gown', 'frock'],
-        'pants': ['pants', 'pant', 'trousers', 'trouser'],
-        'jeans': ['jeans', 'jean', 'denim'],
-        't-shirt': ['t-shirt', 'tshirt', 'tshert', 'casual'],
-        'saree': ['saree', 'sari', 'sare'],
-        'top': ['top', 'blouse', 'tunic']
-    }
+    Generate one product JSON for EACH of the following {len(user_inputs)} numbered inputs:
+    {numbered_inputs}
     
-    product_type = "kurta"  # default
-    for ptype, keywords in product_types.items():
-        if any(keyword in user_input.lower() for keyword in keywords):
-            product_type = ptype
-            break
+    {category_info}
     
-    # Smart color detection
-    colors = {
-        'red': ['red', 'crimson', 'scarlet'],
-        'blue': ['blue', 'navy', 'royal'],
-        'green': ['green', 'olive', 'emerald'],
-        'black': ['black', 'ebony'],
-        'white': ['white', 'ivory', 'cream'],
-        'pink': ['pink', 'rose'],
-        'yellow': ['yellow', 'golden'],
-        'purple': ['purple', 'violet']
-    }
+    Return ONLY a valid JSON array with exactly {len(user_inputs)} objects, one per input.
+    Each object must have an "index" field with the input's number, plus the following structure:
+    {PRODUCT_JSON_SCHEMA}
     
-    color = "red"  # default
-    for clr, keywords in colors.items():
-        if any(keyword in user_input.lower() for keyword in keywords):
-            color = clr
+    Important guidelines (apply to every product):
+    {PRODUCT_GUIDELINES}
+    12. Return ONLY the JSON array, no additional text or markdown formatting
+    """
+
+def plan_product_batches(items, categories=None, token_budget=BATCH_TOKEN_BUDGET, max_batch_size=MAX_PRODUCTS_PER_PROMPT):
+    """
+    Split (index, text) items into batches whose estimated prompt plus
+    response size stays under token_budget. Every batch holds at least one item.
+    """
+    overhead = estimate_tokens(build_product_batch_prompt([], categories))
+    output_per_product = _batch_output_estimate["tokens_per_product"]
+    batches, current, used = [], [], overhead
+    for item in items:
+        cost = estimate_tokens(json.dumps(item[1], ensure_ascii=False)) + 4 + output_per_product
+        if current and (used + cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, used = [], overhead
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def parse_product_batch_response(response_text, expected, category_ids=None):
+    """
+    Map a batched Gemini response back to input positions.
+
+    Returns {position: product_json} for every product that parsed and
+    validated. A truncated or partly malformed array still yields the objects
+    before the damage, so only the missing positions need to be generated again.
+    """
+    try:
+        objects = extract_json(response_text, "[")
+    except ValueError:
+        return {}
+    if not isinstance(objects, list):
+        return {}
+
+    products = {}
+    indexed = any(isinstance(obj, dict) and "index" in obj for obj in objects)
+    for position, obj in enumerate(objects):
+        if not isinstance(obj, dict):
+            continue
+        if indexed:
+            position = obj.pop("index", None)
+            if not isinstance(position, int) or isinstance(position, bool):
+                continue
+        if not 0 <= position < expected or position in products:
+            continue
+        product, errors = validate_product(obj, category_ids)
+        if product is not None:
+            products[position] = product
+    return products
+
+def _parse_product_batch(batch, response_text, category_ids=None):
+    """Parse the response for a batch of (index, text) items; returns {index: product_json}"""
+    products = parse_product_batch_response(response_text, len(batch), category_ids)
+    if products:
+        observed = estimate_tokens(response_text) / len(products)
+        estimate = _batch_output_estimate["tokens_per_product"]
+        _batch_output_estimate["tokens_per_product"] = int(max(estimate * 0.8 + observed * 0.2, observed))
+    return {batch[position][0]: product for position, product in products.items()}
+
+def generate_products_json_with_gemini_batch(user_inputs, categories=None, token_budget=BATCH_TOKEN_BUDGET,
+                                             max_batch_size=MAX_PRODUCTS_PER_PROMPT, max_rounds=BATCH_GENERATION_ROUNDS,
+                                             max_wait=BATCH_MAX_WAIT):
+    """
+    Generate product JSON for many descriptions with as few Gemini calls as possible.
+
+    Descriptions are packed into prompts sized to stay under token_budget;
+    results are matched back by index and cached per description. Items that
+    fail to parse are re-run in later rounds with smaller batches. Each call
+    waits up to max_wait seconds for rate limiter capacity.
+
+    Returns:
+        tuple: (product JSON per input in input order, None where generation
+        failed; set of input indexes left ungenerated by the rate limit)
+    """
+    results = [None] * len(user_inputs)
+    category_ids = category_id_set(categories)
+    pending = []
+    for index, text in enumerate(user_inputs):
+        cached = product_json_cache.get(product_json_cache_key(text, categories))
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending.append((index, text))
+    if len(pending) < len(user_inputs):
+        llm.metrics.record_cache_hit("product_batch", len(user_inputs) - len(pending))
+        print(f"✅ {len(user_inputs) - len(pending)} product JSONs served from cache")
+
+    for round_number in range(max_rounds):
+        if not pending:
             break
+        batches = plan_product_batches(pending, categories, token_budget, max_batch_size)
+        print(f"Generating {len(pending)} products in {len(batches)} Gemini calls (round {round_number + 1})...")
+        # Batches of a round run concurrently on the LLM executor's worker pool
+        submitted = []
+        rate_limited = False
+        for batch in batches:
+            prompt = build_product_batch_prompt([text for _, text in batch], categories)
+            expected_tokens = len(batch) * _batch_output_estimate["tokens_per_product"]
+            try:
+                future = llm.submit(prompt, expected_output_tokens=expected_tokens, max_wait=max_wait,
+                                    call_site="product_batch")
+                submitted.append((batch, future))
+            except LLMRateLimited:
+                rate_limited = True
+                break
+
+        failed = []
+        for batch, future in submitted:
+            try:
+                products = _parse_product_batch(batch, future.result(), category_ids)
+            except LLMQuotaExceeded:
+                rate_limited = True
+                products = {}
+            except LLMError as e:
+                print(f"❌ Gemini API error for batch of {len(batch)}: {e}")
+                products = {}
+            for index, text in batch:
+                product_json = products.get(index)
+                if product_json is None:
+                    failed.append((index, text))
+                    continue
+                results[index] = product_json
+                product_json_cache.set(product_json_cache_key(text, categories), product_json)
+        if rate_limited:
+            print("⚠️  Gemini rate limit reached, leaving remaining products ungenerated")
+            return results, {index for index, _ in pending if results[index] is None}
+        if failed:
+            print(f"⚠️  {len(failed)} products failed to parse, retrying in smaller batches")
+            max_batch_size = max(1, max_batch_size // 2)
+        pending = failed
+
+    return results, set()
+
+# Keyword tables for the mock generator, most specific label first
+MOCK_PRODUCT_TYPES = {
+    'kurta': ['kurta', 'karta', 'kurtha', 'ethnic', 'traditional'],
+    'shirt': ['shirt', 'shart', 'shert', 'formal', 'office'],
+    'dress': ['dress', 'dres', 'drss', 'gown', 'frock'],
+    'pants': ['pants', 'pant', 'trousers', 'trouser'],
+    'jeans': ['jeans', 'jean', 'denim'],
+    't-shirt': ['t-shirt', 'tshirt', 'tshert', 'casual'],
+    'saree': ['saree', 'sari', 'sare'],
+    'top': ['top', 'blouse', 'tunic']
+}
+MOCK_COLORS = {
+    'red': ['red', 'crimson', 'scarlet'],
+    'blue': ['blue', 'navy', 'royal'],
+    'green': ['green', 'olive', 'emerald'],
+    'black': ['black', 'ebony'],
+    'white': ['white', 'ivory', 'cream'],
+    'pink': ['pink', 'rose'],
+    'yellow': ['yellow', 'golden'],
+    'purple': ['purple', 'violet']
+}
+MOCK_GENDERS = {
+    'Men': ['men', 'man', 'male', 'boy', 'gents'],
+    'Kids': ['kids', 'children', 'child']
+}
+MOCK_PRODUCT_TYPE_MATCHER = keyword_table_matcher(MOCK_PRODUCT_TYPES)
+MOCK_COLOR_MATCHER = keyword_table_matcher(MOCK_COLORS)
+MOCK_GENDER_MATCHER = keyword_table_matcher(MOCK_GENDERS)
+
+def generate_mock_product_json(user_input, categories=None):
+    """
+    Enhanced mock product generator with better AI-like intelligence
+    """
+    import re
+    import random
     
-    # Smart gender detection
-    gender = "Women"  # default
-    if any(word in user_input.lower() for word in ['men', 'man', 'male', 'boy', 'gents']):
-        gender = "Men"
-    elif any(word in user_input.lower() for word in ['kids', 'children', 'child']):
-        gender = "Kids"
+    # Smart product, color and gender detection (whole words; earlier table entries win)
+    product_type = first_label(MOCK_PRODUCT_TYPE_MATCHER, MOCK_PRODUCT_TYPES, user_input, "kurta")
+    color = first_label(MOCK_COLOR_MATCHER, MOCK_COLORS, user_input, "red")
+    gender = first_label(MOCK_GENDER_MATCHER, MOCK_GENDERS, user_input, "Women")
     
     # Extract numerical values
     price_match = re.search(r'₹(\d+)', user_input)
@@ -231,9 +512,11 @@ def generate_mock_product_json(user_input, categories=None):
     category_ids = []
     if categories:
         # Find matching categories based on product type and gender
+        category_keywords = DictionaryMatcher(
+            ((keyword, True) for keyword in [product_type, gender, 'clothing', 'apparel']), plurals=True
+        )
         for category in categories:
-            cat_name = category.get('name', '').lower()
-            if any(keyword in cat_name for keyword in [product_type, gender.lower(), 'clothing', 'apparel']):
+            if category_keywords.find(category.get('name', '')):
                 category_ids.append(category.get('id', category.get('_id', '')))
         
         # If no matches found, use first available category
@@ -268,25 +551,23 @@ def generate_mock_product_json(user_input, categories=None):
         ]
     }
 
+def fallback_to_mock(user_input, categories, reason, call_site="product_json"):
+    """Generate with the mock generator, recording the fallback in the LLM metrics"""
+    llm.metrics.record_fallback(call_site, reason)
+    print("Falling back to mock generator...")
+    return generate_mock_product_json(user_input, categories)
+
 def generate_product_json(user_input, use_mock=False):
     """
     Generate product JSON using Gemini API with fallback to mock generator
     """
-    # Fetch categories to ensure valid category IDs
-    import requests
-    categories = []
-    
-    try:
-        print("Fetching valid category IDs...")
-        response = requests.get("https://api-ecommerce.sanjaysagar.com/api/categories")
-        if response.status_code == 200:
-            data = response.json()
-            categories = data.get('categories', [])
-            print(f"✅ Found {len(categories)} valid categories")
-        else:
-            print(f"⚠️  Could not fetch categories, status code: {response.status_code}")
-    except Exception as e:
-        print(f"⚠️  Error fetching categories: {e}")
+    # Fetch categories to ensure valid category IDs (served from the metadata cache)
+    print("Fetching valid category IDs...")
+    categories = AgenticAPI().get_available_categories()
+    if categories:
+        print(f"✅ Found {len(categories)} valid categories")
+    else:
+        print("⚠️  Could not fetch categories")
     
     if use_mock:
         print("Using mock generator (API unavailable)")
@@ -303,92 +584,58 @@ def generate_product_json(user_input, use_mock=False):
                 return result
             else:
                 print("❌ Gemini API returned empty result.")
-                print("Falling back to mock generator...")
-                return generate_mock_product_json(user_input, categories)
+                return fallback_to_mock(user_input, categories, "empty_result")
+        except LLMRateLimited as e:
+            print("❌ Gemini request budget for this minute is used up.")
+            return fallback_to_mock(user_input, categories, type(e).__name__)
+        except LLMQuotaExceeded as e:
+            print("❌ Gemini API quota exceeded.")
+            return fallback_to_mock(user_input, categories, type(e).__name__)
+        except LLMAuthError as e:
+            print("❌ Gemini API authentication failed. Check your API key.")
+            return fallback_to_mock(user_input, categories, type(e).__name__)
+        except LLMNetworkError as e:
+            print("❌ Network connection error with Gemini API.")
+            return fallback_to_mock(user_input, categories, type(e).__name__)
         except Exception as e:
-            error_message = str(e).lower()
-            if "quota" in error_message or "exceeded" in error_message:
-                print("❌ Gemini API quota exceeded.")
-                print("Falling back to mock generator...")
-                return generate_mock_product_json(user_input, categories)
-            elif "rate_limit" in error_message:
-                print("❌ Gemini API rate limit reached.")
-                print("Falling back to mock generator...")
-                return generate_mock_product_json(user_input, categories)
-            elif "authentication" in error_message or "api_key" in error_message:
-                print("❌ Gemini API authentication failed. Check your API key.")
-                print("Falling back to mock generator...")
-                return generate_mock_product_json(user_input, categories)
-            elif "connection" in error_message or "network" in error_message:
-                print("❌ Network connection error with Gemini API.")
-                print("Falling back to mock generator...")
-                return generate_mock_product_json(user_input, categories)
-            else:
-                print(f"❌ Gemini API error: {e}")
-                print("Falling back to mock generator...")
-                return generate_mock_product_json(user_input, categories)
+            print(f"❌ Gemini API error: {e}")
+            return fallback_to_mock(user_input, categories, type(e).__name__)
     else:
         print("❌ GOOGLE_API_KEY not configured.")
-        print("Falling back to mock generator...")
-        return generate_mock_product_json(user_input, categories)
+        return fallback_to_mock(user_input, categories, "no_api_key")
 
-def parse_search_query(user_input, categories, attributes):
-    import re
-    search_params = {
-        'name': '',
-        'categories': [],
-        'minPrice': None,
-        'maxPrice': None,
-        'minRating': None,
-        'page': 1,
-        'limit': 10,
-        'sortBy': 'name',
-        'sortOrder': 'asc',
-        'attributes': {}
-    }
-    name_match = re.search(r'(find|search|show|get|list)\s+(.*?)(?:\s+(?:with|in|under|above|category|price|rating|sort)|\s*$)', user_input, re.IGNORECASE)
-    if name_match:
-        search_params['name'] = name_match.group(2).strip()
-    price_matches = re.findall(r'(?:price|cost)\s*(?:between|from)?\s*₹?(\d+)(?:\s*(?:to|-)\s*₹?(\d+))?', user_input, re.IGNORECASE)
-    if price_matches:
-        min_price, max_price = price_matches[0]
-        search_params['minPrice'] = int(min_price) if min_price else None
-        search_params['maxPrice'] = int(max_price) if max_price else None
-    min_price_match = re.search(r'(?:above|over|more\s+than|minimum)\s*₹?(\d+)', user_input, re.IGNORECASE)
-    if min_price_match:
-        search_params['minPrice'] = int(min_price_match.group(1))
-    max_price_match = re.search(r'(?:under|below|less\s+than|maximum)\s*₹?(\d+)', user_input, re.IGNORECASE)
-    if max_price_match:
-        search_params['maxPrice'] = int(max_price_match.group(1))
-    rating_match = re.search(r'rating\s*(?:above|over|more\s+than)?\s*(\d+)', user_input, re.IGNORECASE)
-    if rating_match:
-        search_params['minRating'] = int(rating_match.group(1))
-    page_match = re.search(r'page\s*(\d+)', user_input, re.IGNORECASE)
-    if page_match:
-        search_params['page'] = int(page_match.group(1))
-    limit_match = re.search(r'(?:limit|show|display)\s*(\d+)', user_input, re.IGNORECASE)
-    if limit_match:
-        search_params['limit'] = int(limit_match.group(1))
-    sort_match = re.search(r'sort\s+by\s+(\w+)(?:\s+(asc|desc|ascending|descending))?', user_input, re.IGNORECASE)
-    if sort_match:
-        search_params['sortBy'] = sort_match.group(1).lower()
-        if sort_match.group(2):
-            sort_order = sort_match.group(2).lower()
-            search_params['sortOrder'] = 'asc' if sort_order in ['asc', 'ascending'] else 'desc'
-    category_names = [cat['name'].lower() for cat in categories]
-    for category in categories:
-        if category['name'].lower() in user_input.lower():
-            search_params['categories'].append(category['name'])
-    for attribute in attributes:
-        attr_name = attribute['name'].lower()
-        for value in attribute['values']:
-            if attr_name in user_input.lower() and value.lower() in user_input.lower():
-                search_params['attributes'][attribute['name']] = value
-            elif value.lower() in user_input.lower():
-                search_params['attributes'][attribute['name']] = value
-    return search_params
-
-def build_search_url(search_params, base_url="https://api-ecommerce.sanjaysagar.com"):
+def generate_products_json(user_inputs, categories=None, use_mock=False, fallback_on_rate_limit=True):
+    """
+    Generate product JSON for a list of descriptions with batched Gemini calls,
+    falling back to the mock generator for any item Gemini could not produce.
+    With fallback_on_rate_limit=False, items the rate limiter kept from Gemini
+    are left as None instead.
+    """
+    if categories is None:
+        categories = AgenticAPI().get_available_categories()
+
+    results = [None] * len(user_inputs)
+    rate_limited = set()
+    google_api_key = os.getenv("GOOGLE_API_KEY")
+    reason = "generation_failed"
+    if not use_mock and google_api_key and google_api_key != "your-google-api-key-here":
+        results, rate_limited = generate_products_json_with_gemini_batch(user_inputs, categories)
+    elif not use_mock:
+        print("❌ GOOGLE_API_KEY not configured.")
+        reason = "no_api_key"
+
+    if fallback_on_rate_limit:
+        rate_limited = set()
+    missing = [i for i, product_json in enumerate(results) if product_json is None and i not in rate_limited]
+    if missing:
+        if not use_mock:
+            llm.metrics.record_fallback("product_batch", reason, len(missing))
+        print(f"Falling back to mock generator for {len(missing)} products...")
+        for i in missing:
+            results[i] = generate_mock_product_json(user_inputs[i], categories)
+    return results
+
+def build_search_url(search_params, base_url=DEFAULT_BASE_URL):
     url = f"{base_url}/api/product?"
     params = []
     if search_params['name']:
@@ -435,6 +682,7 @@ def add_product(user_input=None, show_json=False):
             print("Adding product to catalog...")
             success = api.send_product_to_api(output, access_token)
             if success:
+                mark_catalog_index_stale()
                 print("🎉 Product added successfully!")
             else:
                 print("❌ Failed to add product to API.")
@@ -458,7 +706,9 @@ def search_products_main(user_input=None):
             print("❌ Failed to fetch metadata. Cannot perform search.")
             return None
         print(f"Found {len(categories)} categories and {len(attributes)} attributes")
-        search_params = parse_search_query(user_input, categories, attributes)
+        search_params = parse_search_query(user_input, categories, attributes, ready_catalog_index())
+        if search_params.get('didYouMean'):
+            print(f"Did you mean: {search_params['didYouMean']}")
         search_url = build_search_url(search_params, api.base_url)
         print(f"Generated URL: {search_url}")
         results = api.search_products(search_url, access_token)
@@ -488,6 +738,7 @@ def add_product_api(user_input=None):
         if access_token:
             success = api.send_product_to_api(output, access_token)
             if success:
+                mark_catalog_index_stale()
                 return {
                     "success": True,
                     "message": "Product added successfully!",
@@ -511,30 +762,134 @@ def add_product_api(user_input=None):
             "message": "Failed to generate product JSON."
         }
 
+# Bulk ingestion: generation and posting run as a pipelined, bounded-concurrency job
+
+MAX_BATCH_SIZE = 1000
+
+def add_products_batch_api(user_inputs, max_generation_workers=4, max_post_workers=8, posts_per_second=5.0):
+    """
+    Generate and add many products from natural language descriptions.
+
+    Descriptions are packed into token-budgeted Gemini prompts that run on a
+    pool of max_generation_workers; as soon as a prompt's products are generated
+    they are handed to a pool of max_post_workers that posts them to
+    /api/seller-product, throttled to posts_per_second.
+    Authentication and the category fetch happen once for the whole batch.
+
+    Returns:
+        dict: success flag, counts and a per-item result report in input order
+    """
+    if not user_inputs or not isinstance(user_inputs, list):
+        return {
+            "success": False,
+            "message": "user_inputs must be a non-empty list of product descriptions."
+        }
+    if len(user_inputs) > MAX_BATCH_SIZE:
+        return {
+            "success": False,
+            "message": f"Batch too large: {len(user_inputs)} items (maximum {MAX_BATCH_SIZE})."
+        }
+
+    started_at = time.time()
+    api = AgenticAPI()
+    access_token = api.authenticate_user()
+    if not access_token:
+        return {
+            "success": False,
+            "message": "Failed to authenticate. Cannot send products to API."
+        }
+
+    post_limiter = TokenBucket(posts_per_second)
+    results = [{"index": i, "input": text, "success": False} for i, text in enumerate(user_inputs)]
+
+    def post(index, product_json):
+        post_limiter.acquire()
+        success = api.send_product_to_api(product_json, access_token)
+        results[index]["success"] = success
+        results[index]["message"] = "Product added successfully!" if success else "Failed to add product to API."
+
+    categories = api.get_available_categories()
+    items = []
+    for i, text in enumerate(user_inputs):
+        if isinstance(text, str) and text.strip():
+            items.append((i, text))
+        else:
+            results[i]["message"] = "Empty or invalid product description."
+
+    with ThreadPoolExecutor(max_workers=max_generation_workers, thread_name_prefix="batch-generate") as generators, \
+            ThreadPoolExecutor(max_workers=max_post_workers, thread_name_prefix="batch-post") as posters:
+        # Rate-limited items are reported as failed rather than posted as mock products
+        generation_futures = {
+            generators.submit(generate_products_json, [text for _, text in batch], categories,
+                              fallback_on_rate_limit=False): batch
+            for batch in plan_product_batches(items, categories)
+        }
+
+        post_futures = []
+        for future in as_completed(generation_futures):
+            batch = generation_futures[future]
+            try:
+                product_jsons = future.result()
+            except Exception as e:
+                product_jsons = [None] * len(batch)
+                for index, _ in batch:
+                    results[index]["error"] = str(e)
+            for (index, _), product_json in zip(batch, product_jsons):
+                if not product_json:
+                    results[index]["message"] = "Failed to generate product JSON."
+                    continue
+                results[index]["product_json"] = product_json
+                post_futures.append(posters.submit(post, index, product_json))
+
+        for future in post_futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"❌ Error posting batch item: {e}")
+
+    for result in results:
+        if "message" not in result:
+            result["message"] = "Failed to add product to API."
+    succeeded = sum(1 for result in results if result["success"])
+    if succeeded:
+        mark_catalog_index_stale()
+    return {
+        "success": succeeded > 0,
+        "message": f"Added {succeeded} of {len(user_inputs)} products.",
+        "total": len(user_inputs),
+        "succeeded": succeeded,
+        "failed": len(user_inputs) - succeeded,
+        "elapsed_seconds": round(time.time() - started_at, 2),
+        "results": results
+    }
+
 # API-friendly function to search products
 
 def search_products_api(user_input=None):
     if user_input is None:
         user_input = "find red cotton kurta under ₹1000 with rating above 3"
-    api = AgenticAPI()
+    # Async client behind a sync facade so categories and attributes are fetched concurrently
+    api = SyncAgenticAPI()
     access_token = api.authenticate_user()
     if access_token:
-        categories = api.get_available_categories(access_token)
-        attributes = api.get_available_attributes(access_token)
+        categories, attributes = api.get_search_metadata(access_token)
         if not categories and not attributes:
             return {
                 "success": False,
                 "message": "Failed to fetch metadata. Cannot perform search."
             }
-        search_params = parse_search_query(user_input, categories, attributes)
+        search_params = parse_search_query(user_input, categories, attributes, ready_catalog_index())
         search_url = build_search_url(search_params, api.base_url)
         results = api.search_products(search_url, access_token)
         if results:
-            return {
+            response = {
                 "success": True,
                 "message": "Search completed successfully!",
                 "results": results
             }
+            if search_params.get('didYouMean'):
+                response["did_you_mean"] = search_params['didYouMean']
+            return response
         else:
             return {
                 "success": False,
@@ -724,41 +1079,246 @@ def view_catalog(page=1, limit=10):
     """Quick view of the catalog"""
     return get_catalog_ai(page=page, limit=limit)
 
+def crawl_catalog(page_size=100, max_workers=8, sort_by="createdAt", sort_order="desc", progress=None,
+                  stream=False):
+    """
+    Create a CatalogCrawler over the whole seller catalog.
+
+    Iterate crawler.products() to stream every product in page order;
+    crawler.stats holds progress and throughput counters. With stream=True
+    pages are parsed incrementally one at a time instead of fetched concurrently.
+    Returns None if authentication fails.
+    """
+    api = AgenticAPI()
+    access_token = api.authenticate_user()
+    if not access_token:
+        print("❌ Authentication failed. Cannot crawl catalog.")
+        return None
+    return CatalogCrawler(api, access_token, page_size=page_size, max_workers=max_workers,
+                          sort_by=sort_by, sort_order=sort_order, progress=progress, stream=stream)
+
+# Exports page through with large pages parsed incrementally, so memory stays flat for any catalog size
+EXPORT_PAGE_SIZE = 1000
+
 def export_catalog_json(filename="catalog_export.json"):
-    """Export entire catalog to JSON"""
-    return get_catalog_ai(limit=100, export_format='json')
+    """Export entire catalog to JSON, streaming every product to disk as it is parsed"""
+    crawler = crawl_catalog(page_size=EXPORT_PAGE_SIZE, stream=True)
+    if not crawler:
+        return None
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write('{"products": [')
+            for i, product in enumerate(crawler.products()):
+                if i:
+                    f.write(', ')
+                json.dump(product, f, ensure_ascii=False)
+            f.write(f'], "total": {crawler.stats["products_yielded"]}}}')
+        print(f"✅ Catalog exported to {filename} ({crawler.stats['products_yielded']} products, "
+              f"{crawler.stats['products_per_second']} products/s)")
+        return crawler.stats
+    except Exception as e:
+        print(f"❌ Error exporting catalog: {e}")
+        return None
 
 def export_catalog_csv(filename="catalog_export.csv"):
-    """Export entire catalog to CSV"""
-    return get_catalog_ai(limit=100, export_format='csv')
+    """Export entire catalog to CSV, streaming every product to disk as it is parsed"""
+    crawler = crawl_catalog(page_size=EXPORT_PAGE_SIZE, stream=True)
+    if not crawler:
+        return None
+    if export_catalog_to_csv({'products': crawler.products()}, filename):
+        return crawler.stats
+    return None
+
+# Local full-catalog search index, kept in sync by crawling the catalog
+
+CATALOG_INDEX_TTL = int(os.getenv("CATALOG_INDEX_TTL", "300"))
+
+catalog_index = CatalogIndex()
+_catalog_index_state = {"synced_at": None, "stale": True, "syncing": False, "last_sync": None}
+_catalog_index_lock = threading.Lock()
+
+def mark_catalog_index_stale():
+    """Have the next search re-sync the index (after products are added or changed)"""
+    _catalog_index_state["stale"] = True
+
+def sync_catalog_index():
+    """
+    Crawl the whole catalog into the search index. Only products whose
+    searchable text changed are re-indexed; products missing from a complete
+    crawl are removed. Returns the sync counts, or None if the crawl could not start.
+    """
+    started_at = time.time()
+    crawler = crawl_catalog(sort_order="asc")
+    if crawler is None:
+        return None
+    _catalog_index_state["stale"] = False
+    counts = catalog_index.sync(crawler.products(), is_complete=lambda: not crawler.stats["pages_failed"])
+    counts["seconds"] = round(time.time() - started_at, 2)
+    _catalog_index_state["synced_at"] = time.time()
+    _catalog_index_state["last_sync"] = counts
+    print(f"📚 Catalog index synced: {counts['indexed']} indexed, {counts['unchanged']} unchanged, "
+          f"{counts['removed']} removed in {counts['seconds']}s")
+    return counts
+
+def _sync_catalog_index_in_background():
+    try:
+        sync_catalog_index()
+    except Exception as e:
+        print(f"⚠️  Background catalog index sync failed: {e}")
+    finally:
+        _catalog_index_state["syncing"] = False
+
+def _start_catalog_index_sync():
+    """Start a background crawl into the index unless one is already running"""
+    with _catalog_index_lock:
+        if _catalog_index_state["syncing"]:
+            return
+        _catalog_index_state["syncing"] = True
+    threading.Thread(target=_sync_catalog_index_in_background, name="catalog-index-sync", daemon=True).start()
+
+def get_catalog_index():
+    """
+    The catalog search index. The first call starts building it in the
+    background and returns None, so callers use the backend search until it
+    is ready; requests never wait for a crawl. Once built it is served as is
+    while a background crawl refreshes it when stale or older than CATALOG_INDEX_TTL.
+    """
+    state = _catalog_index_state
+    if state["synced_at"] is None:
+        _start_catalog_index_sync()
+        return None
+    if state["stale"] or time.time() - state["synced_at"] > CATALOG_INDEX_TTL:
+        _start_catalog_index_sync()
+    return catalog_index
+
+def ready_catalog_index():
+    """The catalog index if it has been built, without triggering a crawl"""
+    return catalog_index if _catalog_index_state["synced_at"] is not None else None
+
+def get_catalog_index_stats():
+    state = _catalog_index_state
+    return dict(catalog_index.get_stats(), synced_at=state["synced_at"], stale=state["stale"],
+                syncing=state["syncing"], last_sync=state["last_sync"])
+
+def _search_catalog_via_backend(query, page=1, limit=10):
+    """Name search through /api/product, used while the local index is being built"""
+    started_at = time.perf_counter()
+    api = AgenticAPI()
+    access_token = api.authenticate_user()
+    if not access_token:
+        return {
+            "success": False,
+            "message": "Catalog index is still building and authentication failed."
+        }
+    search_params = {
+        'name': query,
+        'categories': [],
+        'minPrice': None,
+        'maxPrice': None,
+        'minRating': None,
+        'page': page,
+        'limit': limit,
+        'sortBy': 'name',
+        'sortOrder': 'asc',
+        'attributes': {}
+    }
+    results = api.search_products(build_search_url(search_params, api.base_url), access_token)
+    if not results:
+        return {
+            "success": False,
+            "message": "Catalog index is still building and the backend search failed."
+        }
+    products = results.get('products', [])
+    total = results.get('total', len(products))
+    return {
+        "success": True,
+        "message": f"Found {total} products matching '{query}'",
+        "did_you_mean": None,
+        "results": products,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "totalPages": results.get('totalPages', (total + limit - 1) // limit),
+        "search_ms": round((time.perf_counter() - started_at) * 1000, 2),
+        "source": "backend"
+    }
+
+def search_catalog_api(query, page=1, limit=10):
+    """Rank the whole catalog against query with the local BM25 index (backend name search until it is built)"""
+    index = get_catalog_index()
+    if index is None:
+        return _search_catalog_via_backend(query, page, limit)
+    started_at = time.perf_counter()
+    # Typos only ever match nothing, so the corrected query replaces the original
+    did_you_mean = index.suggest(query)
+    hits, total = index.search(did_you_mean or query, k=page * limit)
+    results = [dict(product, score=score) for score, product in hits[(page - 1) * limit:]]
+    return {
+        "success": True,
+        "message": f"Found {total} products matching '{did_you_mean or query}'",
+        "did_you_mean": did_you_mean,
+        "results": results,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "totalPages": (total + limit - 1) // limit,
+        "search_ms": round((time.perf_counter() - started_at) * 1000, 2),
+        "source": "index"
+    }
+
+def facet_search_api(filters=None, page=1, limit=20):
+    """
+    Filter the whole catalog by categories, attributes, price band and rating
+    with the local facet bitmaps; returns the matching product ids and products
+    for the page plus the match count of every facet value.
+    """
+    index = get_catalog_index()
+    if index is None:
+        return {
+            "success": False,
+            "message": "Catalog index is still being built. Try again shortly."
+        }
+    started_at = time.perf_counter()
+    try:
+        result = index.facets.query(filters, offset=(page - 1) * limit, limit=limit)
+    except ValueError as e:
+        return {
+            "success": False,
+            "message": str(e)
+        }
+    total = result["total"]
+    return {
+        "success": True,
+        "message": f"Found {total} products matching the filters",
+        "ids": result["keys"],
+        "results": result["products"],
+        "facets": result["facets"],
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "totalPages": (total + limit - 1) // limit,
+        "search_ms": round((time.perf_counter() - started_at) * 1000, 2)
+    }
 
 def search_catalog(query, page=1, limit=10):
-    """Search products in catalog by name/description"""
+    """Search the whole catalog by name, description, categories and attribute values"""
     print(f"🔍 Searching catalog for: '{query}'")
-    # This would need to be implemented based on API search capabilities
-    # For now, fetch all and filter locally
-    products_data = get_catalog_ai(page=page, limit=limit)
-    
-    if not products_data or 'products' not in products_data:
+    result = search_catalog_api(query, page, limit)
+    if not result["success"]:
+        print(f"❌ {result['message']}")
         return None
     
-    # Filter products based on query
-    filtered_products = []
-    for product in products_data['products']:
-        name = product.get('name', '').lower()
-        description = product.get('description', '').lower()
-        if query.lower() in name or query.lower() in description:
-            filtered_products.append(product)
+    if result['did_you_mean']:
+        print(f"🔤 Did you mean: '{result['did_you_mean']}'")
     
-    # Create filtered response
     filtered_data = {
-        'products': filtered_products,
-        'total': len(filtered_products),
+        'products': result['results'],
+        'total': result['total'],
         'page': page,
-        'totalPages': 1
+        'totalPages': result['totalPages']
     }
     
-    if filtered_products:
+    if result['results']:
         display_product_catalog(filtered_data)
     else:
         print(f"❌ No products found matching '{query}'")
@@ -826,33 +1386,22 @@ def get_catalog_text_summary(page=1, limit=10, sort_by="createdAt", sort_order="
 
 # AI-powered catalog summary functions
 
-def generate_ai_catalog_summary(products_data):
+def generate_ai_catalog_summary(products_data, token_budget=DEFAULT_PROMPT_TOKEN_BUDGET):
     """Generate AI-powered catalog summary using Gemini"""
     try:
         # Configure Gemini
         google_api_key = os.getenv("GOOGLE_API_KEY")
         if not google_api_key or google_api_key == "your-google-api-key-here":
             print("⚠️  GOOGLE_API_KEY not configured, using fallback")
+            llm.metrics.record_fallback("catalog_summary", "no_api_key")
             return generate_basic_catalog_summary(products_data)
         
         # Prepare data for AI analysis
         products = products_data.get('products', [])
         total_products = products_data.get('total', len(products))
         
-        # Create a structured summary of the products
-        product_summary = []
-        for i, product in enumerate(products, 1):
-            summary_item = {
-                "index": i,
-                "name": product.get('name', 'Unknown'),
-                "price": product.get('price', 0),
-                "stock": product.get('stock', 0),
-                "categories": [cat.get('name', 'Unknown') for cat in product.get('categories', [])],
-                "attributes": {attr.get('name', 'Unknown'): attr.get('value', 'Unknown') for attr in product.get('attributes', [])},
-                "variants_count": len(product.get('variants', [])),
-                "images_count": len(product.get('images', []))
-            }
-            product_summary.append(summary_item)
+        # Compact table of the products, kept within the prompt token budget
+        product_table, shown = encode_products_table(products, token_budget)
         
         # Create prompt for AI summary
         prompt = f"""
@@ -860,10 +1409,10 @@ def generate_ai_catalog_summary(products_data):
 
         Catalog Data:
         - Total Products: {total_products}
-        - Products Shown: {len(products)}
+        - Products Shown: {shown}
         
-        Product Details:
-        {json.dumps(product_summary, indent=2)}
+        Product Details (one product per line, columns separated by |, empty = not set):
+{product_table}
 
         Please provide a comprehensive catalog summary that includes:
         1. Overall catalog overview (total products, categories)
@@ -880,17 +1429,12 @@ def generate_ai_catalog_summary(products_data):
         
         # Generate summary using Gemini
         print("🤖 Generating AI catalog summary...")
-        response = model.generate_content(prompt)
-        
-        if response and response.text:
-            return response.text.strip()
-        else:
-            print("❌ AI response was empty, using fallback")
-            return generate_basic_catalog_summary(products_data)
+        return llm.generate(prompt, call_site="catalog_summary")
             
     except Exception as e:
         print(f"❌ Error generating AI summary: {e}")
         print("Using fallback summary...")
+        llm.metrics.record_fallback("catalog_summary", type(e).__name__)
         return generate_basic_catalog_summary(products_data)
 
 def generate_basic_catalog_summary(products_data):
@@ -953,12 +1497,208 @@ def generate_basic_catalog_summary(products_data):
     
     return summary
 
-def get_ai_catalog_summary(page=1, limit=10, sort_by="createdAt", sort_order="desc"):
+# Map-reduce summarization of the whole catalog
+SUMMARY_PROMPT_VERSION = "1"
+SUMMARY_CHUNK_SIZE = 100
+SUMMARY_CHUNK_OUTPUT_TOKENS = 400
+# Map calls run as a background job, so they may wait this long for limiter capacity
+SUMMARY_MAX_WAIT = 120
+
+def _chunk_digest(products):
+    """Deterministic stand-in for a chunk summary when Gemini fails for that chunk"""
+    prices = [int(p.get('price', 0) or 0) for p in products]
+    stocks = [int(p.get('stock', 0) or 0) for p in products]
+    categories = Counter(cat.get('name', 'Unknown') for p in products for cat in p.get('categories', []))
+    top_categories = ", ".join(f"{name} ({count})" for name, count in categories.most_common(5)) or "none"
+    return (
+        f"- {len(products)} products; categories: {top_categories}\n"
+        f"- Price range ₹{min(prices, default=0)} - ₹{max(prices, default=0)}, "
+        f"average ₹{sum(prices) // len(prices) if prices else 0}\n"
+        f"- {sum(stocks)} units in stock; {sum(1 for s in stocks if s == 0)} out of stock, "
+        f"{sum(1 for s in stocks if 0 < s < 10)} low stock (<10)"
+    )
+
+def build_chunk_summary_prompt(product_table, chunk_number, shown):
+    """Map-step prompt: a short factual summary of one chunk of the catalog"""
+    return f"""
+    You are an intelligent e-commerce catalog analyst. Summarize chunk {chunk_number} of a larger product catalog.
+
+    Products in this chunk: {shown}
+    Product Details (one product per line, columns separated by |, empty = not set):
+{product_table}
+
+    Write at most 150 words of plain-text bullet points covering:
+    1. Product types and categories present
+    2. Price range and typical price
+    3. Stock levels, naming out-of-stock and low-stock (<10) products
+    4. Notable attributes (fabrics, colors, styles)
+    Only state facts visible in the data; another step will merge the chunk summaries.
+    """
+
+def build_reduce_summary_prompt(partial_summaries, total_products, text_input=None, final=True):
+    """Reduce-step prompt: merge partial summaries into one (final or intermediate) report"""
+    numbered = "\n\n".join(f"[Part {i}]\n{summary}" for i, summary in enumerate(partial_summaries, 1))
+    if not final:
+        return f"""
+    You are an intelligent e-commerce catalog analyst. Merge the following partial summaries of a product catalog
+    into one combined summary of at most 250 words. Keep every concrete number, product name and stock warning.
+
+{numbered}
+    """
+    context = f'\n    User Context/Request: "{text_input}"\n' if text_input else ""
+    return f"""
+    You are an intelligent e-commerce catalog analyst. The following are summaries of consecutive chunks of the
+    complete product catalog ({total_products} products). Combine them into one comprehensive catalog report.
+    {context}
+{numbered}
+
+    Please provide a comprehensive catalog summary that includes:
+    1. Overall catalog overview (total products, categories){" and a direct response to the user's request" if text_input else ""}
+    2. Price range analysis
+    3. Stock availability summary
+    4. Popular categories and product types
+    5. Key insights and trends
+    6. Actionable recommendations
+
+    Format the response as a readable text summary suitable for business reporting.
+    Keep it concise but informative. Use bullet points where appropriate.
+    """
+
+def summarize_catalog_chunk(products, chunk_number=1, token_budget=DEFAULT_PROMPT_TOKEN_BUDGET):
+    """
+    Summarize one chunk of products, served from the summary cache when the
+    chunk's content is unchanged. Returns (future or None, cache key, cached summary or None).
+    """
+    product_table, shown = encode_products_table(products, token_budget)
+    # The encoded table is exactly what the model sees, so it is the content hash
+    cache_key = make_key("catalog_chunk_summary", SUMMARY_PROMPT_VERSION, product_table)
+    cached = summary_cache.get(cache_key)
+    if cached is not None:
+        llm.metrics.record_cache_hit("summary_chunk")
+        return None, cache_key, cached
+    prompt = build_chunk_summary_prompt(product_table, chunk_number, shown)
+    future = llm.submit(prompt, expected_output_tokens=SUMMARY_CHUNK_OUTPUT_TOKENS, max_wait=SUMMARY_MAX_WAIT,
+                        call_site="summary_chunk")
+    return future, cache_key, None
+
+def reduce_catalog_summaries(summaries, total_products, text_input=None, token_budget=DEFAULT_PROMPT_TOKEN_BUDGET):
+    """Merge chunk summaries in rounds until they fit one prompt, then write the final report"""
+    level = list(summaries)
+    while len(level) > 1 and estimate_tokens("\n\n".join(level)) > token_budget:
+        groups, current, used = [], [], 0
+        for summary in level:
+            cost = estimate_tokens(summary) + 4
+            if current and used + cost > token_budget:
+                groups.append(current)
+                current, used = [], 0
+            current.append(summary)
+            used += cost
+        groups.append(current)
+        if len(groups) == len(level):
+            # Every summary is too large to pair up; cut them down instead of looping forever
+            level = [summary[:token_budget * 4 // len(level)] for summary in level]
+            break
+        print(f"🔁 Merging {len(level)} partial summaries into {len(groups)}...")
+        futures = [
+            llm.submit(build_reduce_summary_prompt(group, total_products, final=False), max_wait=SUMMARY_MAX_WAIT,
+                       call_site="summary_merge")
+            if len(group) > 1 else None
+            for group in groups
+        ]
+        level = [future.result() if future else group[0] for future, group in zip(futures, groups)]
+    return llm.generate(build_reduce_summary_prompt(level, total_products, text_input), max_wait=SUMMARY_MAX_WAIT,
+                        call_site="summary_reduce")
+
+def get_full_catalog_summary(text_input=None, chunk_size=SUMMARY_CHUNK_SIZE, token_budget=DEFAULT_PROMPT_TOKEN_BUDGET):
+    """
+    Hierarchical AI summary of the whole catalog.
+
+    The catalog is streamed page by page (one page = one chunk), each chunk is
+    summarized concurrently on the LLM executor as it arrives, and the partial
+    summaries are reduced into one report. Chunk summaries are cached by
+    content hash, so unchanged chunks are never summarized twice. Pages are
+    read oldest first so new products only change the last chunk.
+
+    Returns:
+        dict: ai_summary plus chunk and cache counters, or None if Gemini is
+        not configured or the catalog cannot be read
+    """
+    google_api_key = os.getenv("GOOGLE_API_KEY")
+    if not google_api_key or google_api_key == "your-google-api-key-here":
+        print("⚠️  GOOGLE_API_KEY not configured, full catalog summary unavailable")
+        return None
+
+    crawler = crawl_catalog(page_size=chunk_size, sort_by="createdAt", sort_order="asc")
+    if crawler is None:
+        return None
+
+    started_at = time.time()
+    chunks = []
+    total_products = 0
+    for chunk_number, page_data in enumerate(crawler.pages(), 1):
+        products = page_data.get('products', [])
+        if not products:
+            continue
+        total_products += len(products)
+        try:
+            future, cache_key, cached = summarize_catalog_chunk(products, chunk_number, token_budget)
+        except LLMError as e:
+            print(f"⚠️  Chunk {chunk_number} not summarized ({e}), using basic statistics")
+            llm.metrics.record_fallback("summary_chunk", type(e).__name__)
+            future, cache_key, cached = None, None, _chunk_digest(products)
+        # Only the digest fallback needs the products again; drop them otherwise
+        chunks.append({"future": future, "key": cache_key, "summary": cached,
+                       "products": products if future else None})
+
+    if not chunks:
+        return None
+
+    cached_chunks = sum(1 for chunk in chunks if chunk["future"] is None and chunk["key"])
+    summaries = []
+    for chunk_number, chunk in enumerate(chunks, 1):
+        if chunk["future"] is not None:
+            try:
+                chunk["summary"] = chunk["future"].result()
+                summary_cache.set(chunk["key"], chunk["summary"])
+            except LLMError as e:
+                print(f"⚠️  Chunk {chunk_number} not summarized ({e}), using basic statistics")
+                llm.metrics.record_fallback("summary_chunk", type(e).__name__)
+                chunk["summary"] = _chunk_digest(chunk["products"])
+            chunk["products"] = None
+        summaries.append(f"Chunk {chunk_number}:\n{chunk['summary']}")
+
+    print(f"🧩 Summarized {len(chunks)} chunks ({cached_chunks} from cache), reducing...")
+    try:
+        ai_summary = reduce_catalog_summaries(summaries, total_products, text_input, token_budget)
+    except LLMError as e:
+        print(f"❌ Error reducing catalog summaries: {e}")
+        llm.metrics.record_fallback("summary_reduce", type(e).__name__)
+        ai_summary = "\n\n".join(summaries)
+
+    return {
+        "ai_summary": ai_summary,
+        "total_products": total_products,
+        "chunks": len(chunks),
+        "cached_chunks": cached_chunks,
+        "elapsed_seconds": round(time.time() - started_at, 2)
+    }
+
+def get_ai_catalog_summary(page=1, limit=10, sort_by="createdAt", sort_order="desc", full_catalog=False):
     """
-    Get AI-powered catalog summary
+    Get AI-powered catalog summary (of one page, or of the whole catalog with full_catalog=True)
     """
     print("🤖 AI Catalog Summary - Fetching and analyzing your catalog...")
     
+    if full_catalog:
+        result = get_full_catalog_summary()
+        if result:
+            return {
+                "products_data": {"total": result["total_products"]},
+                "ai_summary": result["ai_summary"],
+                "summary_stats": result
+            }
+        print("⚠️  Full catalog summary unavailable, summarizing one page instead")
+    
     # Initialize API
     api = AgenticAPI()
     
@@ -1107,7 +1847,7 @@ def catalog_ai_api(action="view", page=1, limit=10, sort_by="createdAt", sort_or
             "data": None
         }
 
-def get_ai_catalog_summary_with_context(text_input, page=1, limit=10, sort_by="createdAt", sort_order="desc"):
+def get_ai_catalog_summary_with_context(text_input, page=1, limit=10, sort_by="createdAt", sort_order="desc", full_catalog=False):
     """
     Generate AI catalog summary with additional text context
     
@@ -1117,11 +1857,24 @@ def get_ai_catalog_summary_with_context(text_input, page=1, limit=10, sort_by="c
         limit (int): Number of products per page
         sort_by (str): Field to sort by
         sort_order (str): Sort order
+        full_catalog (bool): Summarize the whole catalog (map-reduce) instead of one page
     
     Returns:
         dict: AI summary with text context
     """
     try:
+        if full_catalog:
+            result = get_full_catalog_summary(text_input)
+            if result:
+                return {
+                    "ai_summary": result["ai_summary"],
+                    "products_data": {"total": result["total_products"]},
+                    "text_context": text_input,
+                    "full_catalog": True,
+                    "summary_stats": result
+                }
+            print("⚠️  Full catalog summary unavailable, summarizing one page instead")
+        
         # Initialize API and get products
         api = AgenticAPI()
         access_token = api.authenticate_user()
@@ -1165,85 +1918,134 @@ def get_ai_catalog_summary_with_context(text_input, page=1, limit=10, sort_by="c
         print(f"❌ Error generating AI catalog summary with context: {e}")
         return None
 
+def catalog_snapshot_hash(products_data):
+    """Hash of the catalog fields answers depend on; scopes cached answers to one snapshot"""
+    products = products_data.get('products', [])
+    return make_key(
+        products_data.get('total', len(products)),
+        [
+            (p.get('id', p.get('_id')), p.get('name'), p.get('price'), p.get('stock'), p.get('updatedAt'))
+            for p in products
+        ]
+    )
+
+def cached_answer(kind, products_data, text_input, call_site):
+    """
+    Look up a previous answer to a question with the same meaning against the
+    same catalog snapshot. Returns (answer or None, cache scope).
+    """
+    scope = (kind, catalog_snapshot_hash(products_data))
+    answer, similarity = answer_cache.lookup(scope, text_input)
+    if answer is not None:
+        llm.metrics.record_cache_hit(call_site)
+        print(f"🧠 Semantic cache hit for {kind} (similarity {similarity:.2f})")
+    return answer, scope
+
+def build_catalog_context_prompt(products_data, text_input, token_budget=DEFAULT_PROMPT_TOKEN_BUDGET):
+    """Gemini prompt for a catalog summary that answers the user's text context"""
+    # Prepare data for AI analysis
+    products = products_data.get('products', [])
+    total_products = products_data.get('total', len(products))
+    
+    # Compact table of the products, kept within the prompt token budget
+    product_table, shown = encode_products_table(products, token_budget)
+    
+    # Create prompt for AI summary with text context
+    prompt = f"""
+    You are an intelligent e-commerce catalog analyst. Analyze the following product catalog data and provide a comprehensive text summary, considering the user's specific context and requirements.
+
+    User Context/Request: "{text_input}"
+
+    Catalog Data:
+    - Total Products: {total_products}
+    - Products Shown: {shown}
+    
+    Product Details (one product per line, columns separated by |, empty = not set):
+{product_table}
+
+    Please provide a comprehensive catalog summary that addresses the user's specific context and includes:
+    1. Response to the user's specific request/context
+    2. Overall catalog overview relevant to the user's needs
+    3. Price range analysis in context of the user's request
+    4. Stock availability summary
+    5. Product recommendations based on user context
+    6. Key insights and trends related to the user's needs
+    7. Actionable recommendations tailored to the user's request
+
+    Format the response as a readable text summary suitable for business reporting.
+    Keep it concise but informative and directly address the user's context.
+    Use bullet points where appropriate.
+    """
+    return prompt
+
 def generate_ai_catalog_summary_with_context(products_data, text_input):
     """Generate AI-powered catalog summary with user text context"""
     try:
-        # Import Gemini
-        import google.generativeai as genai
-        from dotenv import load_dotenv
-        
-        load_dotenv()
-        
         # Configure Gemini
         google_api_key = os.getenv("GOOGLE_API_KEY")
         if not google_api_key or google_api_key == "your-google-api-key-here":
             print("⚠️  GOOGLE_API_KEY not configured, using fallback")
+            llm.metrics.record_fallback("context_summary", "no_api_key")
             return None
         
-        genai.configure(api_key=google_api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # Prepare data for AI analysis
-        products = products_data.get('products', [])
-        total_products = products_data.get('total', len(products))
-        
-        # Create a structured summary of the products
-        product_summary = []
-        for i, product in enumerate(products, 1):
-            summary_item = {
-                "index": i,
-                "name": product.get('name', 'Unknown'),
-                "price": product.get('price', 0),
-                "stock": product.get('stock', 0),
-                "categories": [cat.get('name', 'Unknown') for cat in product.get('categories', [])],
-                "attributes": {attr.get('name', 'Unknown'): attr.get('value', 'Unknown') for attr in product.get('attributes', [])},
-                "variants_count": len(product.get('variants', [])),
-                "images_count": len(product.get('images', []))
-            }
-            product_summary.append(summary_item)
-        
-        # Create prompt for AI summary with text context
-        prompt = f"""
-        You are an intelligent e-commerce catalog analyst. Analyze the following product catalog data and provide a comprehensive text summary, considering the user's specific context and requirements.
-
-        User Context/Request: "{text_input}"
-
-        Catalog Data:
-        - Total Products: {total_products}
-        - Products Shown: {len(products)}
-        
-        Product Details:
-        {json.dumps(product_summary, indent=2)}
-
-        Please provide a comprehensive catalog summary that addresses the user's specific context and includes:
-        1. Response to the user's specific request/context
-        2. Overall catalog overview relevant to the user's needs
-        3. Price range analysis in context of the user's request
-        4. Stock availability summary
-        5. Product recommendations based on user context
-        6. Key insights and trends related to the user's needs
-        7. Actionable recommendations tailored to the user's request
+        answer, scope = cached_answer("summary", products_data, text_input, "context_summary")
+        if answer is not None:
+            return answer
 
-        Format the response as a readable text summary suitable for business reporting.
-        Keep it concise but informative and directly address the user's context.
-        Use bullet points where appropriate.
-        """
+        prompt = build_catalog_context_prompt(products_data, text_input)
         
         # Generate summary using Gemini
-        response = model.generate_content(prompt)
-        
-        if response and response.text:
-            return response.text.strip()
-        else:
-            return None
+        answer = llm.generate(prompt, call_site="context_summary")
+        answer_cache.store(scope, text_input, answer)
+        return answer
             
-    except ImportError:
-        print("⚠️  Gemini libraries not available")
-        return None
     except Exception as e:
         print(f"❌ Error generating AI summary with context: {e}")
+        llm.metrics.record_fallback("context_summary", type(e).__name__)
         return None
 
+def fetch_catalog_page(page=1, limit=10, sort_by="createdAt", sort_order="desc"):
+    """Authenticate and fetch one page of seller products; returns None on failure"""
+    api = AgenticAPI()
+    access_token = api.authenticate_user()
+    if not access_token:
+        return None
+    return api.get_seller_products(access_token, page, limit, sort_by, sort_order)
+
+def stream_ai_catalog_summary_with_context(products_data, text_input):
+    """
+    Stream the text-context catalog summary from Gemini, yielding text chunks
+    as they arrive. Falls back to the basic summary if Gemini is unavailable
+    before the first chunk.
+    """
+    google_api_key = os.getenv("GOOGLE_API_KEY")
+    if not google_api_key or google_api_key == "your-google-api-key-here":
+        print("⚠️  GOOGLE_API_KEY not configured, using fallback")
+        llm.metrics.record_fallback("context_summary_stream", "no_api_key")
+        yield generate_basic_catalog_summary(products_data)
+        return
+
+    answer, scope = cached_answer("summary", products_data, text_input, "context_summary_stream")
+    if answer is not None:
+        yield answer
+        return
+
+    streamed = False
+    chunks = []
+    try:
+        for chunk in llm.stream(build_catalog_context_prompt(products_data, text_input), call_site="context_summary_stream"):
+            streamed = True
+            chunks.append(chunk)
+            yield chunk
+        answer_cache.store(scope, text_input, "".join(chunks))
+    except Exception as e:
+        print(f"❌ Error streaming AI summary with context: {e}")
+        if streamed:
+            yield "\n\n⚠️  Summary interrupted, the response above is incomplete."
+        else:
+            llm.metrics.record_fallback("context_summary_stream", type(e).__name__)
+            yield generate_basic_catalog_summary(products_data)
+
 def analyze_catalog_text(text_input, page=1, limit=10, sort_by="createdAt", sort_order="desc"):
     """
     Analyze text input in relation to catalog data
@@ -1292,20 +2094,16 @@ def analyze_catalog_text(text_input, page=1, limit=10, sort_by="createdAt", sort
 def perform_text_analysis(text_input, products_data):
     """Perform AI-powered text analysis in context of catalog"""
     try:
-        # Import Gemini
-        import google.generativeai as genai
-        from dotenv import load_dotenv
-        
-        load_dotenv()
-        
         # Configure Gemini
         google_api_key = os.getenv("GOOGLE_API_KEY")
         if not google_api_key or google_api_key == "your-google-api-key-here":
+            llm.metrics.record_fallback("text_analysis", "no_api_key")
             return perform_basic_text_analysis(text_input, products_data)
         
-        genai.configure(api_key=google_api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
+        answer, scope = cached_answer("analysis", products_data, text_input, "text_analysis")
+        if answer is not None:
+            return answer
+
         # Prepare data for analysis
         products = products_data.get('products', [])
         total_products = products_data.get('total', len(products))
@@ -1334,17 +2132,13 @@ def perform_text_analysis(text_input, products_data):
         """
         
         # Generate analysis using Gemini
-        response = model.generate_content(prompt)
-        
-        if response and response.text:
-            return response.text.strip()
-        else:
-            return perform_basic_text_analysis(text_input, products_data)
+        answer = llm.generate(prompt, call_site="text_analysis")
+        answer_cache.store(scope, text_input, answer)
+        return answer
             
-    except ImportError:
-        return perform_basic_text_analysis(text_input, products_data)
     except Exception as e:
         print(f"❌ Error performing text analysis: {e}")
+        llm.metrics.record_fallback("text_analysis", type(e).__name__)
         return perform_basic_text_analysis(text_input, products_data)
 
 def perform_basic_text_analysis(text_input, products_data):
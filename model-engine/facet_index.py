@@ -0,0 +1,255 @@
+import threading
+
+# Upper bounds of the price bands; the last band is open ended
+PRICE_BANDS = (500, 1000, 2500, 5000, 10000)
+# Rating buckets are cumulative: a 4.3 star product is in "4+", "3+", "2+" and "1+"
+RATING_THRESHOLDS = (4, 3, 2, 1)
+# Facets with a fixed value set; attributes are faceted per attribute name
+FACETS = ("categories", "price", "rating")
+
+# Key of the live-slot bitmap among the int snapshots
+_LIVE = (None, None)
+
+_popcount = getattr(int, "bit_count", None) or (lambda value: bin(value).count("1"))
+
+
+def price_band(price):
+    """Label of the PRICE_BANDS band price falls in, e.g. "500-1000" or "10000+" """
+    lower = 0
+    for upper in PRICE_BANDS:
+        if price < upper:
+            return f"{lower}-{upper}"
+        lower = upper
+    return f"{lower}+"
+
+
+def price_band_labels():
+    return [price_band(lower) for lower in (0,) + PRICE_BANDS]
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def facet_values(product):
+    """Every (facet, value) pair product belongs to; attribute facets are ("attributes", name)"""
+    values = set()
+    for category in product.get('categories', []):
+        if isinstance(category, dict) and category.get('name'):
+            values.add(("categories", str(category['name'])))
+    for attribute in product.get('attributes', []):
+        if isinstance(attribute, dict) and attribute.get('name') and attribute.get('value') not in (None, ''):
+            values.add((("attributes", str(attribute['name'])), str(attribute['value'])))
+    price = _number(product.get('price'))
+    if price is not None:
+        values.add(("price", price_band(price)))
+    rating = _number(product.get('rating'))
+    if rating is not None:
+        values.update(("rating", f"{threshold}+") for threshold in RATING_THRESHOLDS if rating >= threshold)
+    return frozenset(values)
+
+
+def _set_bit(bitmap, position):
+    index = position >> 3
+    if index >= len(bitmap):
+        bitmap.extend(bytes(index - len(bitmap) + 1))
+    bitmap[index] |= 1 << (position & 7)
+
+
+def _clear_bit(bitmap, position):
+    index = position >> 3
+    if index < len(bitmap):
+        bitmap[index] &= ~(1 << (position & 7)) & 0xFF
+
+
+def _bit_positions(bitmap, skip=0, limit=None):
+    """Positions of the set bits of an int bitmap in ascending order, after skipping the first skip"""
+    positions = []
+    for index, byte in enumerate(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")):
+        while byte:
+            low = byte & -byte
+            byte ^= low
+            if skip:
+                skip -= 1
+                continue
+            positions.append((index << 3) + low.bit_length() - 1)
+            if limit is not None and len(positions) >= limit:
+                return positions
+    return positions
+
+
+class FacetIndex:
+    """
+    Bitmap index for faceted filtering.
+
+    Each product gets a slot (a bit position) and every facet value keeps a
+    bitmap of the slots that have it: one per category, per attribute value,
+    per price band and per rating bucket. Bitmaps are updated in place as
+    bytearrays and read as ints, so a query is a few bitwise ANDs and ORs
+    over the whole catalog. Slots of removed products are reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._slots = {}
+        self._keys = []
+        self._products = []
+        self._values = []
+        self._free = []
+        self._live = bytearray()
+        self._bitmaps = {}
+        # int snapshots of the bitmaps, dropped when the bitmap changes
+        self._frozen = {}
+
+    def __len__(self):
+        return len(self._slots)
+
+    def upsert(self, key, product):
+        """Index product under key, replacing the version with the same key"""
+        values = facet_values(product)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None:
+                self._products[slot] = product
+                if self._values[slot] == values:
+                    return
+                self._unset(slot)
+            else:
+                slot = self._free.pop() if self._free else len(self._keys)
+                if slot == len(self._keys):
+                    self._keys.append(None)
+                    self._products.append(None)
+                    self._values.append(frozenset())
+                self._slots[key] = slot
+                self._keys[slot] = key
+                self._products[slot] = product
+                _set_bit(self._live, slot)
+                self._frozen.pop(_LIVE, None)
+            self._values[slot] = values
+            for facet, value in values:
+                bitmap = self._bitmaps.setdefault(facet, {}).get(value)
+                if bitmap is None:
+                    bitmap = self._bitmaps[facet][value] = bytearray()
+                _set_bit(bitmap, slot)
+                self._frozen.pop((facet, value), None)
+
+    def remove(self, key):
+        """Drop the product with this key; returns False if it was not indexed"""
+        with self._lock:
+            slot = self._slots.pop(key, None)
+            if slot is None:
+                return False
+            self._unset(slot)
+            _clear_bit(self._live, slot)
+            self._frozen.pop(_LIVE, None)
+            self._keys[slot] = None
+            self._products[slot] = None
+            self._values[slot] = frozenset()
+            self._free.append(slot)
+            return True
+
+    def _unset(self, slot):
+        for facet, value in self._values[slot]:
+            _clear_bit(self._bitmaps[facet][value], slot)
+            self._frozen.pop((facet, value), None)
+
+    def _bitmap(self, facet, value):
+        """int bitmap of a facet value, or of the live slots for _LIVE"""
+        key = (facet, value)
+        bitmap = self._frozen.get(key)
+        if bitmap is None:
+            source = self._live if key == _LIVE else self._bitmaps.get(facet, {}).get(value)
+            bitmap = self._frozen[key] = int.from_bytes(source, "little") if source else 0
+        return bitmap
+
+    @staticmethod
+    def _selections(filters):
+        """filters as {facet: [values]}, raising ValueError for unknown facets"""
+        selections = {}
+        for facet, values in (filters or {}).items():
+            if facet == "attributes":
+                if not isinstance(values, dict):
+                    raise ValueError("'attributes' filter must map attribute names to values")
+                for name, attribute_values in values.items():
+                    selections[("attributes", str(name))] = attribute_values
+            elif facet in FACETS:
+                selections[facet] = values
+            else:
+                raise ValueError(f"Unknown facet '{facet}'; expected one of {', '.join(FACETS + ('attributes',))}")
+        return {
+            facet: [str(value) for value in (values if isinstance(values, (list, tuple, set)) else [values])]
+            for facet, values in selections.items() if values not in (None, "", [])
+        }
+
+    def query(self, filters=None, offset=0, limit=None):
+        """
+        Products matching filters, plus the number of matches for every facet value.
+
+        filters maps "categories", "price" and "rating" to a value or list of
+        values, and "attributes" to {attribute name: value(s)}. Values of one
+        facet are ORed, facets are ANDed. A facet's counts apply every filter
+        except its own, so picking "Red" still counts the other colors.
+        Returns {"keys", "products", "total", "facets"} with keys and
+        products sliced by offset and limit.
+        """
+        selections = self._selections(filters)
+        with self._lock:
+            live = self._bitmap(*_LIVE)
+            selected = {}
+            for facet, values in selections.items():
+                bitmap = 0
+                for value in values:
+                    bitmap |= self._bitmap(facet, value)
+                selected[facet] = bitmap
+            matched = live
+            for bitmap in selected.values():
+                matched &= bitmap
+
+            facets = {facet: {} for facet in FACETS}
+            facets["attributes"] = {}
+            for facet, bitmaps in self._bitmaps.items():
+                scope = matched
+                if facet in selected:
+                    scope = live
+                    for other, bitmap in selected.items():
+                        if other != facet:
+                            scope &= bitmap
+                counts = {}
+                for value in bitmaps:
+                    count = _popcount(scope & self._bitmap(facet, value))
+                    if count or value in selections.get(facet, ()):
+                        counts[value] = count
+                if facet not in ("price", "rating"):
+                    counts = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+                if isinstance(facet, tuple):
+                    if counts:
+                        facets["attributes"][facet[1]] = counts
+                else:
+                    facets[facet] = counts
+            facets["price"] = {label: facets["price"][label] for label in price_band_labels() if label in facets["price"]}
+            facets["rating"] = {
+                f"{threshold}+": facets["rating"][f"{threshold}+"]
+                for threshold in RATING_THRESHOLDS if f"{threshold}+" in facets["rating"]
+            }
+
+            slots = _bit_positions(matched, offset, limit)
+            return {
+                "keys": [self._keys[slot] for slot in slots],
+                "products": [self._products[slot] for slot in slots],
+                "total": _popcount(matched),
+                "facets": facets
+            }
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "products": len(self._slots),
+                "slots": len(self._keys),
+                "bitmaps": sum(len(bitmaps) for bitmaps in self._bitmaps.values()),
+                "bitmap_bytes": len(self._live) + sum(
+                    len(bitmap) for bitmaps in self._bitmaps.values() for bitmap in bitmaps.values()
+                )
+            }
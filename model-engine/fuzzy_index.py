@@ -0,0 +1,251 @@
+import re
+import threading
+from array import array
+from collections import Counter
+from itertools import chain
+
+GRAM_SIZE = 3
+# Words shorter than this are never corrected; too many near neighbours
+MIN_CORRECTABLE_LENGTH = 4
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+def max_edits(word):
+    """Edits tolerated when correcting word: 1 for short words, 2 from 8 characters"""
+    return 1 if len(word) < 8 else 2
+
+
+def trigrams(word):
+    """Distinct character trigrams of word, padded so the first and last letters count"""
+    padded = f"${word}$"
+    return {padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1)}
+
+
+def _common_prefix(a, b):
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+def _swaps(word):
+    """word with each pair of adjacent letters swapped"""
+    return {word[:i] + word[i + 1] + word[i] + word[i + 2:] for i in range(len(word) - 1)}
+
+
+def _within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion, substitution or adjacent swap"""
+    if len(a) < len(b):
+        a, b = b, a
+    if len(a) - len(b) > 1:
+        return False
+    prefix = _common_prefix(a, b)
+    if prefix == len(b):
+        return True
+    if len(a) > len(b):
+        return a[prefix + 1:] == b[prefix:]
+    return (a[prefix + 1:] == b[prefix + 1:]
+            or (a[prefix + 1:prefix + 2] == b[prefix:prefix + 1] and a[prefix] == b[prefix + 1:prefix + 2]
+                and a[prefix + 2:] == b[prefix + 2:]))
+
+
+def bounded_edit_distance(a, b, max_distance):
+    """
+    Edit distance between a and b counting insertions, deletions,
+    substitutions and adjacent transpositions, or max_distance + 1 as soon as
+    it is certain to exceed max_distance. Only a band of width
+    2 * max_distance + 1 around the diagonal is computed.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+    if max_distance == 1:
+        return 1 if _within_one_edit(a, b) else 2
+    # Matching ends cost nothing; only the differing middle needs the table
+    prefix = _common_prefix(a, b)
+    a, b = a[prefix:], b[prefix:]
+    suffix = _common_prefix(a[::-1], b[::-1])
+    if suffix:
+        a, b = a[:-suffix], b[:-suffix]
+    if not a or not b:
+        return len(a) + len(b)
+    over = max_distance + 1
+    width = len(b)
+    previous2 = None
+    previous = list(range(width + 1))
+    for i in range(1, len(a) + 1):
+        char = a[i - 1]
+        current = [over] * (width + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_best = current[0]
+        for j in range(max(1, i - max_distance), min(width, i + max_distance) + 1):
+            value = previous[j - 1] if char == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if previous2 is not None and j > 1 and char == b[j - 2] and a[i - 2] == b[j - 1] \
+                    and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            if value > over:
+                value = over
+            current[j] = value
+            if value < row_best:
+                row_best = value
+        if row_best > max_distance:
+            return over
+        previous2, previous = previous, current
+    return min(previous[width], over)
+
+
+class TrigramIndex:
+    """
+    Spelling index over a vocabulary of words.
+
+    Each trigram maps to an array of word ids. A lookup counts shared
+    trigrams to find candidates (see _candidates), then verifies them with a
+    bounded edit distance. Words carry a count (e.g. how many products use them) that
+    breaks ties and can drop to zero when products are removed.
+    """
+
+    def __init__(self, words=()):
+        self._lock = threading.Lock()
+        self._words = []
+        self._ids = {}
+        self._counts = array('I')
+        self._gram_counts = array('B')
+        self._grams = {}
+        for word in words:
+            self.add(word)
+
+    def __contains__(self, word):
+        word_id = self._ids.get(word)
+        return word_id is not None and self._counts[word_id] > 0
+
+    def __len__(self):
+        return sum(1 for count in self._counts if count)
+
+    def add(self, word, count=1):
+        with self._lock:
+            word_id = self._ids.get(word)
+            if word_id is None:
+                word_id = self._ids[word] = len(self._words)
+                self._words.append(word)
+                self._counts.append(0)
+                grams = trigrams(word)
+                self._gram_counts.append(min(len(grams), 0xFF))
+                for gram in grams:
+                    postings = self._grams.get(gram)
+                    if postings is None:
+                        postings = self._grams[gram] = array('I')
+                    postings.append(word_id)
+            self._counts[word_id] += count
+
+    def discard(self, word, count=1):
+        """Lower word's count; at zero it stops being suggested (its postings stay)"""
+        with self._lock:
+            word_id = self._ids.get(word)
+            if word_id is not None:
+                self._counts[word_id] = max(0, self._counts[word_id] - count)
+
+    def _count_shared(self, grams):
+        return Counter(chain.from_iterable(self._grams.get(gram, ()) for gram in grams))
+
+    def _candidates(self, word, max_distance):
+        """
+        Superset of the known words within max_distance edits of word.
+
+        An insertion, deletion or substitution destroys at most 3 trigrams of
+        either word, so without swaps a match shares all but 3 per edit of
+        both words' trigrams. A swap destroys 4 and can break every trigram
+        of a short word, so matches that need one are found by undoing it in
+        word: one edit away the swapped spelling must be known as is, two
+        edits away it is at most one edit (4 trigrams) from the match.
+        """
+        grams = trigrams(word)
+        gram_counts = self._gram_counts
+        shared = self._count_shared(grams)
+        slack = (GRAM_SIZE + 1 if max_distance > 2 else GRAM_SIZE) * max_distance
+        needed = max(1, len(grams) - slack)
+        candidates = {
+            word_id for word_id, count in shared.items()
+            if count >= needed and count >= gram_counts[word_id] - slack
+        }
+        if max_distance == 1:
+            candidates.update(self._ids[swapped] for swapped in _swaps(word) if swapped in self._ids)
+        elif max_distance == 2:
+            for swapped in _swaps(word):
+                swapped_grams = trigrams(swapped)
+                swapped_needed = len(swapped_grams) - GRAM_SIZE - 1
+                extra = self._count_shared(swapped_grams - grams)
+                # Words sharing no new trigram passed the filter above unless it was stricter
+                pool = shared if swapped_needed < needed else extra
+                for word_id in pool:
+                    # Upper bound on the trigrams word_id shares with the swapped spelling
+                    count = shared.get(word_id, 0) + extra.get(word_id, 0)
+                    if count >= swapped_needed and count >= gram_counts[word_id] - GRAM_SIZE - 1:
+                        candidates.add(word_id)
+        return candidates
+
+    def lookup(self, word, max_distance=None, limit=5):
+        """Known words within max_distance edits of word as (word, distance, count), closest and most used first"""
+        if max_distance is None:
+            max_distance = max_edits(word)
+        candidates = self._candidates(word, max_distance)
+        matches = []
+        for word_id in candidates:
+            candidate = self._words[word_id]
+            if not self._counts[word_id] or abs(len(candidate) - len(word)) > max_distance:
+                continue
+            distance = bounded_edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((candidate, distance, self._counts[word_id]))
+        # Ties go to the more used word, then to the one sharing the longer prefix (typos are rarely up front)
+        matches.sort(key=lambda match: (match[1], -match[2], -_common_prefix(word, match[0]), match[0]))
+        return matches[:limit]
+
+    def correct(self, word):
+        """Closest known word to an unknown word, or None"""
+        if len(word) < MIN_CORRECTABLE_LENGTH or word in self:
+            return None
+        matches = self.lookup(word, limit=1)
+        return matches[0][0] if matches else None
+
+
+def correct_text(text, indexes, protected=frozenset(), known=None):
+    """
+    Replace misspelled words in text with the closest word known to any of
+    indexes. Words known to an index (or for which known(word) is true),
+    protected words and short words are kept.
+    Returns (corrected text, {original word: correction}).
+    """
+    indexes = [index for index in indexes if index is not None]
+    corrections = {}
+
+    def replace(match):
+        original = match.group(0)
+        word = original.lower()
+        if (len(word) < MIN_CORRECTABLE_LENGTH or word in protected
+                or any(word in index for index in indexes) or (known is not None and known(word))):
+            return original
+        best = None
+        for index in indexes:
+            for candidate, distance, count in index.lookup(word, limit=1):
+                if best is None or (distance, -count) < (best[1], -best[2]):
+                    best = (candidate, distance, count)
+        if best is None:
+            return original
+        corrections[original] = best[0]
+        return best[0]
+
+    corrected = _WORD.sub(replace, text)
+    return corrected, corrections
+
+
+def vocabulary_words(text):
+    """Lowercased words of text that are long enough to anchor corrections"""
+    return [word for word in _WORD.findall(str(text or "").lower()) if len(word) >= GRAM_SIZE]
@@ -0,0 +1,177 @@
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_loads = _default_loads
+
+
+def set_json_decoder(loads):
+    """Plug in a different decoder (bytes/str -> object); pass None to restore the default"""
+    global _loads
+    _loads = loads or _default_loads
+
+
+def loads(data):
+    """Decode JSON with the configured decoder (orjson when installed)"""
+    return _loads(data)
+
+
+def decode_response(response):
+    """Decode a requests/httpx response body with the configured decoder"""
+    return _loads(response.content)
+
+
+_WHITESPACE = b" \t\r\n"
+# Inside containers we only need to stop at brackets and string starts
+_CONTAINER_TOKEN = re.compile(rb'[\[\]{}"]')
+_STRING_TOKEN = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+
+
+class _ChunkReader:
+    """Byte buffer over an iterator of chunks that drops consumed data as it goes"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.buf = b""
+        self.pos = 0
+        self.pin = None
+
+    def fill(self):
+        chunk = next(self._chunks, None)
+        while chunk is not None and not chunk:
+            chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        keep = self.pos if self.pin is None else min(self.pos, self.pin)
+        self.buf = self.buf[keep:] + bytes(chunk)
+        self.pos -= keep
+        if self.pin is not None:
+            self.pin -= keep
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace byte without consuming it ('' at EOF)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos:self.pos + 1]
+            if not self.fill():
+                return b""
+
+    def take(self):
+        c = self.peek()
+        if not c:
+            raise ValueError("Unexpected end of JSON stream")
+        self.pos += 1
+        return c
+
+    def search(self, pattern):
+        """Advance to the next match of pattern, reading more chunks as needed"""
+        while True:
+            match = pattern.search(self.buf, self.pos)
+            if match:
+                self.pos = match.start()
+                return match.group()
+            self.pos = len(self.buf)
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def skip_string(self):
+        # pos is just past the opening quote
+        while True:
+            token = self.search(_STRING_TOKEN)
+            if token == b'"':
+                self.pos += 1
+                return
+            # Backslash escape: skip it and the escaped byte
+            while self.pos + 2 > len(self.buf):
+                if not self.fill():
+                    raise ValueError("Unexpected end of JSON stream")
+            self.pos += 2
+
+    def read_value(self):
+        """Consume one JSON value and return its raw bytes"""
+        c = self.peek()
+        self.pin = self.pos
+        try:
+            if c in (b"{", b"["):
+                self.pos += 1
+                depth = 1
+                while depth:
+                    token = self.search(_CONTAINER_TOKEN)
+                    self.pos += 1
+                    if token == b'"':
+                        self.skip_string()
+                    elif token in (b"{", b"["):
+                        depth += 1
+                    else:
+                        depth -= 1
+            elif c == b'"':
+                self.pos += 1
+                self.skip_string()
+            else:
+                while True:
+                    match = _SCALAR_END.search(self.buf, self.pos)
+                    if match:
+                        self.pos = match.start()
+                        break
+                    self.pos = len(self.buf)
+                    if not self.fill():
+                        break
+            return self.buf[self.pin:self.pos]
+        finally:
+            self.pin = None
+
+
+def iter_json_array(chunks, key="products", meta=None):
+    """
+    Incrementally parse a JSON object from an iterable of byte chunks and
+    yield the elements of its top-level `key` array one at a time.
+
+    Only one element is decoded at a time, so a large listing never needs the
+    whole body or the whole decoded tree in memory. Other top-level fields
+    (total, page, totalPages, ...) are decoded into `meta` if a dict is given.
+    """
+    reader = _ChunkReader(chunks)
+    if reader.take() != b"{":
+        raise ValueError("Expected a JSON object")
+    while True:
+        c = reader.take()
+        if c == b"}":
+            return
+        if c == b",":
+            continue
+        if c != b'"':
+            raise ValueError(f"Unexpected byte {c!r} in JSON object")
+        reader.pos -= 1
+        name = _loads(reader.read_value())
+        if reader.take() != b":":
+            raise ValueError("Expected ':' after object key")
+        if name == key and reader.peek() == b"[":
+            reader.take()
+            while True:
+                c = reader.peek()
+                if c == b"]":
+                    reader.take()
+                    break
+                if c == b",":
+                    reader.take()
+                    continue
+                yield _loads(reader.read_value())
+        else:
+            value = reader.read_value()
+            if meta is not None:
+                meta[name] = _loads(value)
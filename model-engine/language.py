@@ -1,11 +1,20 @@
-import speech_recognition as sr
 import os
 from typing import Optional
-from gtts import gTTS
-from googletrans import Translator
 import uuid
 import asyncio
 import functools
+from startup_report import import_timer
+
+# speech_recognition, gtts and googletrans are heavy; each is imported on first use
+
+def warm_up():
+    """Import the speech, TTS and translation libraries ahead of the first request"""
+    with import_timer("speech_recognition"):
+        import speech_recognition
+    with import_timer("gtts"):
+        import gtts
+    with import_timer("googletrans"):
+        import googletrans
 
 def run_async(func):
     """Decorator to run async functions in sync context"""
@@ -47,6 +56,7 @@ def audio_to_text(audio_file_path: str, language: str = "en-US") -> Optional[str
         raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
     
     # Initialize recognizer
+    import speech_recognition as sr
     recognizer = sr.Recognizer()
     
     try:
@@ -96,6 +106,7 @@ def text_to_audio(text: str, language: str = "en-US", audio_dir: str = "audio")
     lang_code = language.split('-')[0] if '-' in language else language
     
     # Generate and save the audio file
+    from gtts import gTTS
     tts = gTTS(text=text, lang=lang_code)
     tts.save(output_path)
 
@@ -107,6 +118,7 @@ def _sync_translate(text: str, target_language: str = "en", source_language: str
     """
     try:
         # Initialize translator
+        from googletrans import Translator
         translator = Translator()
         
         # Translate text
@@ -163,6 +175,7 @@ def _sync_detect_language(text: str) -> str:
     """
     try:
         # Initialize translator
+        from googletrans import Translator
         translator = Translator()
         
         # Detect language
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "llm_cache.sqlite3")
+)
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_ENTRIES = 10000
+# Catalog chunk summaries live in their own store so they never evict product JSON
+SUMMARY_CACHE_PATH = os.getenv(
+    "SUMMARY_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "summary_cache.sqlite3")
+)
+SUMMARY_MEMORY_ENTRIES = 64
+SUMMARY_DISK_ENTRIES = 2000
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def normalize_text(text):
+    """Case- and whitespace-insensitive form of free text used in cache keys"""
+    return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+
+def make_key(*parts):
+    """Stable sha256 key over arbitrary JSON-serialisable parts"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResultCache:
+    """
+    Two-tier cache for LLM results: an in-memory LRU in front of a SQLite
+    store on disk. Values are JSON-serialisable and returned as fresh copies.
+    Entries expire after ttl seconds; the disk tier is trimmed to
+    disk_entries by least-recent access.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 disk_entries=DEFAULT_DISK_ENTRIES, ttl=DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0, "disk_errors": 0}
+
+    def _connect(self):
+        # Opened lazily; a cache that can't reach its disk tier still works from memory
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        return self._db
+
+    def _remember(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and now - cached[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return json.loads(cached[0])
+            self._memory.pop(key, None)
+            try:
+                db = self._connect()
+                row = db.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row and now - row[1] < self.ttl:
+                    db.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.stats["disk_hits"] += 1
+                    return json.loads(row[0])
+                if row:
+                    db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    db.commit()
+            except (sqlite3.Error, OSError) as e:
+                self.stats["disk_errors"] += 1
+                print(f"⚠️  LLM cache disk read failed: {e}")
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key, value):
+        """Store a JSON-serialisable value under key in both tiers"""
+        now = time.time()
+        serialized = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, serialized, now)
+            self.stats["writes"] += 1
+            try:
+                db = self._connect()
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, serialized, now, now)
+                )
+                count = db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                if count > self.disk_entries:
+                    evicted = db.execute(
+                        "DELETE FROM llm_cache WHERE key IN "
+                        "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                        (count - self.disk_entries,)
+                    ).rowcount
+                    self.stats["evictions"] += evicted
+                db.commit()
+            except (sqlite3.Error, OSError) as e:
+                self.stats["disk_errors"] += 1
+                print(f"⚠️  LLM cache disk write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            try:
+                self._connect().execute("DELETE FROM llm_cache")
+                self._db.commit()
+            except (sqlite3.Error, OSError) as e:
+                self.stats["disk_errors"] += 1
+                print(f"⚠️  LLM cache clear failed: {e}")
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+product_json_cache = LLMResultCache()
+summary_cache = LLMResultCache(SUMMARY_CACHE_PATH, memory_entries=SUMMARY_MEMORY_ENTRIES,
+                               disk_entries=SUMMARY_DISK_ENTRIES)
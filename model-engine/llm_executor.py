@@ -0,0 +1,246 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from llm_metrics import LLMMetrics
+from prompt_encoder import estimate_tokens
+from rate_limiter import TokenBucket
+from startup_report import import_timer
+
+DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "15"))
+DEFAULT_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+DEFAULT_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", "4"))
+# Seconds a call may wait for limiter capacity before it is rejected locally
+DEFAULT_MAX_WAIT = float(os.getenv("LLM_MAX_WAIT", "0"))
+# Response tokens reserved per call when the caller gives no better estimate
+DEFAULT_EXPECTED_OUTPUT_TOKENS = 1024
+# Metrics label for calls that do not name their call site
+DEFAULT_CALL_SITE = "unknown"
+
+
+class LLMError(Exception):
+    """Base class for classified LLM call failures"""
+
+
+class LLMQuotaExceeded(LLMError):
+    """Upstream quota or rate limit hit (HTTP 429 / ResourceExhausted)"""
+
+
+class LLMRateLimited(LLMQuotaExceeded):
+    """Rejected locally because the request or token bucket is empty"""
+
+
+class LLMAuthError(LLMError):
+    """Missing, invalid or unauthorized API key"""
+
+
+class LLMNetworkError(LLMError):
+    """Connection failure, timeout or upstream unavailability"""
+
+
+class LLMEmptyResponse(LLMError):
+    """The model returned no text (e.g. blocked by safety filters)"""
+
+
+# google.api_core pulls in grpc, so it is imported by the first classify_error call
+_google_exceptions = None
+_google_exceptions_loaded = False
+
+
+def _load_google_exceptions():
+    """google.api_core.exceptions, or None when the SDK is not installed"""
+    global _google_exceptions, _google_exceptions_loaded
+    if not _google_exceptions_loaded:
+        with import_timer("google.api_core.exceptions"):
+            try:
+                from google.api_core import exceptions as google_exceptions
+            except ImportError:
+                google_exceptions = None
+        _google_exceptions = google_exceptions
+        _google_exceptions_loaded = True
+    return _google_exceptions
+
+
+def classify_error(error):
+    """Map an exception from the Gemini client to an LLMError subclass instance"""
+    if isinstance(error, LLMError):
+        return error
+    google_exceptions = _load_google_exceptions()
+    if google_exceptions is not None:
+        if isinstance(error, (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)):
+            return LLMQuotaExceeded(str(error))
+        if isinstance(error, (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied)):
+            return LLMAuthError(str(error))
+        if isinstance(error, (google_exceptions.ServiceUnavailable, google_exceptions.DeadlineExceeded,
+                              google_exceptions.InternalServerError)):
+            return LLMNetworkError(str(error))
+        # An invalid key is reported as a 400 rather than a 401
+        if isinstance(error, google_exceptions.InvalidArgument) and "api key" in str(error).lower():
+            return LLMAuthError(str(error))
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return LLMNetworkError(str(error))
+    return LLMError(f"{type(error).__name__}: {error}")
+
+
+class LLMExecutor:
+    """
+    Shared gateway for model.generate_content calls.
+
+    Every call takes one request and its estimated tokens from per-minute
+    token buckets before it is sent. When either bucket is empty the call is
+    rejected with LLMRateLimited straight away (or after max_wait seconds),
+    so callers fall back before the upstream starts answering 429. Calls run
+    on a bounded worker pool; failures surface as typed LLMError subclasses.
+    Every call is timed and recorded in metrics under its call_site.
+    """
+
+    def __init__(self, model=None, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, max_workers=DEFAULT_MAX_WORKERS,
+                 max_wait=DEFAULT_MAX_WAIT, model_factory=None, metrics=None):
+        self._model = model
+        self._model_factory = model_factory
+        self.max_wait = max_wait
+        self._requests = TokenBucket(requests_per_minute / 60.0, capacity=requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute / 60.0, capacity=tokens_per_minute)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self.metrics = metrics or LLMMetrics()
+        self.stats = {"submitted": 0, "succeeded": 0, "failed": 0, "rate_limited": 0, "errors": {},
+                      "prompt_tokens": 0, "response_tokens": 0}
+
+    @property
+    def model(self):
+        # Built by model_factory on first call, so importing callers stays cheap
+        if self._model is None and self._model_factory is not None:
+            self._model = self._model_factory()
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+
+    def _count(self, name, error=None):
+        with self._lock:
+            self.stats[name] += 1
+            if error is not None:
+                kind = type(error).__name__
+                self.stats["errors"][kind] = self.stats["errors"].get(kind, 0) + 1
+
+    def _reserve(self, tokens, max_wait):
+        if not self._requests.acquire(1, timeout=max_wait):
+            return False
+        if not self._tokens.acquire(tokens, timeout=max_wait):
+            self._requests.refund(1)
+            return False
+        return True
+
+    def _failed(self, e):
+        error = classify_error(e)
+        self._count("failed", error)
+        if isinstance(error, LLMQuotaExceeded):
+            # Upstream is already refusing; empty the request bucket so callers fall back locally
+            self._requests.try_acquire(int(self._requests.available()))
+        return error
+
+    def _admit(self, prompt, expected_output_tokens, max_wait=None, call_site=DEFAULT_CALL_SITE):
+        if max_wait is None:
+            max_wait = self.max_wait
+        if not self._reserve(estimate_tokens(prompt) + expected_output_tokens, max_wait):
+            error = LLMRateLimited("LLM request or token budget exhausted for this minute")
+            self._count("rate_limited", error)
+            self.metrics.record_rejected(call_site, error)
+            raise error
+        self._count("submitted")
+
+    def _record_usage(self, call_site, prompt, usage, response_text, elapsed, first_chunk=None):
+        # Prefer the API's own counts; fall back to the estimate when they are missing
+        prompt_tokens = getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt)
+        response_tokens = getattr(usage, "candidates_token_count", None) or estimate_tokens(response_text)
+        with self._lock:
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["response_tokens"] += response_tokens
+        self.metrics.record_call(call_site, elapsed, prompt, prompt_tokens, response_tokens, len(response_text),
+                                 first_chunk=first_chunk)
+        print(f"🧮 LLM call [{call_site}]: {prompt_tokens} prompt + {response_tokens} response tokens in {elapsed:.2f}s")
+
+    def _record_failure(self, call_site, prompt, elapsed, error):
+        self.metrics.record_call(call_site, elapsed, prompt, estimate_tokens(prompt), error=error)
+
+    def _call(self, prompt, kwargs, call_site=DEFAULT_CALL_SITE):
+        started_at = time.monotonic()
+        try:
+            response = self.model.generate_content(prompt, **kwargs)
+        except Exception as e:
+            self._record_failure(call_site, prompt, time.monotonic() - started_at, e)
+            raise self._failed(e) from e
+        try:
+            text = response.text if response else None
+        except ValueError:
+            # .text raises when the candidate was blocked and has no parts
+            text = None
+        if not text:
+            error = LLMEmptyResponse("Model returned an empty response")
+            self._count("failed", error)
+            self._record_failure(call_site, prompt, time.monotonic() - started_at, error)
+            raise error
+        self._count("succeeded")
+        self._record_usage(call_site, prompt, getattr(response, "usage_metadata", None), text,
+                           time.monotonic() - started_at)
+        return text.strip()
+
+    def submit(self, prompt, expected_output_tokens=DEFAULT_EXPECTED_OUTPUT_TOKENS, max_wait=None,
+               call_site=DEFAULT_CALL_SITE, **kwargs):
+        """
+        Queue a generate_content call and return a Future for the response text.
+        Raises LLMRateLimited if the limiter has no capacity within max_wait
+        seconds (defaults to the executor's max_wait; background jobs can wait longer).
+        call_site labels the call in metrics.
+        """
+        self._admit(prompt, expected_output_tokens, max_wait, call_site)
+        return self._pool.submit(self._call, prompt, kwargs, call_site)
+
+    def generate(self, prompt, expected_output_tokens=DEFAULT_EXPECTED_OUTPUT_TOKENS, call_site=DEFAULT_CALL_SITE,
+                 max_wait=None, **kwargs):
+        """Blocking generate_content through the limiter; returns the stripped response text"""
+        return self.submit(prompt, expected_output_tokens, max_wait, call_site=call_site, **kwargs).result()
+
+    def stream(self, prompt, expected_output_tokens=DEFAULT_EXPECTED_OUTPUT_TOKENS, call_site=DEFAULT_CALL_SITE,
+               **kwargs):
+        """
+        Streamed generate_content through the limiter: yields response text
+        chunks as they arrive. Runs on the consuming thread, not the pool.
+        """
+        self._admit(prompt, expected_output_tokens, call_site=call_site)
+        started_at = time.monotonic()
+        first_chunk = None
+        received = []
+        usage = None
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True, **kwargs):
+                # The final chunk carries the usage totals for the whole response
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                try:
+                    text = chunk.text
+                except ValueError:
+                    continue
+                if text:
+                    if first_chunk is None:
+                        first_chunk = time.monotonic() - started_at
+                    received.append(text)
+                    yield text
+        except Exception as e:
+            self._record_failure(call_site, prompt, time.monotonic() - started_at, e)
+            raise self._failed(e) from e
+        self._count("succeeded")
+        self._record_usage(call_site, prompt, usage, "".join(received), time.monotonic() - started_at, first_chunk)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats, errors=dict(self.stats["errors"]))
+        stats["requests_available"] = int(self._requests.available())
+        stats["tokens_available"] = int(self._tokens.available())
+        return stats
+
+    def get_metrics(self):
+        """Per-call-site latency and token histograms, fallbacks, cache hits and the slowest calls"""
+        return self.metrics.snapshot()
@@ -0,0 +1,109 @@
+import json
+
+_CLOSERS = {"{": "}", "[": "]"}
+# Python-style literals models sometimes emit instead of JSON ones
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_COMPLETE_LITERALS = frozenset(_LITERALS.values())
+# Openers tried before giving up, in case prose before the JSON contains a bracket
+_MAX_STARTS = 3
+
+
+def _scan(text, start):
+    """
+    Scan from the opener at start to the end of its outermost value, repairing
+    as it goes: trailing commas are dropped, raw newlines inside strings are
+    escaped, Python literals become JSON ones and mismatched closers are
+    corrected. If the text ends first (a truncated response), it is cut back to
+    the last member of the outermost container that was fully closed; a value
+    that was still being written is never completed. A last member that ends
+    exactly at the cut is kept only if it provably ended: a closed string or a
+    whole literal, not a number that may have been cut short.
+    """
+    out = []
+    stack = []
+    safe = None
+    in_string = escape = pending_comma = False
+    i, n = start, len(text)
+    while i < n:
+        c = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+            elif c == "\n":
+                c = "\\n"
+            out.append(c)
+            i += 1
+            continue
+        if c in " \t\r\n":
+            i += 1
+            continue
+        if pending_comma:
+            pending_comma = False
+            if c not in "}]":
+                out.append(",")
+        if c == '"':
+            in_string = True
+            out.append(c)
+        elif c in _CLOSERS:
+            stack.append(_CLOSERS[c])
+            out.append(c)
+        elif c in "}]":
+            out.append(stack.pop())
+            if not stack:
+                return json.loads("".join(out))
+            if len(stack) == 1:
+                safe = len(out)
+        elif c == ",":
+            # A comma in the outermost container ends a complete member; remember it as a cut point
+            pending_comma = True
+            if len(stack) == 1:
+                safe = len(out)
+        elif c.isalpha():
+            j = i
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            out.append(_LITERALS.get(word, word))
+            i = j
+            continue
+        else:
+            out.append(c)
+        i += 1
+
+    # Truncated right after a closed string or literal: that last member is complete as well
+    if not in_string and len(stack) == 1 and out and (out[-1] == '"' or out[-1] in _COMPLETE_LITERALS):
+        try:
+            return json.loads("".join(out) + stack[0])
+        except ValueError:
+            # e.g. a key without its value
+            pass
+    # Otherwise keep only the members that were complete before the cut
+    if safe is None:
+        raise ValueError("Truncated JSON with no complete member")
+    return json.loads("".join(out[:safe]) + stack[0])
+
+
+def extract_json(text, opener="{"):
+    """
+    Extract the outermost JSON object (opener="{") or array (opener="[") from
+    an LLM response, ignoring markdown fences and surrounding prose.
+
+    Raises ValueError if no value can be recovered.
+    """
+    if not text:
+        raise ValueError("Empty response")
+    start = text.find(opener)
+    error = ValueError(f"No JSON {'object' if opener == '{' else 'array'} found in response")
+    for _ in range(_MAX_STARTS):
+        if start == -1:
+            break
+        try:
+            return _scan(text, start)
+        except ValueError as e:
+            error = e
+        start = text.find(opener, start + 1)
+    raise error
@@ -0,0 +1,185 @@
+import heapq
+import threading
+from bisect import bisect_left
+
+# Bucket upper bounds; values above the last bound land in an overflow bucket
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+# Slowest / most expensive calls kept for inspection
+DEFAULT_TOP_CALLS = 10
+PROMPT_PREVIEW_CHARS = 160
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min, max and bucket-estimated percentiles"""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations (max for the overflow bucket)"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        buckets = {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 1),
+            "mean": round(self.total / self.count, 1) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": buckets
+        }
+
+
+def _new_site():
+    return {
+        "calls": 0, "succeeded": 0, "failed": 0, "rejected": 0, "fallbacks": 0, "cache_hits": 0,
+        "prompt_chars": 0, "response_chars": 0,
+        "errors": {}, "fallback_reasons": {},
+        "latency_ms": Histogram(LATENCY_BUCKETS_MS),
+        "first_chunk_ms": Histogram(LATENCY_BUCKETS_MS),
+        "prompt_tokens": Histogram(TOKEN_BUCKETS),
+        "response_tokens": Histogram(TOKEN_BUCKETS)
+    }
+
+
+class LLMMetrics:
+    """
+    In-process metrics for LLM calls, grouped by call site.
+
+    Each call records wall time, prompt and response size, success and the
+    exception class on failure. Callers also report fallbacks (e.g. to the
+    mock generator) and cache hits, so the share of requests that actually
+    reach Gemini is visible. The slowest and most token-hungry calls are
+    kept with a prompt preview.
+    """
+
+    def __init__(self, top_calls=DEFAULT_TOP_CALLS):
+        self.top_calls = top_calls
+        self._lock = threading.Lock()
+        self._sites = {}
+        self._slowest = []
+        self._largest = []
+        self._sequence = 0
+
+    def _site(self, call_site):
+        site = self._sites.get(call_site)
+        if site is None:
+            site = self._sites[call_site] = _new_site()
+        return site
+
+    def _keep_top(self, heap, score, call):
+        # Min-heaps of the top_calls highest scores; the sequence breaks ties
+        self._sequence += 1
+        item = (score, self._sequence, call)
+        if len(heap) < self.top_calls:
+            heapq.heappush(heap, item)
+        elif score > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    def record_call(self, call_site, elapsed, prompt, prompt_tokens, response_tokens=0, response_chars=0,
+                    error=None, first_chunk=None):
+        """Record one call that reached the model; error is the exception it raised, if any"""
+        latency_ms = round(elapsed * 1000, 1)
+        with self._lock:
+            site = self._site(call_site)
+            site["calls"] += 1
+            site["prompt_chars"] += len(prompt)
+            site["response_chars"] += response_chars
+            site["latency_ms"].observe(latency_ms)
+            site["prompt_tokens"].observe(prompt_tokens)
+            if first_chunk is not None:
+                site["first_chunk_ms"].observe(round(first_chunk * 1000, 1))
+            if error is None:
+                site["succeeded"] += 1
+                site["response_tokens"].observe(response_tokens)
+            else:
+                site["failed"] += 1
+                kind = type(error).__name__
+                site["errors"][kind] = site["errors"].get(kind, 0) + 1
+            call = {
+                "call_site": call_site,
+                "latency_ms": latency_ms,
+                "prompt_tokens": prompt_tokens,
+                "response_tokens": response_tokens,
+                "success": error is None,
+                "error": type(error).__name__ if error is not None else None,
+                "prompt_preview": " ".join(prompt.split())[:PROMPT_PREVIEW_CHARS]
+            }
+            self._keep_top(self._slowest, latency_ms, call)
+            self._keep_top(self._largest, prompt_tokens + response_tokens, call)
+
+    def record_rejected(self, call_site, error):
+        """Record a call turned away by the local rate limiter before reaching the model"""
+        with self._lock:
+            site = self._site(call_site)
+            site["rejected"] += 1
+            kind = type(error).__name__
+            site["errors"][kind] = site["errors"].get(kind, 0) + 1
+
+    def record_fallback(self, call_site, reason, count=1):
+        """Record answers served by a non-LLM fallback (mock generator, basic summary)"""
+        with self._lock:
+            site = self._site(call_site)
+            site["fallbacks"] += count
+            site["fallback_reasons"][reason] = site["fallback_reasons"].get(reason, 0) + count
+
+    def record_cache_hit(self, call_site, count=1):
+        """Record answers served from a cache instead of a model call"""
+        with self._lock:
+            self._site(call_site)["cache_hits"] += count
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+            self._slowest = []
+            self._largest = []
+
+    def snapshot(self):
+        with self._lock:
+            sites = {}
+            for name, site in self._sites.items():
+                sites[name] = {
+                    key: value.snapshot() if isinstance(value, Histogram) else
+                    dict(value) if isinstance(value, dict) else value
+                    for key, value in site.items()
+                }
+            slowest = [call for _, _, call in sorted(self._slowest, reverse=True)]
+            largest = [call for _, _, call in sorted(self._largest, reverse=True)]
+        totals = {
+            key: sum(site[key] for site in sites.values())
+            for key in ("calls", "succeeded", "failed", "rejected", "fallbacks", "cache_hits")
+        }
+        totals["llm_time_ms"] = round(sum(site["latency_ms"]["sum"] for site in sites.values()), 1)
+        return {
+            "totals": totals,
+            "call_sites": sites,
+            "slowest_calls": slowest,
+            "most_expensive_calls": largest
+        }
@@ -0,0 +1,136 @@
+import threading
+import time
+
+# Metadata is served fresh for DEFAULT_METADATA_TTL seconds, then served stale
+# for up to DEFAULT_STALE_TTL more seconds while a background thread refreshes it.
+DEFAULT_METADATA_TTL = 300
+DEFAULT_STALE_TTL = 3600
+
+# Returned by a loader when the backend answered 304 Not Modified
+NOT_MODIFIED = object()
+
+
+class MetadataCache:
+    """
+    TTL cache for rarely-changing backend metadata (categories, attributes).
+
+    get(key, loader) calls loader(entry) to (re)load a value. entry is the
+    current cache entry or None; loaders use its "etag"/"last_modified" to send
+    a conditional GET and return NOT_MODIFIED on 304, a new entry dict
+    {"data", "etag", "last_modified"} on success, or None on failure.
+    """
+
+    def __init__(self, ttl=DEFAULT_METADATA_TTL, stale_ttl=DEFAULT_STALE_TTL):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._key_locks = {}
+        self._refreshing = set()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "not_modified": 0, "refresh_errors": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _key_lock(self, key):
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def get(self, key, loader):
+        """Return cached data for key, loading or revalidating it as needed"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age < self.ttl:
+                self._count("hits")
+                return entry["data"]
+            if age < self.ttl + self.stale_ttl:
+                self._count("stale_hits")
+                self._refresh_in_background(key, loader)
+                return entry["data"]
+
+        with self._key_lock(key):
+            # Another caller may have loaded it while we waited
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+                self._count("hits")
+                return entry["data"]
+            self._count("misses")
+            return self._load(key, loader, entry)
+
+    def peek(self, key):
+        """Return (entry, state) for key without loading; state is 'fresh', 'stale' or 'missing'"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, "missing"
+        age = time.time() - entry["fetched_at"]
+        if age < self.ttl:
+            self._count("hits")
+            return entry, "fresh"
+        if age < self.ttl + self.stale_ttl:
+            self._count("stale_hits")
+            return entry, "stale"
+        return entry, "missing"
+
+    def _load(self, key, loader, entry):
+        return self.store(key, loader(entry), entry)
+
+    def store(self, key, result, entry):
+        """Store a loader result (see class docstring) for key and return the data to serve"""
+        if result is NOT_MODIFIED and entry is not None:
+            self._count("not_modified")
+            new_entry = dict(entry, fetched_at=time.time())
+        elif result is None or result is NOT_MODIFIED:
+            self._count("refresh_errors")
+            # Keep serving whatever we had rather than failing the caller
+            return entry["data"] if entry is not None else None
+        else:
+            new_entry = {
+                "data": result["data"],
+                "etag": result.get("etag"),
+                "last_modified": result.get("last_modified"),
+                "fetched_at": time.time()
+            }
+        with self._lock:
+            self._entries[key] = new_entry
+        return new_entry["data"]
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                with self._key_lock(key):
+                    self._load(key, loader, self._entries.get(key))
+            except Exception as e:
+                self._count("refresh_errors")
+                print(f"⚠️  Background metadata refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"metadata-refresh-{key}", daemon=True).start()
+
+    def invalidate(self, key=None):
+        """Drop one cached key, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["cached_keys"] = len(self._entries)
+        return stats
+
+
+metadata_cache = MetadataCache()
@@ -0,0 +1,82 @@
+from typing import List, Union
+from pydantic import BaseModel, Field, ValidationError, ValidationInfo, field_validator
+
+Number = Union[int, float]
+
+
+class ProductImage(BaseModel):
+    url: str = Field(min_length=1)
+
+
+class Variant(BaseModel):
+    name: str = Field(min_length=1)
+    sku: str = Field(min_length=1)
+    price: Number = Field(ge=0)
+    stock: int = Field(ge=0)
+    thumbnail: str = ""
+    images: List[ProductImage] = []
+
+
+class ProductAttribute(BaseModel):
+    name: str = Field(min_length=1)
+    value: Union[str, int, float]
+
+
+class Product(BaseModel):
+    """Product payload accepted by /api/seller-product"""
+
+    name: str = Field(min_length=1)
+    description: str = Field(min_length=1)
+    stock: int = Field(ge=0)
+    price: Number = Field(ge=0)
+    discount: Number = Field(0, ge=0, le=100)
+    sku: str = Field(min_length=1)
+    thumbnail: str = ""
+    images: List[ProductImage] = []
+    variants: List[Variant] = []
+    categoryIds: List[str] = Field(min_length=1)
+    attributes: List[ProductAttribute] = []
+
+    @field_validator("categoryIds")
+    @classmethod
+    def known_categories(cls, value, info: ValidationInfo):
+        # Pass context={"category_ids": {...}} to reject IDs that don't exist
+        valid = (info.context or {}).get("category_ids")
+        if valid:
+            unknown = [category_id for category_id in value if category_id not in valid]
+            if unknown:
+                raise ValueError(f"Unknown category IDs: {unknown}")
+        return value
+
+
+PRODUCT_FIELDS = list(Product.model_fields)
+
+
+def category_id_set(categories):
+    """IDs of the categories returned by /api/categories"""
+    return {
+        category.get('id', category.get('_id'))
+        for category in categories or []
+        if isinstance(category, dict) and category.get('id', category.get('_id'))
+    }
+
+
+def validate_product(data, category_ids=None):
+    """
+    Validate generated product JSON.
+
+    Returns:
+        tuple: (clean product dict, {}) when valid, or (None, {field: error})
+        naming each invalid top-level field
+    """
+    if not isinstance(data, dict):
+        return None, {"__root__": "Expected a JSON object"}
+    try:
+        product = Product.model_validate(data, context={"category_ids": category_ids})
+    except ValidationError as e:
+        errors = {}
+        for error in e.errors():
+            field = str(error["loc"][0]) if error["loc"] else "__root__"
+            errors.setdefault(field, error["msg"])
+        return None, errors
+    return product.model_dump(), {}
@@ -0,0 +1,85 @@
+import os
+from collections import Counter
+
+# Tokens the product table of a single catalog prompt may use
+DEFAULT_PROMPT_TOKEN_BUDGET = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "6000"))
+
+BASE_COLUMNS = ["#", "name", "price", "stock", "categories", "variants", "images"]
+
+
+def estimate_tokens(text):
+    """Rough Gemini token count (about 4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def _cell(value):
+    # The table is pipe separated, one row per line
+    return str(value).replace("|", "/").replace("\n", " ").strip()
+
+
+def product_row(index, product, attribute_columns):
+    """One table row for a product: base columns followed by its attribute values"""
+    attributes = {attr.get('name'): attr.get('value') for attr in product.get('attributes', [])}
+    cells = [
+        index,
+        product.get('name', 'Unknown'),
+        product.get('price', 0),
+        product.get('stock', 0),
+        ";".join(cat.get('name', 'Unknown') for cat in product.get('categories', [])),
+        len(product.get('variants', [])),
+        len(product.get('images', []))
+    ]
+    cells.extend(attributes.get(name, "") for name in attribute_columns)
+    return "|".join(_cell(cell) for cell in cells)
+
+
+def _evenly_spaced(count, keep):
+    """keep indexes spread evenly over range(count), always including the first"""
+    if keep >= count:
+        return list(range(count))
+    step = count / keep
+    return [int(i * step) for i in range(keep)]
+
+
+def encode_products_table(products, token_budget=DEFAULT_PROMPT_TOKEN_BUDGET, strategy="sample"):
+    """
+    Encode products as a compact pipe-separated table with one shared header.
+
+    Attribute names become columns (most common first) instead of being
+    repeated per product. If all rows do not fit in token_budget, rows are
+    either sampled evenly across the list (strategy="sample") or cut off after
+    the first ones that fit (strategy="truncate").
+
+    Returns:
+        tuple: (table text, number of products included)
+    """
+    attribute_counts = Counter(
+        attr.get('name') for product in products for attr in product.get('attributes', []) if attr.get('name')
+    )
+    attribute_columns = [name for name, _ in attribute_counts.most_common()]
+    header = "|".join(_cell(column) for column in BASE_COLUMNS + attribute_columns)
+    rows = [product_row(i, product, attribute_columns) for i, product in enumerate(products, 1)]
+
+    budget = token_budget - estimate_tokens(header) - 16
+    row_tokens = [estimate_tokens(row) + 1 for row in rows]
+    if sum(row_tokens) > budget:
+        if strategy == "truncate":
+            keep, used = 0, 0
+            while keep < len(rows) and used + row_tokens[keep] <= budget:
+                used += row_tokens[keep]
+                keep += 1
+            selected = list(range(keep))
+        else:
+            # Shrink the sample until it fits, starting from the average row size
+            keep = max(0, min(len(rows), int(budget / (sum(row_tokens) / len(rows)))))
+            selected = _evenly_spaced(len(rows), keep) if keep else []
+            while selected and sum(row_tokens[i] for i in selected) > budget:
+                keep -= 1
+                selected = _evenly_spaced(len(rows), keep) if keep else []
+        rows = [rows[i] for i in selected]
+
+    lines = [header] + rows
+    if len(rows) < len(products):
+        how = "sampled evenly" if strategy != "truncate" else "first rows only"
+        lines.append(f"({len(rows)} of {len(products)} products shown, {how})")
+    return "\n".join(lines), len(rows)
@@ -0,0 +1,62 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens are added per second up to
+    `capacity`. acquire() blocks until enough tokens are available;
+    try_acquire() never blocks.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if not float(rate) > 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate!r}")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, amount=1):
+        """Take `amount` tokens if available right now; returns True on success"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return True
+            return False
+
+    def acquire(self, amount=1, timeout=None):
+        """Block until `amount` tokens are taken; returns False if timeout expires first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait = (amount - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def refund(self, amount=1):
+        """Return tokens taken for work that never happened"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
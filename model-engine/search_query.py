@@ -0,0 +1,178 @@
+import re
+import threading
+from dictionary_matcher import DictionaryMatcher
+from fuzzy_index import TrigramIndex, correct_text, vocabulary_words
+
+# One pattern per search parameter; each starts with its trigger keyword(s)
+NAME_PATTERN = re.compile(r'(find|search|show|get|list)\s+(.*?)(?:\s+(?:with|in|under|above|category|price|rating|sort)|\s*$)', re.IGNORECASE)
+PRICE_PATTERN = re.compile(r'(?:price|cost)\s*(?:between|from)?\s*₹?(\d+)(?:\s*(?:to|-)\s*₹?(\d+))?', re.IGNORECASE)
+MIN_PRICE_PATTERN = re.compile(r'(?:above|over|more\s+than|minimum)\s*₹?(\d+)', re.IGNORECASE)
+MAX_PRICE_PATTERN = re.compile(r'(?:under|below|less\s+than|maximum)\s*₹?(\d+)', re.IGNORECASE)
+RATING_PATTERN = re.compile(r'rating\s*(?:above|over|more\s+than)?\s*(\d+)', re.IGNORECASE)
+PAGE_PATTERN = re.compile(r'page\s*(\d+)', re.IGNORECASE)
+LIMIT_PATTERN = re.compile(r'(?:limit|show|display)\s*(\d+)', re.IGNORECASE)
+SORT_PATTERN = re.compile(r'sort\s+by\s+(\w+)(?:\s+(asc|desc|ascending|descending))?', re.IGNORECASE)
+
+FIELD_PATTERNS = (
+    ("name", NAME_PATTERN),
+    ("price", PRICE_PATTERN),
+    ("min_price", MIN_PRICE_PATTERN),
+    ("max_price", MAX_PRICE_PATTERN),
+    ("rating", RATING_PATTERN),
+    ("page", PAGE_PATTERN),
+    ("limit", LIMIT_PATTERN),
+    ("sort", SORT_PATTERN)
+)
+# Every position where any field pattern could start; the lookahead lets keywords overlap
+TRIGGER_PATTERN = re.compile(
+    r'(?=find|search|show|get|list|price|cost|above|over|more|minimum|under|below|less|maximum'
+    r'|rating|page|limit|display|sort)',
+    re.IGNORECASE
+)
+
+MAX_CACHED_VOCABULARIES = 8
+# Query words that must never be "corrected" into a category or attribute value
+PROTECTED_WORDS = frozenset("""
+find search show get list with under above category price rating sort cost between from over more than
+minimum below less maximum page limit display ascending descending name newest oldest
+for and the all some want need looking item items product products cheap best please
+""".split())
+
+
+def first_matches(user_input):
+    """
+    First (leftmost) match of each field pattern, found in one scan.
+
+    Each pattern can only match where one of its keywords starts, so only
+    those positions are tried, in order; the result is the same as calling
+    re.search with every pattern separately.
+    """
+    found = {}
+    for trigger in TRIGGER_PATTERN.finditer(user_input):
+        position = trigger.start()
+        for field, pattern in FIELD_PATTERNS:
+            if field not in found:
+                match = pattern.match(user_input, position)
+                if match:
+                    found[field] = match
+        if len(found) == len(FIELD_PATTERNS):
+            break
+    return found
+
+
+class QueryVocabulary:
+    """
+    Category names and attribute values compiled into one dictionary matcher,
+    so a query is matched against all of them in a single linear pass. Terms
+    match whole words only and the longest overlapping term wins.
+    """
+
+    def __init__(self, categories, attributes):
+        # Kept so vocabulary_for can tell whether the metadata lists are still the same objects
+        self.categories = categories
+        self.attributes = attributes
+        self.sizes = (len(categories), len(attributes))
+        entries = [(category['name'], (0, index, 0)) for index, category in enumerate(categories)]
+        entries.extend(
+            (value, (1, index, value_index))
+            for index, attribute in enumerate(attributes)
+            for value_index, value in enumerate(attribute['values'])
+        )
+        self.matcher = DictionaryMatcher(entries, plurals=True)
+        self.spelling = TrigramIndex(word for term, _ in entries for word in vocabulary_words(term))
+
+    def match(self, user_input):
+        """Categories and attributes named in user_input, as parse_search_query reports them"""
+        categories = []
+        attributes = {}
+        for kind, index, value_index in sorted(set(self.matcher.payloads(user_input))):
+            if kind == 0:
+                categories.append(self.categories[index]['name'])
+            else:
+                # Sorted by value index, so the last matching value wins
+                attribute = self.attributes[index]
+                attributes[attribute['name']] = attribute['values'][value_index]
+        return categories, attributes
+
+
+_vocabularies = {}
+_vocabularies_lock = threading.Lock()
+
+
+def vocabulary_for(categories, attributes):
+    """
+    QueryVocabulary for the given metadata lists, reused while the same list
+    objects are passed in. The metadata cache serves the same lists until the
+    backend returns new data (a 304 keeps them), so the matcher is rebuilt
+    only when the cached categories or attributes change.
+    """
+    key = (id(categories), id(attributes))
+    vocabulary = _vocabularies.get(key)
+    if (vocabulary is not None and vocabulary.categories is categories and vocabulary.attributes is attributes
+            and vocabulary.sizes == (len(categories), len(attributes))):
+        return vocabulary
+    vocabulary = QueryVocabulary(categories, attributes)
+    with _vocabularies_lock:
+        if len(_vocabularies) >= MAX_CACHED_VOCABULARIES:
+            _vocabularies.pop(next(iter(_vocabularies)))
+        _vocabularies[key] = vocabulary
+    return vocabulary
+
+
+def parse_search_query(user_input, categories, attributes, catalog_index=None):
+    """
+    Turn a natural-language search into search_params for build_search_url.
+
+    The query is parsed as written. Words unknown to the category and
+    attribute vocabulary (and to the indexed products when catalog_index is
+    given) are looked up for a close spelling; if any is found the corrected
+    query is returned as a 'didYouMean' suggestion, but never searched for.
+    """
+    vocabulary = vocabulary_for(categories, attributes)
+    spelling = [vocabulary.spelling]
+    known = None
+    if catalog_index is not None:
+        spelling.append(catalog_index.vocabulary)
+        known = catalog_index.is_known
+    corrected, corrections = correct_text(user_input, spelling, PROTECTED_WORDS, known)
+
+    search_params = {
+        'name': '',
+        'categories': [],
+        'minPrice': None,
+        'maxPrice': None,
+        'minRating': None,
+        'page': 1,
+        'limit': 10,
+        'sortBy': 'name',
+        'sortOrder': 'asc',
+        'attributes': {}
+    }
+    if corrections:
+        search_params['didYouMean'] = corrected
+    found = first_matches(user_input)
+    if 'name' in found:
+        search_params['name'] = found['name'].group(2).strip()
+    if 'price' in found:
+        min_price, max_price = found['price'].groups()
+        search_params['minPrice'] = int(min_price) if min_price else None
+        search_params['maxPrice'] = int(max_price) if max_price else None
+    if 'min_price' in found:
+        search_params['minPrice'] = int(found['min_price'].group(1))
+    if 'max_price' in found:
+        search_params['maxPrice'] = int(found['max_price'].group(1))
+    if 'rating' in found:
+        search_params['minRating'] = int(found['rating'].group(1))
+    if 'page' in found:
+        search_params['page'] = int(found['page'].group(1))
+    if 'limit' in found:
+        search_params['limit'] = int(found['limit'].group(1))
+    if 'sort' in found:
+        sort_match = found['sort']
+        search_params['sortBy'] = sort_match.group(1).lower()
+        if sort_match.group(2):
+            sort_order = sort_match.group(2).lower()
+            search_params['sortOrder'] = 'asc' if sort_order in ['asc', 'ascending'] else 'desc'
+
+    search_params['categories'], search_params['attributes'] = vocabulary.match(user_input)
+    return search_params
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+import numpy as np
+
+DEFAULT_DIMENSIONS = 2 ** 12
+# Cosine similarity at or above which a cached answer is reused
+DEFAULT_SIMILARITY_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.7"))
+DEFAULT_MAX_ENTRIES_PER_SCOPE = 256
+DEFAULT_MAX_SCOPES = 32
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Question scaffolding that carries no meaning for matching
+STOP_WORDS = frozenset("""
+a an the is are was were be been am i me my we our us you your it its this that these those
+of for to in on at by and or with from what whats how show tell give list display see view
+all any do does did can could would should please about some much many get
+which who where when why up has have had there here now currently current check know kindly
+status state situation overview level levels look looking like doing going info information details
+product products item items
+""".split())
+
+
+def _stem(word):
+    # Just enough normalisation to match singular/plural forms
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def question_terms(text):
+    """Unigrams and bigrams of the meaningful words (and numbers of any length) in text"""
+    words = [
+        _stem(word) for word in _TOKEN.findall((text or "").lower())
+        if (len(word) > 1 or word.isdigit()) and word not in STOP_WORDS
+    ]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def question_numbers(text):
+    """The numbers in text; questions asking about different numbers never share an answer"""
+    return frozenset(int(word) for word in _TOKEN.findall((text or "").lower()) if word.isdigit())
+
+
+def _bucket(term, dimensions):
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % dimensions
+
+
+class HashingVectorizer:
+    """Offline bag-of-words vectorizer: hashed term counts with sublinear scaling"""
+
+    def __init__(self, dimensions=DEFAULT_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def transform(self, text):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for term in question_terms(text):
+            vector[_bucket(term, self.dimensions)] += 1.0
+        np.log1p(vector, out=vector)
+        return vector
+
+
+class SemanticAnswerCache:
+    """
+    In-memory cache of LLM answers keyed by question meaning.
+
+    Questions are embedded with a hashing TF-IDF vectorizer (IDF learned from
+    the cached questions) and compared by cosine similarity against the
+    questions cached for the same scope, e.g. (answer kind, catalog snapshot
+    hash). A cached question only matches if it has exactly the same
+    numbers, since "stock below 5" and "stock below 3" differ in one word
+    but need different answers. Each scope holds at most max_entries; the least recently used
+    scopes are dropped beyond max_scopes, so stale catalog snapshots age out.
+    """
+
+    def __init__(self, threshold=DEFAULT_SIMILARITY_THRESHOLD, dimensions=DEFAULT_DIMENSIONS,
+                 max_entries=DEFAULT_MAX_ENTRIES_PER_SCOPE, max_scopes=DEFAULT_MAX_SCOPES):
+        self.threshold = threshold
+        self.vectorizer = HashingVectorizer(dimensions)
+        self.max_entries = max_entries
+        self.max_scopes = max_scopes
+        self._scopes = OrderedDict()
+        self._document_frequency = np.zeros(dimensions, dtype=np.float32)
+        self._documents = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _idf(self):
+        return np.log((1.0 + self._documents) / (1.0 + self._document_frequency)) + 1.0
+
+    def _forget(self, rows):
+        self._document_frequency -= (rows > 0).sum(axis=0)
+        self._documents -= rows.shape[0]
+
+    def lookup(self, scope, question):
+        """Return (answer, similarity) for the closest cached question in scope, or (None, best similarity)"""
+        query = self.vectorizer.transform(question)
+        numbers = question_numbers(question)
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None or not query.any():
+                self.stats["misses"] += 1
+                return None, 0.0
+            self._scopes.move_to_end(scope)
+            idf = self._idf()
+            matrix = entry["vectors"] * idf
+            weighted = query * idf
+            norms = np.linalg.norm(matrix, axis=1) * float(np.linalg.norm(weighted))
+            similarities = (matrix @ weighted) / np.maximum(norms, 1e-12)
+            similarities[[cached != numbers for cached in entry["numbers"]]] = 0.0
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity >= self.threshold:
+                self.stats["hits"] += 1
+                return entry["answers"][best], similarity
+            self.stats["misses"] += 1
+            return None, similarity
+
+    def store(self, scope, question, answer):
+        """Cache answer for question within scope"""
+        vector = self.vectorizer.transform(question)
+        if not vector.any():
+            return
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None:
+                entry = self._scopes[scope] = {
+                    "vectors": np.zeros((0, self.vectorizer.dimensions), dtype=np.float32),
+                    "answers": [],
+                    "numbers": []
+                }
+            self._scopes.move_to_end(scope)
+            entry["vectors"] = np.vstack([entry["vectors"], vector[None, :]])
+            entry["answers"].append(answer)
+            entry["numbers"].append(question_numbers(question))
+            self._document_frequency += vector > 0
+            self._documents += 1
+            self.stats["stores"] += 1
+
+            overflow = len(entry["answers"]) - self.max_entries
+            if overflow > 0:
+                self._forget(entry["vectors"][:overflow])
+                entry["vectors"] = entry["vectors"][overflow:]
+                entry["answers"] = entry["answers"][overflow:]
+                entry["numbers"] = entry["numbers"][overflow:]
+                self.stats["evictions"] += overflow
+            while len(self._scopes) > self.max_scopes:
+                _, dropped = self._scopes.popitem(last=False)
+                self._forget(dropped["vectors"])
+                self.stats["evictions"] += len(dropped["answers"])
+
+    def clear(self):
+        with self._lock:
+            self._scopes.clear()
+            self._document_frequency[:] = 0
+            self._documents = 0
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["scopes"] = len(self._scopes)
+            stats["entries"] = sum(len(entry["answers"]) for entry in self._scopes.values())
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+answer_cache = SemanticAnswerCache()
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls: while a call for a key is in flight,
+    later callers with the same key wait for it and share its result (or
+    exception) instead of issuing their own. Results are shared objects and
+    must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {"calls": 0, "executions": 0, "deduplicated": 0}
+
+    def do(self, key, fn):
+        """Run fn() for key unless an identical call is already in flight"""
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats["deduplicated"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats["executions"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight: concurrent identical coroutine calls
+    on one event loop await a single shared task. Keys are scoped to the
+    running loop, so one instance can serve clients on several loops.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {"calls": 0, "executions": 0, "deduplicated": 0}
+
+    async def do(self, key, fn):
+        """Await fn() for key unless an identical call is already in flight on this loop"""
+        key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            self.stats["calls"] += 1
+            task = self._calls.get(key)
+            if task is not None:
+                self.stats["deduplicated"] += 1
+            else:
+                task = self._calls[key] = asyncio.ensure_future(fn())
+                self.stats["executions"] += 1
+                task.add_done_callback(lambda _: self._forget(key))
+        # A cancelled caller must not cancel the call other callers are waiting on
+        return await asyncio.shield(task)
+
+    def _forget(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
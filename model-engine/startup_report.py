@@ -0,0 +1,44 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_entries = {}
+
+
+@contextmanager
+def import_timer(name):
+    """
+    Time an import (or lazy initialization) and record it under name.
+    Records wall time and how many new modules it pulled into sys.modules.
+    """
+    modules_before = len(sys.modules)
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        with _lock:
+            entry = _entries.setdefault(name, {"ms": 0.0, "modules": 0, "count": 0})
+            entry["ms"] = round(entry["ms"] + elapsed_ms, 1)
+            entry["modules"] += len(sys.modules) - modules_before
+            entry["count"] += 1
+
+
+def get_startup_report():
+    """Recorded import costs, most expensive first"""
+    with _lock:
+        entries = sorted(_entries.items(), key=lambda item: item[1]["ms"], reverse=True)
+        return {
+            "total_ms": round(sum(entry["ms"] for _, entry in entries), 1),
+            "loaded_modules": len(sys.modules),
+            "imports": [dict(entry, name=name) for name, entry in entries]
+        }
+
+
+def print_startup_report():
+    report = get_startup_report()
+    print(f"⏱️  Startup imports: {report['total_ms']} ms, {report['loaded_modules']} modules loaded")
+    for entry in report["imports"]:
+        print(f"   {entry['name']:<28} {entry['ms']:>8.1f} ms  (+{entry['modules']} modules)")
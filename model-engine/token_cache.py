@@ -0,0 +1,152 @@
+import base64
+import json
+import threading
+import time
+
+# Refresh this many seconds before the token's exp claim
+DEFAULT_REFRESH_MARGIN = 60
+# Lifetime assumed for tokens without a readable exp claim
+DEFAULT_TOKEN_TTL = 15 * 60
+# Tokens per key that still map back to it: the current one and the one it replaced
+OWNED_TOKENS_PER_KEY = 2
+
+
+def decode_token_expiry(access_token):
+    """Return the exp claim (unix seconds) of a JWT without verifying it, or None"""
+    try:
+        payload = access_token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get('exp')
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+class TokenCache:
+    """
+    Process-wide access token cache.
+
+    Tokens are keyed by (base_url, email). A token is served until it enters
+    the refresh window (refresh_margin seconds before exp); then exactly one
+    caller signs in again while the others keep using the still-valid token.
+    Once a token has actually expired, the other callers wait for the refresh.
+    """
+
+    def __init__(self, refresh_margin=DEFAULT_REFRESH_MARGIN, default_ttl=DEFAULT_TOKEN_TTL):
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._owners = {}
+        # Owned tokens per key, oldest first, so replaced tokens can be forgotten
+        self._issued = {}
+        self._fetchers = {}
+        self._refresh_locks = {}
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0, "invalidations": 0}
+
+    def _refresh_lock(self, key):
+        with self._lock:
+            lock = self._refresh_locks.get(key)
+            if lock is None:
+                lock = self._refresh_locks[key] = threading.Lock()
+            return lock
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, key, fetch):
+        """Return a cached token for key, calling fetch() to sign in when needed"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry and now < entry["expires_at"] - self.refresh_margin:
+            self._count("hits")
+            return entry["token"]
+
+        lock = self._refresh_lock(key)
+        if entry and now < entry["expires_at"]:
+            # Proactive refresh: only one caller refreshes, the rest keep the old token
+            if not lock.acquire(blocking=False):
+                self._count("hits")
+                return entry["token"]
+        else:
+            lock.acquire()
+
+        try:
+            # Another caller may have refreshed while we waited
+            entry = self._entries.get(key)
+            if entry and time.time() < entry["expires_at"] - self.refresh_margin:
+                self._count("hits")
+                return entry["token"]
+            self._count("misses")
+            token = fetch()
+            if token:
+                self._store(key, token, fetch)
+                self._count("refreshes")
+            return token
+        finally:
+            lock.release()
+
+    def peek(self, key):
+        """Return the cached token for key if it is outside the refresh window, else None"""
+        entry = self._entries.get(key)
+        if entry and time.time() < entry["expires_at"] - self.refresh_margin:
+            self._count("hits")
+            return entry["token"]
+        return None
+
+    def _store(self, key, token, fetch):
+        expires_at = decode_token_expiry(token) or time.time() + self.default_ttl
+        with self._lock:
+            # The token just replaced keeps its owner entry so a late 401 still maps back to key;
+            # older ones are forgotten so the map stays bounded
+            self._entries[key] = {"token": token, "expires_at": expires_at}
+            self._owners[token] = key
+            issued = self._issued.setdefault(key, [])
+            if token not in issued:
+                issued.append(token)
+            while len(issued) > OWNED_TOKENS_PER_KEY:
+                self._owners.pop(issued.pop(0), None)
+            self._fetchers[key] = fetch
+
+    def invalidate(self, key=None, token=None):
+        """Drop the cached token for key (and/or the given token), or everything when neither is given"""
+        with self._lock:
+            if key is None and token is None:
+                self._entries.clear()
+                self.stats["invalidations"] += 1
+                return
+            if key is None:
+                key = self._owners.get(token)
+            entry = self._entries.get(key)
+            if entry and (token is None or entry["token"] == token):
+                del self._entries[key]
+                self.stats["invalidations"] += 1
+
+    def refresh_rejected(self, token):
+        """
+        Handle a 401 for token: invalidate it and return a fresh token from the
+        same credentials, or None if the token is not one we issued.
+        """
+        with self._lock:
+            key = self._owners.get(token)
+            fetch = self._fetchers.get(key)
+        if fetch is None:
+            return None
+        self.invalidate(key, token)
+        return self.get(key, fetch)
+
+    def identity(self, token):
+        """Stable identity for a token: its (base_url, email) key if we issued it, else the token"""
+        with self._lock:
+            return self._owners.get(token, token)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["cached_tokens"] = len(self._entries)
+        return stats
+
+
+token_cache = TokenCache()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Search Query Parser Benchmark
+Times parse_search_query against the previous regex-per-field implementation
+on realistic metadata sizes. Both must extract identical keyword fields
+for every query, including those given a spelling suggestion (the query is
+parsed as written); categories and attributes differ where whole-word
+matching rejects a substring hit (e.g. "men" inside "women"). Suggested and
+changed queries are counted.
+
+    python search_benchmark.py [--categories 300] [--attributes 60] [--values 80]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model-engine'))
+
+from search_query import parse_search_query, vocabulary_for
+
+COLORS = ["red", "blue", "green", "black", "white", "navy", "maroon", "beige", "olive", "teal", "grey", "pink"]
+MATERIALS = ["cotton", "linen", "silk", "wool", "denim", "leather", "polyester", "nylon", "rayon", "khadi"]
+PRODUCTS = ["shirt", "kurta", "saree", "jeans", "sneakers", "headphones", "backpack", "watch", "lamp", "mug"]
+QUERY_WORDS = ["find", "search", "show", "get", "list", "with", "in", "under", "above", "category", "price",
+               "rating", "sort", "by", "asc", "desc", "page", "limit", "display", "between", "to", "more",
+               "than", "less", "minimum", "maximum", "cost", "from", "over", "below"]
+VOCABULARY_FIELDS = ('categories', 'attributes')
+TEMPLATES = [
+    "find {color} {material} {product} under {n}",
+    "show me {product} in {category} price between {n} to {m}",
+    "search {product} with rating above 4 sort by price desc",
+    "list {color} {product} above ₹{n} page 2 limit 20",
+    "get {material} {product} category {category} sort by name ascending",
+    "display 5 {product} less than {m}",
+    "{product} {color} cost from {n} - {m}",
+    "find {typo} under {n}"
+]
+
+
+def legacy_parse_search_query(user_input, categories, attributes):
+    """The implementation parse_search_query replaced, kept as the reference"""
+    search_params = {
+        'name': '',
+        'categories': [],
+        'minPrice': None,
+        'maxPrice': None,
+        'minRating': None,
+        'page': 1,
+        'limit': 10,
+        'sortBy': 'name',
+        'sortOrder': 'asc',
+        'attributes': {}
+    }
+    name_match = re.search(r'(find|search|show|get|list)\s+(.*?)(?:\s+(?:with|in|under|above|category|price|rating|sort)|\s*$)', user_input, re.IGNORECASE)
+    if name_match:
+        search_params['name'] = name_match.group(2).strip()
+    price_matches = re.findall(r'(?:price|cost)\s*(?:between|from)?\s*₹?(\d+)(?:\s*(?:to|-)\s*₹?(\d+))?', user_input, re.IGNORECASE)
+    if price_matches:
+        min_price, max_price = price_matches[0]
+        search_params['minPrice'] = int(min_price) if min_price else None
+        search_params['maxPrice'] = int(max_price) if max_price else None
+    min_price_match = re.search(r'(?:above|over|more\s+than|minimum)\s*₹?(\d+)', user_input, re.IGNORECASE)
+    if min_price_match:
+        search_params['minPrice'] = int(min_price_match.group(1))
+    max_price_match = re.search(r'(?:under|below|less\s+than|maximum)\s*₹?(\d+)', user_input, re.IGNORECASE)
+    if max_price_match:
+        search_params['maxPrice'] = int(max_price_match.group(1))
+    rating_match = re.search(r'rating\s*(?:above|over|more\s+than)?\s*(\d+)', user_input, re.IGNORECASE)
+    if rating_match:
+        search_params['minRating'] = int(rating_match.group(1))
+    page_match = re.search(r'page\s*(\d+)', user_input, re.IGNORECASE)
+    if page_match:
+        search_params['page'] = int(page_match.group(1))
+    limit_match = re.search(r'(?:limit|show|display)\s*(\d+)', user_input, re.IGNORECASE)
+    if limit_match:
+        search_params['limit'] = int(limit_match.group(1))
+    sort_match = re.search(r'sort\s+by\s+(\w+)(?:\s+(asc|desc|ascending|descending))?', user_input, re.IGNORECASE)
+    if sort_match:
+        search_params['sortBy'] = sort_match.group(1).lower()
+        if sort_match.group(2):
+            sort_order = sort_match.group(2).lower()
+            search_params['sortOrder'] = 'asc' if sort_order in ['asc', 'ascending'] else 'desc'
+    for category in categories:
+        if category['name'].lower() in user_input.lower():
+            search_params['categories'].append(category['name'])
+    for attribute in attributes:
+        attr_name = attribute['name'].lower()
+        for value in attribute['values']:
+            if attr_name in user_input.lower() and value.lower() in user_input.lower():
+                search_params['attributes'][attribute['name']] = value
+            elif value.lower() in user_input.lower():
+                search_params['attributes'][attribute['name']] = value
+    return search_params
+
+
+def build_metadata(rng, category_count, attribute_count, values_per_attribute):
+    """Category and attribute lists shaped like /api/categories and /api/attributes"""
+    categories = [{'id': f'cat-{i}', 'name': f"{rng.choice(PRODUCTS).title()} {rng.choice(MATERIALS).title()} {i}"}
+                  for i in range(category_count)]
+    categories[:len(PRODUCTS)] = [{'id': f'cat-{p}', 'name': p.title()} for p in PRODUCTS]
+    attributes = []
+    for i in range(attribute_count):
+        if i == 0:
+            values = COLORS
+        elif i == 1:
+            values = MATERIALS
+        else:
+            values = [f"{rng.choice(COLORS)}-{rng.choice(MATERIALS)}-{j}" for j in range(values_per_attribute)]
+        attributes.append({'id': f'attr-{i}', 'name': f"Attribute{i}", 'values': values})
+    return categories, attributes
+
+
+def misspell(rng, word):
+    """word with one character dropped, doubled or swapped with its neighbour"""
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.choice(("drop", "double", "swap"))
+    if edit == "drop":
+        return word[:i] + word[i + 1:]
+    if edit == "double":
+        return word[:i] + word[i] + word[i:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def build_queries(rng, categories, count):
+    queries = []
+    for _ in range(count):
+        template = rng.choice(TEMPLATES)
+        queries.append(template.format(
+            color=rng.choice(COLORS).upper() if rng.random() < 0.2 else rng.choice(COLORS),
+            material=rng.choice(MATERIALS), product=rng.choice(PRODUCTS),
+            category=rng.choice(categories)['name'], n=rng.randint(1, 5000), m=rng.randint(100, 20000),
+            typo=misspell(rng, rng.choice(PRODUCTS + MATERIALS))
+        ))
+    # Random word soup exercises keyword overlaps and odd orderings
+    for _ in range(count):
+        words = [rng.choice(QUERY_WORDS + COLORS + PRODUCTS + [str(rng.randint(0, 999)), "₹" + str(rng.randint(0, 99))])
+                 for _ in range(rng.randint(1, 12))]
+        queries.append(" ".join(words))
+    return queries
+
+
+def time_per_call(function, queries, categories, attributes, repeat):
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            function(query, categories, attributes)
+    return (time.perf_counter() - started_at) / (repeat * len(queries)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parse_search_query")
+    parser.add_argument("--categories", type=int, default=300)
+    parser.add_argument("--attributes", type=int, default=60)
+    parser.add_argument("--values", type=int, default=80, help="values per attribute")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    categories, attributes = build_metadata(rng, args.categories, args.attributes, args.values)
+    queries = build_queries(rng, categories, args.queries)
+    value_count = sum(len(attribute['values']) for attribute in attributes)
+    print(f"🔎 {len(categories)} categories, {len(attributes)} attributes, {value_count} attribute values, "
+          f"{len(queries)} queries")
+
+    mismatches = []
+    vocabulary_changes = 0
+    corrected = 0
+    for query in queries:
+        params = parse_search_query(query, categories, attributes)
+        if 'didYouMean' in params:
+            corrected += 1
+            params.pop('didYouMean')
+        legacy = legacy_parse_search_query(query, categories, attributes)
+        if (params['categories'], params['attributes']) != (legacy['categories'], legacy['attributes']):
+            vocabulary_changes += 1
+        for key in VOCABULARY_FIELDS:
+            params.pop(key)
+            legacy.pop(key)
+        if params != legacy:
+            mismatches.append(query)
+    if mismatches:
+        print(f"❌ {len(mismatches)} queries parsed differently, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+    print(f"✅ keyword fields identical for every query ({corrected} queries given a spelling suggestion)")
+    print(f"   {vocabulary_changes} queries matched categories/attributes differently (whole words, longest match)")
+
+    started_at = time.perf_counter()
+    vocabulary_for(list(categories), list(attributes))
+    build_ms = (time.perf_counter() - started_at) * 1000
+
+    legacy_us = time_per_call(legacy_parse_search_query, queries, categories, attributes, args.repeat)
+    new_us = time_per_call(parse_search_query, queries, categories, attributes, args.repeat)
+    print(f"   legacy parser:    {legacy_us:10.1f} µs/query")
+    print(f"   compiled parser:  {new_us:10.1f} µs/query  ({legacy_us / new_us:.0f}x faster)")
+    print(f"   vocabulary build: {build_ms:10.1f} ms once per metadata refresh")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+# model-engine is not an installable package; import its modules the way api/app.py does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'model-engine'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from fake_backend import FakeCatalog, create_app
+
+
+@pytest.fixture(scope="session")
+def fake_backend_url():
+    """A fake_backend.py server on a free local port, shared by the session"""
+    server = make_server("127.0.0.1", 0, create_app(FakeCatalog(250, seed=3)), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
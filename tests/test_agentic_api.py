@@ -0,0 +1,72 @@
+import io
+
+import pytest
+import requests
+
+from agentic_api import AgenticAPI, get_pool_stats, get_shared_session
+
+
+class ScriptedSession:
+    """Answers requests with the scripted status codes, raising any exception in the script"""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.status_code = outcome
+        response.raw = io.BytesIO()
+        return response
+
+
+def scripted_api(name, *script, max_retries=3):
+    api = AgenticAPI(f"http://{name}", max_retries=max_retries)
+    api.session = ScriptedSession(*script)
+    api._backoff = lambda attempt: 0
+    return api
+
+
+def test_instances_share_one_session():
+    assert AgenticAPI("http://a").session is AgenticAPI("http://b").session
+    assert get_shared_session(7) is not get_shared_session()
+
+
+def test_get_retries_transient_failures():
+    api = scripted_api("retry-get", 503, requests.exceptions.ConnectionError(), 200)
+    assert api._request("GET", "http://retry-get/x").status_code == 200
+    assert api.session.calls == 3
+
+
+def test_get_gives_up_after_max_retries():
+    api = scripted_api("retry-limit", 503, 503, 503, max_retries=2)
+    assert api._request("GET", "http://retry-limit/x").status_code == 503
+    assert api.session.calls == 3
+
+
+def test_client_errors_are_not_retried():
+    api = scripted_api("retry-404", 404, 200)
+    assert api._request("GET", "http://retry-404/x").status_code == 404
+    assert api.session.calls == 1
+
+
+def test_post_is_sent_once():
+    api = scripted_api("retry-post", 503, 201)
+    assert api._request("POST", "http://retry-post/x").status_code == 503
+    with pytest.raises(requests.exceptions.Timeout):
+        scripted_api("retry-post-timeout", requests.exceptions.Timeout())._post("http://retry-post-timeout/x")
+
+
+def test_keep_alive_connections_are_reused(fake_backend_url):
+    api = AgenticAPI(fake_backend_url)
+    token = api.authenticate_user()
+    before = get_pool_stats()
+    for page in range(1, 6):
+        assert api._fetch_seller_products(f"{fake_backend_url}/api/seller-product?page={page}", token)
+    after = get_pool_stats()
+    assert after["pool_requests"] - before["pool_requests"] == 5
+    assert after["connections_opened"] - before["connections_opened"] <= 1
@@ -0,0 +1,116 @@
+import importlib
+import json
+
+import pytest
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    # app.py creates its upload folder relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    app = importlib.import_module("app")
+    calls = []
+    monkeypatch.setattr(app, "add_products_batch_api",
+                        lambda *args, **kwargs: calls.append(kwargs) or {"success": True})
+    client = app.app.test_client()
+    client.batch_calls = calls
+    return client
+
+
+@pytest.mark.parametrize("body", [
+    {"posts_per_second": 0},
+    {"posts_per_second": -2},
+    {"posts_per_second": "fast"},
+    {"posts_per_second": 1000},
+    {"max_generation_workers": 0},
+    {"max_post_workers": -1},
+    {"max_post_workers": 1000},
+])
+def test_batch_rejects_out_of_range_tuning(client, body):
+    response = client.post("/add-products-batch", json=dict(body, user_inputs=["red kurta"]))
+    assert response.status_code == 400
+    assert client.batch_calls == []
+
+
+def test_batch_passes_valid_tuning(client):
+    response = client.post("/add-products-batch", json={"user_inputs": ["red kurta"], "posts_per_second": 2,
+                                                        "max_post_workers": 3})
+    assert response.status_code == 200
+    assert client.batch_calls == [{"max_generation_workers": 4, "max_post_workers": 3, "posts_per_second": 2.0}]
+
+
+
+@pytest.fixture
+def facet_client(client, monkeypatch):
+    app = importlib.import_module("app")
+    calls = []
+    monkeypatch.setattr(app, "facet_search_api",
+                        lambda filters, page, limit: calls.append((page, limit)) or {"success": True})
+    client.facet_calls = calls
+    return client
+
+
+@pytest.mark.parametrize("body", [
+    {"page": "first"},
+    {"limit": "all"},
+    {"page": None},
+    {"page": 0},
+    {"page": -1},
+    {"limit": 0},
+    {"limit": -5},
+])
+def test_facets_reject_invalid_paging(facet_client, body):
+    response = facet_client.post("/search/facets", json=body)
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+    assert facet_client.facet_calls == []
+
+
+def test_facets_clamp_large_limits(facet_client):
+    assert facet_client.post("/search/facets", json={"page": "2", "limit": 500}).status_code == 200
+    assert facet_client.post("/search/facets", json={}).status_code == 200
+    assert facet_client.facet_calls == [(2, 100), (1, 20)]
+
+def sse_events(response):
+    events = []
+    for block in response.get_data(as_text=True).strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def stream_client(client, monkeypatch):
+    ecommerce = importlib.import_module("ecommerce")
+    monkeypatch.setattr(ecommerce, "fetch_catalog_page", lambda *args: {"products": [
+        {"name": "Kurta", "price": 499, "stock": 2, "categories": [{"name": "Clothing"}]}
+    ]})
+    return client, ecommerce
+
+
+def test_summary_stream_sends_inventory_then_tokens(stream_client, monkeypatch):
+    client, ecommerce = stream_client
+    monkeypatch.setattr(ecommerce, "stream_ai_catalog_summary_with_context", lambda *args: iter(["Low ", "stock"]))
+    response = client.post("/catalog/process-text/stream", json={"text": "what is running low?"})
+    assert response.mimetype == "text/event-stream"
+    events = sse_events(response)
+    assert [name for name, _ in events] == ["inventory", "token", "token", "done"]
+    assert events[0][1]["processed_text"] == "what is running low?"
+    assert "".join(payload["text"] for name, payload in events if name == "token") == "Low stock"
+
+
+def test_summary_stream_reports_errors_as_an_event(stream_client, monkeypatch):
+    client, ecommerce = stream_client
+
+    def failing(*args):
+        yield "Partial"
+        raise RuntimeError("upstream closed")
+
+    monkeypatch.setattr(ecommerce, "stream_ai_catalog_summary_with_context", failing)
+    events = sse_events(client.post("/catalog/process-text/stream", json={"text": "summary"}))
+    assert [name for name, _ in events] == ["inventory", "token", "error"]
+    assert events[-1][1]["error"] == "upstream closed"
+
+
+def test_summary_stream_rejects_empty_text(client):
+    assert client.post("/catalog/process-text/stream", json={"text": "  "}).status_code == 400
@@ -0,0 +1,70 @@
+import asyncio
+
+from async_agentic_api import AsyncAgenticAPI, SyncAgenticAPI, get_singleflight_stats
+from metadata_cache import metadata_cache
+
+
+async def fetch_all(url):
+    async with AsyncAgenticAPI(url) as api:
+        token = await api.authenticate_user()
+        metadata = await api.get_search_metadata(token)
+        page = await api.get_seller_products(token, page=1, limit=5)
+        return token, metadata, page
+
+
+def test_fetches_metadata_and_products(fake_backend_url):
+    metadata_cache.invalidate((fake_backend_url, "categories"))
+    metadata_cache.invalidate((fake_backend_url, "attributes"))
+    token, (categories, attributes), page = asyncio.run(fetch_all(fake_backend_url))
+    assert token
+    assert categories and attributes
+    assert len(page["products"]) == 5 and page["total"] == 250
+
+
+def test_identical_concurrent_searches_share_one_request(fake_backend_url):
+    async def search():
+        async with AsyncAgenticAPI(fake_backend_url) as api:
+            token = await api.authenticate_user()
+            url = f"{fake_backend_url}/api/product?name=coalesce-test&limit=3"
+            return await asyncio.gather(*(api.search_products(url, token) for _ in range(5)))
+
+    before = get_singleflight_stats()
+    results = asyncio.run(search())
+    after = get_singleflight_stats()
+    assert all(result is results[0] for result in results)
+    assert after["calls"] - before["calls"] == 5
+    assert after["executions"] - before["executions"] == 1
+
+
+def test_sync_facade_shares_one_async_client(fake_backend_url):
+    api = SyncAgenticAPI(fake_backend_url)
+    assert api._api is SyncAgenticAPI(fake_backend_url)._api
+    token = api.authenticate_user()
+    assert api.get_seller_products(token, limit=3)["limit"] == 3
+
+
+def test_stale_metadata_refresh_is_held_until_done(monkeypatch):
+    api = AsyncAgenticAPI("http://stale-refresh")
+    stale = {"data": ["old"]}
+    monkeypatch.setattr(metadata_cache, "peek", lambda key: (stale, "stale"))
+    monkeypatch.setattr(metadata_cache, "store", lambda key, result, entry: result)
+
+    async def refresh():
+        release = asyncio.Event()
+
+        async def load(name, access_token, entry):
+            await release.wait()
+            return {"data": ["new"]}
+
+        monkeypatch.setattr(api, "_load_metadata", load)
+        assert await api.get_available_categories() == ["old"]
+        tasks = set(api._background_tasks)
+        assert len(tasks) == 1
+        # A second stale read while the refresh runs does not start another one
+        await api.get_available_categories()
+        assert api._background_tasks == tasks
+        release.set()
+        await asyncio.gather(*tasks)
+        assert api._background_tasks == set()
+
+    asyncio.run(refresh())
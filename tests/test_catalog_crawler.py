@@ -0,0 +1,90 @@
+from agentic_api import AgenticAPI
+from catalog_crawler import CatalogCrawler
+
+
+def crawl(url, **kwargs):
+    api = AgenticAPI(url)
+    crawler = CatalogCrawler(api, api.authenticate_user(), page_size=40, max_workers=3, sort_order="asc", **kwargs)
+    return crawler, list(crawler.products())
+
+
+def test_concurrent_crawl_yields_every_product_in_order(fake_backend_url):
+    crawler, products = crawl(fake_backend_url)
+    assert len(products) == 250
+    assert [p["id"] for p in products] == [f"prod-{i:07d}" for i in range(1, 251)]
+    assert crawler.stats["total_pages"] == 7
+    assert crawler.stats["pages_fetched"] == 7
+    assert crawler.stats["products_yielded"] == 250
+
+
+def test_streamed_crawl_matches_concurrent_crawl(fake_backend_url):
+    _, expected = crawl(fake_backend_url)
+    crawler, products = crawl(fake_backend_url, stream=True)
+    assert products == expected
+    assert crawler.stats["pages_fetched"] == 7
+    assert crawler.stats["pages_failed"] == 0
+
+
+class FlakyStreamAPI:
+    """Serves two pages; the first attempt at page 2 fails before any product"""
+
+    def __init__(self):
+        self.attempts = {}
+
+    def iter_seller_products(self, access_token, page, limit, sort_by, sort_order, meta):
+        self.attempts[page] = self.attempts.get(page, 0) + 1
+        if page == 2 and self.attempts[page] == 1:
+            return
+        meta.update(total=3, totalPages=2)
+        yield from [{"id": "a"}, {"id": "b"}] if page == 1 else [{"id": "c"}]
+
+
+def test_streamed_crawl_retries_a_page_that_fails_before_any_product(monkeypatch):
+    monkeypatch.setattr("catalog_crawler.time.sleep", lambda seconds: None)
+    api = FlakyStreamAPI()
+    crawler = CatalogCrawler(api, "token", stream=True)
+    assert [p["id"] for p in crawler.products()] == ["a", "b", "c"]
+    assert crawler.stats["page_retries"] == 1
+    assert crawler.stats["total_products"] == 3
+
+
+class PagedAPI:
+    """get_seller_products over numbered products; pages in failures answer None that many times first"""
+
+    def __init__(self, total, failures=None):
+        self.total = total
+        self.failures = dict(failures or {})
+        self.requested = []
+
+    def get_seller_products(self, access_token, page, limit, sort_by, sort_order):
+        self.requested.append(page)
+        if self.failures.get(page):
+            self.failures[page] -= 1
+            return None
+        products = [{"id": i} for i in range((page - 1) * limit, min(page * limit, self.total))]
+        return {"products": products, "total": self.total, "totalPages": -(-self.total // limit)}
+
+
+def test_failed_page_is_retried_then_skipped(monkeypatch):
+    monkeypatch.setattr("catalog_crawler.time.sleep", lambda seconds: None)
+    crawler = CatalogCrawler(PagedAPI(50, failures={2: 1, 4: 10}), "token", page_size=10, page_retries=2)
+    ids = [p["id"] for p in crawler.products()]
+    assert ids == list(range(0, 30)) + list(range(40, 50))
+    assert crawler.stats["page_retries"] == 3
+    assert crawler.stats["pages_failed"] == 1
+
+
+def test_stopping_early_does_not_fetch_the_whole_catalog():
+    api = PagedAPI(10000)
+    crawler = CatalogCrawler(api, "token", page_size=10, max_workers=2)
+    first = [p["id"] for _, p in zip(range(15), crawler.products())]
+    assert first == list(range(15))
+    # At most the look-ahead window beyond the pages actually read
+    assert len(set(api.requested)) <= 2 + 2 * 2
+
+
+def test_progress_reports_after_each_page():
+    reports = []
+    crawler = CatalogCrawler(PagedAPI(25), "token", page_size=10, progress=reports.append)
+    list(crawler.products())
+    assert [report["products_yielded"] for report in reports] == [10, 20, 25]
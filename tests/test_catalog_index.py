@@ -0,0 +1,119 @@
+import threading
+
+import ecommerce
+from catalog_index import CatalogIndex, analyze
+
+
+def product(key, name, description="", categories=(), attributes=(), price=100, rating=4.0):
+    return {
+        "id": key, "name": name, "description": description, "price": price, "rating": rating,
+        "categories": [{"id": f"cat-{c.lower()}", "name": c} for c in categories],
+        "attributes": [{"name": n, "value": v} for n, v in attributes],
+    }
+
+
+def build(*products):
+    index = CatalogIndex()
+    for p in products:
+        index.upsert(p)
+    return index
+
+
+def names(hits):
+    return [p["name"] for _, p in hits]
+
+
+def test_analyze_folds_plurals_and_drops_stop_words():
+    assert analyze("Shirts for the Ladies") == ["shirt", "lady"]
+
+
+def test_name_matches_outrank_description_matches():
+    index = build(product("1", "Plain Top", "goes well with a kurta"), product("2", "Cotton Kurta"))
+    hits, total = index.search("kurta")
+    assert total == 2
+    assert names(hits) == ["Cotton Kurta", "Plain Top"]
+
+
+def test_categories_and_attribute_values_are_searchable():
+    index = build(product("1", "Festive Wear", categories=["Ethnic"], attributes=[("Fabric", "Silk")]),
+                  product("2", "Denim Jacket"))
+    assert names(index.search("silk")[0]) == ["Festive Wear"]
+    assert names(index.search("ethnic")[0]) == ["Festive Wear"]
+
+
+def test_top_k_limits_results_but_not_total():
+    index = build(*[product(str(i), f"Red Shirt {i}") for i in range(20)])
+    hits, total = index.search("red shirt", k=5)
+    assert (len(hits), total) == (5, 20)
+
+
+def test_upsert_replaces_changed_products():
+    index = build(product("1", "Blue Shirt"))
+    assert index.upsert(product("1", "Green Shirt"))
+    assert index.search("blue")[1] == 0
+    assert names(index.search("green")[0]) == ["Green Shirt"]
+    assert len(index) == 1
+
+
+def test_unchanged_text_keeps_document_but_refreshes_product():
+    index = build(product("1", "Blue Shirt", price=100))
+    assert not index.upsert(product("1", "Blue Shirt", price=80))
+    assert index.search("blue")[0][0][1]["price"] == 80
+
+
+def test_remove_and_compaction():
+    index = build(*[product(str(i), f"Shirt {i}") for i in range(10)])
+    for i in range(5):
+        assert index.remove(str(i))
+    assert index.search("shirt")[1] == 5
+    # Compaction ran once deleted documents passed COMPACT_DEAD_RATIO
+    assert index.get_stats()["deleted"] < 5
+
+
+def test_sync_drops_products_missing_from_a_complete_snapshot():
+    index = build(product("1", "Blue Shirt"), product("2", "Red Kurta"))
+    counts = index.sync([product("1", "Blue Shirt")])
+    assert counts == {"indexed": 0, "unchanged": 1, "removed": 1}
+    assert index.search("kurta")[1] == 0
+
+
+def test_partial_snapshot_keeps_missing_products():
+    index = build(product("1", "Blue Shirt"), product("2", "Red Kurta"))
+    index.sync([product("1", "Blue Shirt")], is_complete=lambda: False)
+    assert index.search("kurta")[1] == 1
+
+
+def test_suggest_corrects_misspelled_words():
+    index = build(product("1", "Cotton Kurta"))
+    assert index.suggest("karta") == "kurta"
+    assert index.suggest("kurta") is None
+
+
+def test_first_use_builds_the_index_in_the_background(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_sync():
+        started.set()
+        release.wait(5)
+        ecommerce._catalog_index_state["synced_at"] = 1.0
+
+    monkeypatch.setattr(ecommerce, "sync_catalog_index", slow_sync)
+    monkeypatch.setattr(ecommerce, "_catalog_index_state",
+                        {"synced_at": None, "stale": True, "syncing": False, "last_sync": None})
+    assert ecommerce.get_catalog_index() is None
+    assert started.wait(5)
+    # A second caller neither waits nor starts another crawl
+    assert ecommerce.get_catalog_index() is None
+    release.set()
+    for _ in range(100):
+        if not ecommerce._catalog_index_state["syncing"]:
+            break
+        threading.Event().wait(0.01)
+    assert ecommerce.get_catalog_index() is ecommerce.catalog_index
+
+
+def test_search_uses_the_backend_until_the_index_is_ready(monkeypatch):
+    monkeypatch.setattr(ecommerce, "get_catalog_index", lambda: None)
+    monkeypatch.setattr(ecommerce, "_search_catalog_via_backend",
+                        lambda query, page, limit: {"success": True, "source": "backend", "query": query})
+    assert ecommerce.search_catalog_api("kurta")["source"] == "backend"
@@ -0,0 +1,85 @@
+import pytest
+import requests
+
+from agentic_api import AgenticAPI
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, endpoint_name, get_breaker
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        assert breaker.allow()
+        breaker.record(False, 0.01)
+
+
+def test_trips_on_failure_rate():
+    breaker = CircuitBreaker("test", min_calls=4, open_seconds=60)
+    trip(breaker)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_trips_on_slow_calls():
+    breaker = CircuitBreaker("test", min_calls=2, slow_call_seconds=1.0)
+    for _ in range(2):
+        breaker.allow()
+        breaker.record(True, 2.0)
+    assert breaker.state == OPEN
+
+
+def test_stays_closed_below_min_calls():
+    breaker = CircuitBreaker("test", min_calls=5)
+    breaker.allow()
+    breaker.record(False, 0.01)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker("test", min_calls=2, open_seconds=0)
+    trip(breaker)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record(True, 0.01)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_reopens_on_failure():
+    breaker = CircuitBreaker("test", min_calls=2, open_seconds=0)
+    trip(breaker)
+    breaker.allow()
+    breaker.record(False, 0.01)
+    assert breaker.state == OPEN
+
+
+def test_endpoint_name_ignores_query_string():
+    assert endpoint_name("get", "http://shop/api/product?name=x") == "GET shop/api/product"
+
+
+class BrokenSession:
+    def __init__(self, error):
+        self.error = error
+
+    def request(self, method, url, **kwargs):
+        raise self.error
+
+
+@pytest.mark.parametrize("error", [
+    requests.exceptions.ChunkedEncodingError("truncated body"),
+    requests.exceptions.InvalidURL("bad url"),
+])
+def test_unexpected_request_errors_release_half_open_probe(error):
+    url = f"http://breaker-test/{type(error).__name__}"
+    breaker = get_breaker(endpoint_name("POST", url))
+    breaker.open_seconds = 0
+    trip(breaker)
+
+    api = AgenticAPI("http://breaker-test")
+    api.session = BrokenSession(error)
+    with pytest.raises(type(error)):
+        api._request("POST", url)
+
+    # The failed probe re-opened the breaker instead of holding the half-open slot forever
+    assert breaker.state == OPEN
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
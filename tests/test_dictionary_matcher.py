@@ -0,0 +1,39 @@
+from dictionary_matcher import DictionaryMatcher, first_label, keyword_table_matcher
+
+
+def test_longest_match_wins():
+    matcher = DictionaryMatcher([("shirt", "shirt"), ("t-shirt", "tee")])
+    assert [term for _, _, term, _ in matcher.find("Blue T-Shirt for men")] == ["t-shirt"]
+
+
+def test_matches_respect_word_boundaries():
+    matcher = DictionaryMatcher([("men", "Men"), ("women", "Women")])
+    assert matcher.payloads("shoes for women") == ["Women"]
+    assert matcher.payloads("menswear") == []
+    assert matcher.payloads("men, women") == ["Men", "Women"]
+
+
+def test_case_insensitive_and_plurals():
+    matcher = DictionaryMatcher([("Dress", "Dresses"), ("watch", "Watches")], plurals=True)
+    assert matcher.payloads("red DRESSES and two watches") == ["Dresses", "Watches"]
+    assert DictionaryMatcher([("watch", "Watches")]).payloads("watches") == []
+
+
+def test_shared_terms_carry_every_payload():
+    matcher = DictionaryMatcher([("cotton", "Material"), ("cotton", "Fabric"), ("cotton", "Material")])
+    assert len(matcher) == 1
+    assert matcher.payloads("cotton kurta") == ["Material", "Fabric"]
+
+
+def test_iter_hits_reports_overlaps():
+    matcher = DictionaryMatcher([("running shoes", 1), ("shoes", 2), ("running", 3)])
+    hits = sorted(matcher.iter_hits("running shoes"))
+    assert hits == [(0, 7, "running"), (0, 13, "running shoes"), (8, 13, "shoes")]
+    assert [term for _, _, term, _ in matcher.find("running shoes")] == ["running shoes"]
+
+
+def test_first_label_uses_table_order():
+    table = {"Footwear": ["shoe", "sneaker"], "Clothing": ["shirt"]}
+    matcher = keyword_table_matcher(table)
+    assert first_label(matcher, table, "shirt with sneakers", "Other") == "Footwear"
+    assert first_label(matcher, table, "a hat", "Other") == "Other"
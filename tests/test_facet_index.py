@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from facet_index import FacetIndex, facet_values, price_band, price_band_labels
+
+COLORS = ("Red", "Blue", "Green")
+CATEGORIES = ("Shirts", "Shoes", "Bags")
+
+
+def make_product(rng):
+    return {
+        "categories": [{"name": rng.choice(CATEGORIES)}],
+        "attributes": [{"name": "Color", "value": rng.choice(COLORS)}],
+        "price": rng.choice((99, 750, 1800, 4000, 8000, 25000)),
+        "rating": round(rng.uniform(0, 5), 1)
+    }
+
+
+@pytest.fixture
+def catalog():
+    rng = random.Random(11)
+    products = {f"p{i}": make_product(rng) for i in range(300)}
+    index = FacetIndex()
+    for key, product in products.items():
+        index.upsert(key, product)
+    return index, products
+
+
+def matches(product, filters):
+    """Brute-force reference for FacetIndex.query filtering"""
+    values = facet_values(product)
+    for facet, selected in filters.items():
+        if facet == "attributes":
+            for name, wanted in selected.items():
+                if not any((("attributes", name), value) in values for value in wanted):
+                    return False
+        elif not any((facet, value) in values for value in selected):
+            return False
+    return True
+
+
+def test_price_bands():
+    assert price_band(0) == "0-500"
+    assert price_band(500) == "500-1000"
+    assert price_band(10000) == "10000+"
+    assert price_band_labels()[0] == "0-500" and price_band_labels()[-1] == "10000+"
+
+
+def test_rating_buckets_are_cumulative():
+    values = facet_values({"rating": 3.5})
+    assert ("rating", "3+") in values and ("rating", "1+") in values
+    assert ("rating", "4+") not in values
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"categories": ["Shoes"]},
+    {"categories": ["Shoes", "Bags"], "price": ["1000-2500"]},
+    {"attributes": {"Color": ["Red"]}, "rating": ["4+"]},
+])
+def test_query_matches_brute_force(catalog, filters):
+    index, products = catalog
+    result = index.query(filters)
+    expected = sorted(key for key, product in products.items() if matches(product, filters))
+    assert sorted(result["keys"]) == expected
+    assert result["total"] == len(expected)
+
+
+def test_counts_ignore_their_own_facet(catalog):
+    index, products = catalog
+    result = index.query({"attributes": {"Color": ["Red"]}, "categories": ["Shirts"]})
+    shirts = [product for product in products.values() if matches(product, {"categories": ["Shirts"]})]
+    for color in COLORS:
+        expected = sum(matches(product, {"attributes": {"Color": [color]}}) for product in shirts)
+        assert result["facets"]["attributes"]["Color"].get(color, 0) == expected
+
+
+def test_pagination(catalog):
+    index, _ = catalog
+    everything = index.query({"categories": "Bags"})["keys"]
+    page = index.query({"categories": "Bags"}, offset=5, limit=10)
+    assert page["keys"] == everything[5:15]
+    assert page["total"] == len(everything)
+
+
+def test_upsert_replaces_and_remove_reuses_slot():
+    index = FacetIndex()
+    index.upsert("a", {"categories": [{"name": "Shirts"}], "price": 100})
+    index.upsert("a", {"categories": [{"name": "Shoes"}], "price": 100})
+    assert index.query({"categories": "Shirts"})["total"] == 0
+    assert index.query({"categories": "Shoes"})["keys"] == ["a"]
+
+    assert index.remove("a") is True
+    assert index.remove("a") is False
+    assert index.query()["total"] == 0
+    index.upsert("b", {"categories": [{"name": "Bags"}]})
+    assert index.get_stats()["slots"] == 1
+    assert index.query({"categories": "Bags"})["keys"] == ["b"]
+
+
+def test_unknown_facet_raises(catalog):
+    index, _ = catalog
+    with pytest.raises(ValueError):
+        index.query({"colour": "Red"})
+    with pytest.raises(ValueError):
+        index.query({"attributes": "Red"})
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from fake_backend import CATEGORIES, COLORS, FABRICS, FakeCatalog, create_app, make_token
+
+
+def brute_force(catalog, sort_by, sort_order, **filters):
+    return [i for i in catalog.ordering(sort_by, sort_order) if catalog.matches(int(i), **filters)]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    catalog = FakeCatalog(2000, seed=1)
+    catalog.add({"name": "Handmade Red Cotton Kurta", "price": 900, "categoryIds": ["cat-women"],
+                 "attributes": [{"name": "Color", "value": "Red"}]})
+    return catalog
+
+
+def random_filters(rng):
+    filters = {}
+    if rng.random() < 0.5:
+        filters["name"] = rng.choice(["red", "Cotton Kurta", "for men", "silk saree for women #1", "#42", "zzz",
+                                      "handmade"])
+    if rng.random() < 0.5:
+        filters["categories"] = rng.sample([c["name"] for c in CATEGORIES], rng.randint(1, 2))
+    if rng.random() < 0.5:
+        filters["min_price"] = rng.choice([None, 500, 2500.5])
+        filters["max_price"] = rng.choice([None, 1000, 4000])
+    if rng.random() < 0.3:
+        filters["min_rating"] = rng.choice([2, 3.5, 4.9])
+    if rng.random() < 0.5:
+        filters["attributes"] = {"Color": rng.choice(COLORS)}
+        if rng.random() < 0.5:
+            filters["attributes"]["Fabric"] = rng.choice(FABRICS)
+        if rng.random() < 0.1:
+            filters["attributes"]["Size"] = "M"
+    return filters
+
+
+def test_indexed_search_matches_full_scan(catalog):
+    rng = random.Random(11)
+    for _ in range(150):
+        filters = random_filters(rng)
+        sort_by = rng.choice(["name", "price", "createdAt"])
+        sort_order = rng.choice(["asc", "desc"])
+        assert list(catalog.search(sort_by, sort_order, **filters)) == brute_force(catalog, sort_by, sort_order,
+                                                                                   **filters), filters
+
+
+def test_search_endpoint_paginates_matches(catalog):
+    app = create_app(catalog)
+    client = app.test_client()
+    signin = client.post("/api/auth/signin", json={"email": "a@b.c", "password": "x"}).get_json()
+    headers = {"Authorization": f"Bearer {signin['access_token']}"}
+    body = client.get("/api/product?categories=Women&maxPrice=1000&limit=5&page=2", headers=headers).get_json()
+    expected = brute_force(catalog, "name", "asc", categories=["Women"], max_price=1000.0)
+    assert body["total"] == len(expected)
+    assert [p["name"] for p in body["products"]] == [catalog.name(i) for i in expected[5:10]]
+
+
+def test_unauthorized_search_is_rejected(catalog):
+    assert create_app(catalog).test_client().get("/api/product").status_code == 401
+    assert make_token("a@b.c").count(".") == 2
+
+
+def test_added_products_are_slotted_into_cached_orders():
+    catalog = FakeCatalog(300, seed=2)
+    keys = [(sort_by, sort_order) for sort_by in ("name", "price", "stock", "rating", "createdAt")
+            for sort_order in ("asc", "desc")]
+    for sort_by, sort_order in keys:
+        catalog.ordering(sort_by, sort_order)
+    rng = random.Random(8)
+    for n in range(40):
+        # Prices and names repeat, so ties with existing products are covered
+        catalog.add({"name": catalog.name(rng.randrange(300)) if n % 3 else f"Added {n}",
+                     "price": catalog.price[rng.randrange(300)], "stock": rng.randrange(5)})
+    for sort_by, sort_order in keys:
+        expected = sorted(range(len(catalog)), key=catalog._sort_key(sort_by), reverse=sort_order == "desc")
+        assert catalog.ordering(sort_by, sort_order).tolist() == expected
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from fuzzy_index import TrigramIndex, bounded_edit_distance, correct_text, max_edits
+
+
+def reference_distance(a, b):
+    """Unbounded optimal string alignment distance"""
+    table = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        table[i][0] = i
+    for j in range(len(b) + 1):
+        table[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            table[i][j] = min(table[i - 1][j] + 1, table[i][j - 1] + 1,
+                              table[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                table[i][j] = min(table[i][j], table[i - 2][j - 2] + 1)
+    return table[len(a)][len(b)]
+
+
+@pytest.mark.parametrize("a, b, distance", [
+    ("kurta", "kurta", 0), ("karta", "kurta", 1), ("kurtha", "kurta", 1),
+    ("shrit", "shirt", 1), ("dres", "dress", 1), ("coton", "cotton", 1), ("shart", "shirt", 1),
+])
+def test_known_misspellings(a, b, distance):
+    assert bounded_edit_distance(a, b, 2) == distance
+
+
+def test_bounded_distance_matches_reference():
+    rng = random.Random(3)
+    for _ in range(2000):
+        a = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 7)))
+        b = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 7)))
+        for bound in (1, 2):
+            assert bounded_edit_distance(a, b, bound) == min(reference_distance(a, b), bound + 1)
+
+
+def test_lookup_finds_every_word_within_bound():
+    rng = random.Random(5)
+    words = {"".join(rng.choice("abcdef") for _ in range(rng.randint(4, 12))) for _ in range(200)}
+    index = TrigramIndex(words)
+    for _ in range(100):
+        query = list(rng.choice(sorted(words)))
+        for _ in range(rng.randint(0, 2)):
+            i = rng.randrange(len(query) - 1)
+            query[i], query[i + 1] = rng.choice("abcdef"), query[i]
+        query = "".join(query)
+        expected = {word for word in words if reference_distance(query, word) <= max_edits(query)}
+        assert {word for word, _, _ in index.lookup(query, limit=len(words))} == expected
+
+
+def test_correct_prefers_the_more_used_word():
+    index = TrigramIndex()
+    index.add("shirt", 10)
+    index.add("skirt", 1)
+    assert index.correct("shirt") is None
+    assert index.correct("shitr") == "shirt"
+
+
+def test_discarded_words_are_not_suggested():
+    index = TrigramIndex(["kurta"])
+    index.discard("kurta")
+    assert "kurta" not in index
+    assert index.correct("karta") is None
+
+
+def test_correct_text_keeps_protected_and_short_words():
+    index = TrigramIndex(["kurta", "under"])
+    corrected, corrections = correct_text("find karta undr 500", [index], protected={"undr"})
+    assert corrected == "find kurta undr 500"
+    assert corrections == {"karta": "kurta"}
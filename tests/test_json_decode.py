@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+import json_decode
+from json_decode import iter_json_array, loads, set_json_decoder
+
+PAGE = {
+    "products": [
+        {"id": "1", "name": "Kurta \"Deluxe\" [red]", "attributes": [{"name": "Fabric", "value": "Silk}"}]},
+        {"id": "2", "name": "Saree\\n", "price": 1299.5, "variants": []},
+        {"id": "3", "name": "Top", "discount": None, "active": True},
+    ],
+    "total": 3,
+    "page": 1,
+    "totalPages": 1,
+}
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 10000])
+def test_streams_products_across_any_chunk_boundaries(chunk_size):
+    body = json.dumps(PAGE).encode()
+    meta = {}
+    assert list(iter_json_array(chunked(body, chunk_size), "products", meta)) == PAGE["products"]
+    assert meta == {"total": 3, "page": 1, "totalPages": 1}
+
+
+def test_fields_before_the_array_are_kept():
+    body = json.dumps({"total": 1, "products": [{"id": "1"}], "page": 1}).encode()
+    meta = {}
+    assert list(iter_json_array([body], "products", meta)) == [{"id": "1"}]
+    assert meta == {"total": 1, "page": 1}
+
+
+def test_truncated_stream_raises():
+    body = json.dumps(PAGE).encode()[:80]
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunked(body, 16)))
+
+
+def test_pluggable_decoder():
+    try:
+        set_json_decoder(lambda data: "custom")
+        assert loads(b"{}") == "custom"
+    finally:
+        set_json_decoder(None)
+    assert loads(b'{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+    assert json_decode._loads is json_decode._default_loads
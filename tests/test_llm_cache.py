@@ -0,0 +1,93 @@
+import os
+
+import ecommerce
+import llm_cache
+from llm_cache import LLMResultCache, make_key, normalize_text
+from llm_metrics import LLMMetrics
+
+
+def test_normalized_keys_ignore_case_and_whitespace():
+    assert make_key(normalize_text("  Red   Kurta ")) == make_key(normalize_text("red kurta"))
+
+
+def test_values_round_trip_through_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    LLMResultCache(path).set("k", {"name": "Kurta"})
+    cache = LLMResultCache(path)
+    assert cache.get("k") == {"name": "Kurta"}
+    assert cache.get_stats()["disk_hits"] == 1
+
+
+def test_returned_values_are_copies():
+    cache = LLMResultCache(":memory:")
+    cache.set("k", {"tags": []})
+    cache.get("k")["tags"].append("x")
+    assert cache.get("k") == {"tags": []}
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"), ttl=0)
+    cache.set("k", 1)
+    assert cache.get("k") is None
+
+
+def test_disk_tier_is_trimmed_to_size(tmp_path):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"), memory_entries=1, disk_entries=2)
+    for key in "abc":
+        cache.set(key, key)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_product_and_summary_caches_are_separate():
+    assert llm_cache.product_json_cache.path != llm_cache.summary_cache.path
+    assert llm_cache.summary_cache.disk_entries == llm_cache.SUMMARY_DISK_ENTRIES
+
+
+def test_clearing_one_cache_keeps_the_other(tmp_path):
+    products = LLMResultCache(str(tmp_path / "products.sqlite3"))
+    summaries = LLMResultCache(str(tmp_path / "summaries.sqlite3"))
+    products.set("k", "product")
+    summaries.set("k", "summary")
+    summaries.clear()
+    assert LLMResultCache(products.path).get("k") == "product"
+    assert os.path.exists(summaries.path)
+
+
+def test_final_reduce_waits_for_limiter_capacity(monkeypatch):
+    calls = []
+
+    class FakeLLM:
+        def generate(self, prompt, expected_output_tokens=None, call_site=None, max_wait=None):
+            calls.append((call_site, max_wait))
+            return "report"
+
+    monkeypatch.setattr(ecommerce, "llm", FakeLLM())
+    assert ecommerce.reduce_catalog_summaries(["a", "b"], 2) == "report"
+    assert calls == [("summary_reduce", ecommerce.SUMMARY_MAX_WAIT)]
+
+
+def test_generated_products_are_cached_per_input_and_categories(monkeypatch):
+    prompts = []
+
+    class FakeLLM:
+        metrics = LLMMetrics()
+
+        def generate(self, prompt, call_site=None):
+            prompts.append(prompt)
+            return ('{"name": "Kurta", "description": "Cotton kurta", "stock": 5, "price": 499, '
+                    '"sku": "KRT-1", "categoryIds": ["c1"]}')
+
+    monkeypatch.setattr(ecommerce, "llm", FakeLLM())
+    monkeypatch.setattr(ecommerce, "product_json_cache", LLMResultCache(":memory:"))
+    categories = [{"id": "c1", "name": "Clothing"}]
+    first = ecommerce.generate_product_json_with_gemini("Red  Kurta", categories)
+    assert ecommerce.generate_product_json_with_gemini(" red kurta ", categories) == first
+    assert len(prompts) == 1
+    assert FakeLLM.metrics.snapshot()["call_sites"]["product_json"]["cache_hits"] == 1
+
+    ecommerce.generate_product_json_with_gemini("red kurta", categories + [{"id": "c2", "name": "Shoes"}])
+    monkeypatch.setattr(ecommerce, "PRODUCT_PROMPT_VERSION", "test")
+    ecommerce.generate_product_json_with_gemini("red kurta", categories)
+    assert len(prompts) == 3
@@ -0,0 +1,84 @@
+import pytest
+
+from llm_executor import (LLMEmptyResponse, LLMError, LLMExecutor, LLMNetworkError, LLMRateLimited,
+                          classify_error)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FakeModel:
+    def __init__(self, reply="ok", error=None):
+        self.reply = reply
+        self.error = error
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        if self.error is not None:
+            raise self.error
+        if stream:
+            return iter([FakeResponse(part) for part in self.reply.split(" ")])
+        return FakeResponse(self.reply)
+
+
+def test_generate_returns_stripped_text():
+    executor = LLMExecutor(FakeModel("  hello  "))
+    assert executor.generate("prompt", call_site="test") == "hello"
+    stats = executor.get_stats()
+    assert stats["submitted"] == 1 and stats["succeeded"] == 1
+    assert executor.get_metrics()["call_sites"]["test"]["succeeded"] == 1
+
+
+def test_rejects_locally_when_request_budget_is_spent():
+    model = FakeModel()
+    executor = LLMExecutor(model, requests_per_minute=2)
+    executor.generate("a")
+    executor.generate("b")
+    with pytest.raises(LLMRateLimited):
+        executor.generate("c")
+    assert model.prompts == ["a", "b"]
+    assert executor.get_stats()["rate_limited"] == 1
+
+
+def test_rejects_when_token_budget_is_spent():
+    executor = LLMExecutor(FakeModel(), tokens_per_minute=100)
+    executor.generate("x" * 200, expected_output_tokens=40)
+    with pytest.raises(LLMRateLimited):
+        executor.generate("x" * 200, expected_output_tokens=40)
+    # The request taken before the token check is refunded
+    assert executor.get_stats()["requests_available"] == 14
+
+
+def test_failures_are_classified():
+    executor = LLMExecutor(FakeModel(error=ConnectionError("reset")))
+    with pytest.raises(LLMNetworkError):
+        executor.generate("prompt")
+    executor.model = FakeModel("")
+    with pytest.raises(LLMEmptyResponse):
+        executor.generate("prompt")
+    assert executor.get_stats()["errors"] == {"LLMNetworkError": 1, "LLMEmptyResponse": 1}
+
+
+def test_classify_error_wraps_unknown_exceptions():
+    error = classify_error(KeyError("x"))
+    assert type(error) is LLMError and "KeyError" in str(error)
+    assert isinstance(classify_error(TimeoutError()), LLMNetworkError)
+
+
+def test_stream_yields_chunks():
+    executor = LLMExecutor(FakeModel("one two three"))
+    assert list(executor.stream("prompt")) == ["one", "two", "three"]
+    assert executor.get_stats()["succeeded"] == 1
+
+
+def test_model_factory_is_lazy():
+    built = []
+    executor = LLMExecutor(model_factory=lambda: built.append(1) or FakeModel())
+    assert built == []
+    executor.generate("prompt")
+    executor.generate("prompt")
+    assert built == [1]
@@ -0,0 +1,81 @@
+import pytest
+
+from llm_json import extract_json
+from ecommerce import parse_product_batch_response
+
+
+def make_product(name):
+    return (
+        '{"name": "%s", "description": "Cotton kurta", "stock": 5, "price": 499, '
+        '"sku": "SKU-%s", "categoryIds": ["c1"], '
+        '"attributes": [{"name": "Fabric", "value": "Cotton"}]}' % (name, name)
+    )
+
+
+def test_extracts_object_from_fenced_prose():
+    text = 'Here you go:\n```json\n{"name": "Kurta", "price": 10,}\n```'
+    assert extract_json(text) == {"name": "Kurta", "price": 10}
+
+
+def test_repairs_python_literals_and_raw_newlines():
+    text = '{"active": True, "note": "line one\nline two", "missing": None}'
+    assert extract_json(text) == {"active": True, "note": "line one\nline two", "missing": None}
+
+
+def test_truncated_string_value_is_dropped_not_closed():
+    text = '{"name": "Kurta", "price": 10, "description": "made fr'
+    assert extract_json(text) == {"name": "Kurta", "price": 10}
+
+
+def test_truncated_nested_value_drops_whole_member():
+    text = '{"name": "Kurta", "attributes": [{"name": "Fabric", "value": "Cott'
+    assert extract_json(text) == {"name": "Kurta"}
+
+
+def test_truncated_number_is_dropped():
+    assert extract_json('{"name": "Kurta", "price": 12') == {"name": "Kurta"}
+
+
+def test_truncated_array_keeps_only_closed_elements():
+    text = '[{"a": 1}, {"b": 2}, {"c": "tru'
+    assert extract_json(text, "[") == [{"a": 1}, {"b": 2}]
+
+
+def test_truncated_without_complete_member_raises():
+    with pytest.raises(ValueError):
+        extract_json('{"description": "made fr')
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"name": "Lamp"', {"name": "Lamp"}),
+    ('{"name": "Lamp", "price": 10, "active": true', {"name": "Lamp", "price": 10, "active": True}),
+    ('{"name": "Lamp", "tags": ["desk"]', {"name": "Lamp", "tags": ["desk"]}),
+    ('["desk", "floor"', ["desk", "floor"]),
+])
+def test_member_ending_at_the_cut_is_kept(text, expected):
+    assert extract_json(text, text[0]) == expected
+
+
+@pytest.mark.parametrize("text", ['{"name"', '{"name": ', '{"active": tru', '{"name": "Lamp\\"'])
+def test_incomplete_member_at_the_cut_is_not_kept(text):
+    with pytest.raises(ValueError):
+        extract_json(text)
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        extract_json("no json here")
+
+
+def test_batch_response_skips_truncated_last_item():
+    text = "[" + make_product("a") + ", " + make_product("b")[:-40]
+    products = parse_product_batch_response(text, 2, {"c1"})
+    assert list(products) == [0]
+    assert products[0]["name"] == "a"
+
+
+def test_batch_response_keeps_complete_items():
+    text = "[" + make_product("a") + ", " + make_product("b") + "]"
+    products = parse_product_batch_response(text, 2, {"c1"})
+    assert sorted(products) == [0, 1]
+    assert products[1]["attributes"] == [{"name": "Fabric", "value": "Cotton"}]
@@ -0,0 +1,49 @@
+from llm_metrics import Histogram, LLMMetrics
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    histogram = Histogram((10, 100))
+    for value in (1, 2, 3, 50, 500):
+        histogram.observe(value)
+    assert histogram.percentile(0.5) == 10
+    assert histogram.percentile(0.8) == 100
+    # The overflow bucket reports the observed max
+    assert histogram.percentile(0.99) == 500
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5 and snapshot["min"] == 1 and snapshot["max"] == 500
+    assert snapshot["buckets"] == {"le_10": 3, "le_100": 1, "inf": 1}
+
+
+def test_empty_histogram():
+    assert Histogram((10,)).snapshot()["p50"] is None
+
+
+def test_records_per_call_site():
+    metrics = LLMMetrics()
+    metrics.record_call("summary", 0.2, "prompt", 10, 20, 80)
+    metrics.record_call("summary", 1.5, "prompt", 10, error=ValueError())
+    metrics.record_rejected("products", RuntimeError())
+    metrics.record_fallback("products", "rate_limited", count=3)
+    metrics.record_cache_hit("summary")
+
+    snapshot = metrics.snapshot()
+    summary = snapshot["call_sites"]["summary"]
+    assert summary["calls"] == 2 and summary["succeeded"] == 1 and summary["failed"] == 1
+    assert summary["errors"] == {"ValueError": 1}
+    assert summary["latency_ms"]["max"] == 1500.0
+    products = snapshot["call_sites"]["products"]
+    assert products["rejected"] == 1 and products["fallback_reasons"] == {"rate_limited": 3}
+    assert snapshot["totals"]["cache_hits"] == 1
+    assert snapshot["totals"]["llm_time_ms"] == 1700.0
+
+
+def test_keeps_only_the_slowest_calls():
+    metrics = LLMMetrics(top_calls=3)
+    for seconds in range(10):
+        metrics.record_call("site", seconds, f"prompt {seconds}", seconds * 100)
+    snapshot = metrics.snapshot()
+    assert [call["latency_ms"] for call in snapshot["slowest_calls"]] == [9000, 8000, 7000]
+    assert snapshot["most_expensive_calls"][0]["prompt_tokens"] == 900
+
+    metrics.reset()
+    assert metrics.snapshot()["call_sites"] == {}
@@ -0,0 +1,62 @@
+import threading
+
+from metadata_cache import NOT_MODIFIED, MetadataCache
+
+
+def loader_returning(*results):
+    results = iter(results)
+    calls = []
+
+    def load(entry):
+        calls.append(entry)
+        return next(results)
+    load.calls = calls
+    return load
+
+
+def test_fresh_entries_are_served_without_loading():
+    cache = MetadataCache(ttl=60)
+    load = loader_returning({"data": ["Men"], "etag": '"1"'})
+    assert cache.get("categories", load) == ["Men"]
+    assert cache.get("categories", load) == ["Men"]
+    assert len(load.calls) == 1
+
+
+def test_stale_entries_are_served_while_revalidating_with_etag():
+    cache = MetadataCache(ttl=0, stale_ttl=60)
+    refreshed = threading.Event()
+    results = iter([{"data": ["Men"], "etag": '"1"'}, NOT_MODIFIED])
+    entries = []
+
+    def load(entry):
+        entries.append(entry)
+        result = next(results)
+        if result is NOT_MODIFIED:
+            refreshed.set()
+        return result
+
+    cache.get("categories", load)
+    assert cache.get("categories", load) == ["Men"]
+    assert refreshed.wait(5)
+    assert entries[1]["etag"] == '"1"'
+    assert cache.get_stats()["stale_hits"] >= 1
+
+
+def test_failed_reload_keeps_serving_old_data():
+    cache = MetadataCache(ttl=0, stale_ttl=0)
+    load = loader_returning({"data": ["Men"]}, None)
+    cache.get("categories", load)
+    assert cache.get("categories", load) == ["Men"]
+    assert cache.get_stats()["refresh_errors"] == 1
+
+
+def test_failed_first_load_returns_none():
+    assert MetadataCache().get("categories", lambda entry: None) is None
+
+
+def test_invalidate_forces_reload():
+    cache = MetadataCache(ttl=60)
+    load = loader_returning({"data": ["Men"]}, {"data": ["Men", "Women"]})
+    cache.get("categories", load)
+    cache.invalidate("categories")
+    assert cache.get("categories", load) == ["Men", "Women"]
@@ -0,0 +1,43 @@
+import pytest
+
+import ecommerce
+from llm_cache import LLMResultCache
+from llm_executor import LLMRateLimited
+from llm_metrics import LLMMetrics
+
+
+class RateLimitedLLM:
+    """Stands in for the shared executor with no capacity left"""
+
+    def __init__(self):
+        self.metrics = LLMMetrics()
+        self.max_waits = []
+
+    def submit(self, prompt, expected_output_tokens=None, max_wait=None, call_site=None):
+        self.max_waits.append(max_wait)
+        raise LLMRateLimited("budget exhausted")
+
+
+@pytest.fixture
+def rate_limited_llm(monkeypatch):
+    fake = RateLimitedLLM()
+    monkeypatch.setattr(ecommerce, "llm", fake)
+    monkeypatch.setattr(ecommerce, "product_json_cache", LLMResultCache(path=":memory:"))
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    return fake
+
+
+def test_batch_calls_wait_for_limiter_capacity(rate_limited_llm):
+    results, rate_limited = ecommerce.generate_products_json_with_gemini_batch(["red kurta", "blue shirt"], [])
+    assert rate_limited_llm.max_waits == [ecommerce.BATCH_MAX_WAIT]
+    assert results == [None, None]
+    assert rate_limited == {0, 1}
+
+
+def test_rate_limited_items_are_not_replaced_by_mock_products(rate_limited_llm):
+    assert ecommerce.generate_products_json(["red kurta"], [], fallback_on_rate_limit=False) == [None]
+
+
+def test_rate_limited_items_fall_back_by_default(rate_limited_llm):
+    [product] = ecommerce.generate_products_json(["red kurta"], [])
+    assert product["name"]
@@ -0,0 +1,42 @@
+from product_schema import category_id_set, validate_product
+
+
+def make_product(**overrides):
+    product = {
+        "name": "Cotton Kurta", "description": "Handloom cotton kurta", "stock": 5, "price": 499,
+        "sku": "KRT-1", "categoryIds": ["c1"],
+        "variants": [{"name": "M", "sku": "KRT-1-M", "price": 499, "stock": 2}],
+        "attributes": [{"name": "Fabric", "value": "Cotton"}]
+    }
+    product.update(overrides)
+    return product
+
+
+def test_valid_product_gets_defaults():
+    product, errors = validate_product(make_product())
+    assert errors == {}
+    assert product["discount"] == 0 and product["images"] == []
+    assert product["variants"][0]["thumbnail"] == ""
+
+
+def test_errors_name_each_invalid_field():
+    product, errors = validate_product(make_product(price=-1, stock="many", categoryIds=[], name=""))
+    assert product is None
+    assert set(errors) == {"price", "stock", "categoryIds", "name"}
+
+
+def test_nested_errors_are_reported_on_the_top_level_field():
+    _, errors = validate_product(make_product(variants=[{"name": "M"}]))
+    assert set(errors) == {"variants"}
+
+
+def test_unknown_categories_are_rejected():
+    category_ids = category_id_set([{"id": "c1"}, {"_id": "c2"}, {"name": "no id"}, "junk"])
+    assert category_ids == {"c1", "c2"}
+    assert validate_product(make_product(categoryIds=["c2"]), category_ids)[1] == {}
+    _, errors = validate_product(make_product(categoryIds=["c1", "c9"]), category_ids)
+    assert "c9" in errors["categoryIds"]
+
+
+def test_rejects_non_objects():
+    assert validate_product(["not", "a", "product"]) == (None, {"__root__": "Expected a JSON object"})
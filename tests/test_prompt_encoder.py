@@ -0,0 +1,45 @@
+from prompt_encoder import encode_products_table, estimate_tokens
+
+
+def make_products(count):
+    return [{
+        "name": f"Product {i}",
+        "price": 100 + i,
+        "stock": i,
+        "categories": [{"name": "Shirts"}],
+        "attributes": [{"name": "Color", "value": "Red|Blue"}, {"name": "Size", "value": "M"}] if i % 2 else
+                      [{"name": "Color", "value": "Green"}]
+    } for i in range(count)]
+
+
+def test_attributes_become_shared_columns():
+    table, included = encode_products_table(make_products(3))
+    lines = table.split("\n")
+    assert included == 3 and len(lines) == 4
+    assert lines[0] == "#|name|price|stock|categories|variants|images|Color|Size"
+    assert lines[1] == "1|Product 0|100|0|Shirts|0|0|Green|"
+    # Pipes inside values cannot break the row apart
+    assert lines[2].endswith("|Red/Blue|M")
+
+
+def test_sample_strategy_fits_budget_and_spreads_rows():
+    products = make_products(200)
+    table, included = encode_products_table(products, token_budget=500)
+    assert 0 < included < 200
+    assert estimate_tokens(table) <= 500
+    rows = table.split("\n")[1:-1]
+    assert rows[0].startswith("1|") and int(rows[-1].split("|")[0]) > 150
+    assert table.endswith("sampled evenly)")
+
+
+def test_truncate_strategy_keeps_first_rows():
+    table, included = encode_products_table(make_products(200), token_budget=500, strategy="truncate")
+    rows = table.split("\n")[1:-1]
+    assert [int(row.split("|")[0]) for row in rows] == list(range(1, included + 1))
+    assert estimate_tokens(table) <= 500
+
+
+def test_empty_catalog():
+    table, included = encode_products_table([])
+    assert included == 0
+    assert table == "#|name|price|stock|categories|variants|images"
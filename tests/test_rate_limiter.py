@@ -0,0 +1,37 @@
+import time
+
+import pytest
+
+from rate_limiter import TokenBucket
+
+
+def test_starts_full_and_empties():
+    bucket = TokenBucket(1, capacity=3)
+    assert bucket.try_acquire(3)
+    assert not bucket.try_acquire(1)
+
+
+def test_refills_at_rate():
+    bucket = TokenBucket(100, capacity=1)
+    assert bucket.try_acquire()
+    assert bucket.acquire(timeout=1)
+
+
+def test_acquire_times_out():
+    bucket = TokenBucket(0.1, capacity=1)
+    bucket.try_acquire()
+    started_at = time.monotonic()
+    assert not bucket.acquire(timeout=0.05)
+    assert time.monotonic() - started_at < 1
+
+
+def test_refund_is_capped_at_capacity():
+    bucket = TokenBucket(1, capacity=2)
+    bucket.refund(5)
+    assert bucket.available() == pytest.approx(2)
+
+
+@pytest.mark.parametrize("rate", [0, -1, float("nan")])
+def test_rejects_non_positive_rate(rate):
+    with pytest.raises(ValueError):
+        TokenBucket(rate)
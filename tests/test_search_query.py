@@ -0,0 +1,86 @@
+import random
+
+from search_query import FIELD_PATTERNS, first_matches, parse_search_query, vocabulary_for
+
+CATEGORIES = [{'id': 'c1', 'name': 'Men'}, {'id': 'c2', 'name': 'Women'}, {'id': 'c3', 'name': 'Kurta'},
+              {'id': 'c4', 'name': 'Dress'}, {'id': 'c5', 'name': 'Shirt'}]
+ATTRIBUTES = [{'id': 'a1', 'name': 'Color', 'values': ['Red', 'Blue', 'Navy Blue']},
+              {'id': 'a2', 'name': 'Fabric', 'values': ['Cotton', 'Silk']}]
+
+
+def parse(query):
+    return parse_search_query(query, CATEGORIES, ATTRIBUTES)
+
+
+def test_extracts_keyword_fields():
+    params = parse("find red cotton kurta under ₹1000 with rating above 3 sort by price desc page 2")
+    assert params['name'] == 'red cotton kurta'
+    assert params['maxPrice'] == 1000
+    assert params['minRating'] == 3
+    assert (params['sortBy'], params['sortOrder']) == ('price', 'desc')
+    assert params['page'] == 2
+    assert params['categories'] == ['Kurta']
+    assert params['attributes'] == {'Color': 'Red', 'Fabric': 'Cotton'}
+
+
+def test_price_range():
+    params = parse("show shirts price between 500 to 1500")
+    assert (params['minPrice'], params['maxPrice']) == (500, 1500)
+
+
+def test_whole_word_matching_does_not_find_men_in_women():
+    assert parse("find women dress")['categories'] == ['Women', 'Dress']
+
+
+def test_longest_attribute_value_wins():
+    assert parse("find navy blue shirt")['attributes'] == {'Color': 'Navy Blue'}
+
+
+def test_plurals_match_their_category():
+    assert 'Shirt' in parse("find cotton shirts")['categories']
+
+
+def test_correct_words_are_never_rewritten():
+    params = parse("show mens shirts")
+    assert params['name'] == 'mens shirts'
+    params = parse("find silky dress")
+    assert params['name'] == 'silky dress'
+
+
+def test_misspelling_is_only_suggested():
+    params = parse("find cotton karta")
+    assert params['didYouMean'] == 'find cotton kurta'
+    assert params['name'] == 'cotton karta'
+    assert 'Kurta' not in params['categories']
+
+
+def test_no_suggestion_for_known_words():
+    assert 'didYouMean' not in parse("find red kurta")
+
+
+def test_vocabulary_rebuilds_when_metadata_changes():
+    categories = list(CATEGORIES)
+    first = vocabulary_for(categories, ATTRIBUTES)
+    assert vocabulary_for(categories, ATTRIBUTES) is first
+    categories.append({'id': 'c6', 'name': 'Saree'})
+    assert vocabulary_for(categories, ATTRIBUTES) is not first
+    assert parse_search_query("find saree", categories, ATTRIBUTES)['categories'] == ['Saree']
+
+
+def test_single_scan_finds_the_same_matches_as_re_search():
+    rng = random.Random(21)
+    words = ("find", "show", "red", "kurta", "with", "rating", "above", "3", "price", "between", "500", "to",
+             "1500", "under", "₹999", "sort", "by", "price", "desc", "page", "2", "limit", "20", "over", "cost")
+    for _ in range(2000):
+        query = " ".join(rng.choice(words) for _ in range(rng.randint(1, 12)))
+        found = first_matches(query)
+        for field, pattern in FIELD_PATTERNS:
+            expected = pattern.search(query)
+            assert (found[field].span() if field in found else None) == (expected.span() if expected else None)
+
+
+def test_defaults_for_a_bare_query():
+    params = parse("kurta")
+    assert (params['name'], params['page'], params['limit']) == ('', 1, 10)
+    assert (params['sortBy'], params['sortOrder']) == ('name', 'asc')
+    assert params['minPrice'] is None and params['categories'] == ['Kurta']
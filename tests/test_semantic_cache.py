@@ -0,0 +1,79 @@
+import pytest
+
+from semantic_cache import SemanticAnswerCache, question_terms
+
+PARAPHRASES = [
+    ("show stock status", "how is my stock"),
+    ("which products are low on stock", "show low stock products"),
+    ("list products with low stock", "show low stock"),
+    ("what's the average price", "what is the average price of my products"),
+]
+DIFFERENT = [
+    ("show low stock products", "show high stock products"),
+    ("show low stock", "show out of stock products"),
+    ("how is my stock", "what are my best selling products"),
+    ("show expensive products", "show cheap products"),
+]
+
+
+@pytest.mark.parametrize("cached, asked", PARAPHRASES + [(b, a) for a, b in PARAPHRASES])
+def test_paraphrases_hit(cached, asked):
+    cache = SemanticAnswerCache()
+    cache.store("analysis", cached, "answer")
+    assert cache.lookup("analysis", asked)[0] == "answer"
+
+
+@pytest.mark.parametrize("cached, asked", DIFFERENT + [(b, a) for a, b in DIFFERENT])
+def test_different_questions_miss(cached, asked):
+    cache = SemanticAnswerCache()
+    cache.store("analysis", cached, "answer")
+    assert cache.lookup("analysis", asked)[0] is None
+
+
+def test_closest_question_wins():
+    cache = SemanticAnswerCache()
+    cache.store("analysis", "show low stock", "low")
+    cache.store("analysis", "show high stock", "high")
+    assert cache.lookup("analysis", "which products are low on stock")[0] == "low"
+
+
+def test_scopes_are_separate():
+    cache = SemanticAnswerCache()
+    cache.store("snapshot-1", "how is my stock", "old")
+    assert cache.lookup("snapshot-2", "how is my stock")[0] is None
+
+
+def test_scaffolding_only_questions_are_not_cached():
+    assert question_terms("how is it going") == []
+    cache = SemanticAnswerCache()
+    cache.store("analysis", "how is it going", "answer")
+    assert cache.get_stats()["stores"] == 0
+
+
+def test_entries_and_scopes_are_bounded():
+    cache = SemanticAnswerCache(max_entries=2, max_scopes=1)
+    for question in ("low stock", "average price", "best sellers"):
+        cache.store("a", question, question)
+    assert cache.lookup("a", "low stock")[0] is None
+    cache.store("b", "low stock", "b")
+    assert cache.get_stats()["scopes"] == 1
+    assert cache.lookup("a", "average price")[0] is None
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("products with stock less than 5", "products with stock less than 3"),
+    ("rated above 4", "rated above 2"),
+    ("fewer than 5 units", "fewer than 9 units"),
+    ("show electronics and clothing products with low ratings and stock less than 5 units",
+     "show electronics and clothing products with low ratings and stock less than 3 units"),
+])
+def test_questions_differing_only_in_a_number_miss(cached, asked):
+    cache = SemanticAnswerCache()
+    cache.store("analysis", cached, "answer")
+    assert cache.lookup("analysis", asked)[0] is None
+    assert cache.lookup("analysis", cached)[0] == "answer"
+
+
+def test_single_digits_are_terms():
+    assert "5" in question_terms("stock less than 5")
+    assert "a" not in question_terms("a kurta")
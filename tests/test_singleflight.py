@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import pytest
+
+from async_agentic_api import AsyncAgenticAPI
+from singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+    results = []
+
+    def fetch():
+        executions.append(1)
+        release.wait(5)
+        return "products"
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do("url", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while flight.get_stats()["calls"] < 5:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["products"] * 5
+    assert len(executions) == 1
+    assert flight.get_stats()["deduplicated"] == 4
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do("url", lambda: 1) == 1
+    assert flight.do("url", lambda: 2) == 2
+
+
+def test_async_calls_share_one_execution_and_errors():
+    flight = AsyncSingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("backend down")
+
+    async def main():
+        return await asyncio.gather(*(flight.do("url", fetch) for _ in range(4)), return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert len(executions) == 1
+    assert flight.get_stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "products"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("url", fetch))
+        second = asyncio.ensure_future(flight.do("url", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "products"
+
+
+def test_async_client_coalesces_identical_searches(monkeypatch):
+    api = AsyncAgenticAPI("http://coalesce-test")
+    calls = []
+
+    async def fake_search(url, access_token):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {"products": []}
+
+    monkeypatch.setattr(api, "_search_products", fake_search)
+
+    async def main():
+        url = "http://coalesce-test/api/product?name=kurta"
+        return await asyncio.gather(*(api.search_products(url, "token") for _ in range(3)))
+
+    assert asyncio.run(main()) == [{"products": []}] * 3
+    assert len(calls) == 1
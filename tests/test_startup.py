@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+from startup_report import get_startup_report, import_timer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LAZY_MODULES = ("google.generativeai", "google.api_core", "grpc", "speech_recognition", "gtts", "googletrans")
+
+
+def test_import_timer_accumulates_per_name():
+    with import_timer("test.timer"):
+        pass
+    with import_timer("test.timer"):
+        pass
+    entry = next(entry for entry in get_startup_report()["imports"] if entry["name"] == "test.timer")
+    assert entry["count"] == 2 and entry["ms"] >= 0
+
+
+def test_importing_the_app_leaves_heavy_sdks_unloaded(tmp_path):
+    # A fresh interpreter, so modules imported by other tests do not count
+    paths = [os.path.join(ROOT, "model-engine"), os.path.join(ROOT, "api")]
+    script = (
+        f"import sys; sys.path[:0] = {paths!r}; import app; "
+        f"print('loaded:', [name for name in {LAZY_MODULES!r} if name in sys.modules])"
+    )
+    # app.py creates its upload folder relative to the working directory
+    result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True,
+                            env=dict(os.environ, WARM_UP_ON_START="0"), timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert "loaded: []" in result.stdout.splitlines()
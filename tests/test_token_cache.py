@@ -0,0 +1,80 @@
+import base64
+import json
+import threading
+import time
+
+from fake_backend import make_token
+from token_cache import TokenCache, decode_token_expiry
+
+
+def token_expiring_in(seconds, jti="x"):
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip('=')
+    return f"{encode({'alg': 'none'})}.{encode({'exp': time.time() + seconds, 'jti': jti})}.sig"
+
+
+def test_decodes_jwt_expiry():
+    assert decode_token_expiry(make_token("a@b.c")) > time.time()
+    assert decode_token_expiry("not-a-jwt") is None
+
+
+def test_valid_token_is_served_from_cache():
+    cache = TokenCache()
+    fetches = []
+    fetch = lambda: fetches.append(1) or token_expiring_in(3600)
+    first = cache.get("key", fetch)
+    assert cache.get("key", fetch) == first
+    assert len(fetches) == 1
+
+
+def test_token_in_refresh_window_is_replaced():
+    cache = TokenCache(refresh_margin=60)
+    tokens = iter([token_expiring_in(30, "old"), token_expiring_in(3600, "new")])
+    old = cache.get("key", lambda: next(tokens))
+    assert cache.get("key", lambda: next(tokens)) != old
+
+
+def test_concurrent_expired_callers_sign_in_once():
+    cache = TokenCache()
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        time.sleep(0.05)
+        return token_expiring_in(3600)
+
+    threads = [threading.Thread(target=cache.get, args=("key", fetch)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(fetches) == 1
+
+
+def test_rejected_token_is_refreshed_once():
+    cache = TokenCache()
+    tokens = iter([token_expiring_in(3600, "first"), token_expiring_in(3600, "second")])
+    fetch = lambda: next(tokens)
+    first = cache.get("key", fetch)
+    second = cache.refresh_rejected(first)
+    assert second not in (None, first)
+    # A late 401 for the superseded token does not trigger another signin
+    assert cache.refresh_rejected(first) == second
+    assert cache.identity(first) == cache.identity(second) == "key"
+
+
+def test_replaced_tokens_are_forgotten():
+    cache = TokenCache()
+    tokens = [token_expiring_in(3600, str(i)) for i in range(50)]
+    issued = iter(tokens)
+    fetch = lambda: next(issued)
+    cache.get("key", fetch)
+    for token in tokens[:-1]:
+        assert cache.refresh_rejected(token) != token
+    assert len(cache._owners) == 2
+    assert cache.identity(tokens[-2]) == "key"
+    assert cache.identity(tokens[0]) == tokens[0]
+
+
+def test_unknown_token_is_not_refreshed():
+    assert TokenCache().refresh_rejected("foreign") is None